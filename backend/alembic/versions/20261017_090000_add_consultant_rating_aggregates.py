@@ -0,0 +1,95 @@
+"""add_consultant_rating_aggregates
+
+Revision ID: 20261017_090000
+Revises: 20251009_123000
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_090000'
+down_revision = '20251009_123000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Running sum of review ratings; rating = round(rating_sum / review_count, 1)
+    op.add_column('consultants', sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'))
+
+    # Insert a review and fold it into the consultant's aggregate in one transaction.
+    # The UPDATE takes a row lock, so concurrent reviews for a consultant serialize.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_consultant_review(
+            p_consultant_id integer,
+            p_client_id uuid,
+            p_rating integer,
+            p_comment text DEFAULT NULL,
+            p_outcome text DEFAULT NULL
+        ) RETURNS SETOF consultant_reviews
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            new_review consultant_reviews;
+        BEGIN
+            INSERT INTO consultant_reviews (consultant_id, client_id, rating, comment, outcome)
+            VALUES (p_consultant_id, p_client_id, p_rating, p_comment, p_outcome)
+            RETURNING * INTO new_review;
+
+            UPDATE consultants
+            SET rating_sum = rating_sum + p_rating,
+                review_count = review_count + 1,
+                rating = ROUND((rating_sum + p_rating)::numeric / (review_count + 1), 1)
+            WHERE id = p_consultant_id;
+
+            RETURN NEXT new_review;
+        END;
+        $$
+    """)
+
+    # Recompute aggregates from the review rows and fix any consultant that drifted
+    # (reviews edited or deleted outside create_consultant_review). Returns rows repaired.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION reconcile_consultant_rating_aggregates()
+        RETURNS integer
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            repaired integer;
+        BEGIN
+            WITH actual AS (
+                SELECT c.id,
+                       COALESCE(SUM(r.rating), 0)::integer AS rating_sum,
+                       COUNT(r.id)::integer AS review_count,
+                       ROUND(AVG(r.rating)::numeric, 1) AS rating
+                FROM consultants c
+                LEFT JOIN consultant_reviews r ON r.consultant_id = c.id
+                GROUP BY c.id
+            )
+            UPDATE consultants c
+            SET rating_sum = actual.rating_sum,
+                review_count = actual.review_count,
+                rating = actual.rating
+            FROM actual
+            WHERE c.id = actual.id
+              AND (c.rating_sum IS DISTINCT FROM actual.rating_sum
+                   OR c.review_count IS DISTINCT FROM actual.review_count
+                   OR c.rating IS DISTINCT FROM actual.rating);
+            GET DIAGNOSTICS repaired = ROW_COUNT;
+            RETURN repaired;
+        END;
+        $$
+    """)
+
+    # Backfill the aggregates from existing reviews
+    op.execute("SELECT reconcile_consultant_rating_aggregates()")
+    op.alter_column('consultants', 'review_count', nullable=False, server_default='0')
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS reconcile_consultant_rating_aggregates()")
+    op.execute("DROP FUNCTION IF EXISTS create_consultant_review(integer, uuid, integer, text, text)")
+    op.alter_column('consultants', 'review_count', nullable=True, server_default=None)
+    op.drop_column('consultants', 'rating_sum')
@@ -0,0 +1,50 @@
+"""add_consultant_directory_indexes
+
+Revision ID: 20261017_100000
+Revises: 20261017_090000
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_100000'
+down_revision = '20261017_090000'
+branch_labels = None
+depends_on = None
+
+SEARCH_TEXT_EXPRESSION = (
+    "name || ' ' || coalesce(bio, '') || ' ' || "
+    "coalesce(specialties::text, '') || ' ' || coalesce(languages::text, '')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # jsonb so the directory's language/specialty filters can use @> with a GIN index
+    op.execute("ALTER TABLE consultants ALTER COLUMN languages TYPE jsonb USING languages::jsonb")
+    op.execute("ALTER TABLE consultants ALTER COLUMN specialties TYPE jsonb USING specialties::jsonb")
+    op.create_index('ix_consultants_languages', 'consultants', ['languages'],
+                    postgresql_using='gin', postgresql_ops={'languages': 'jsonb_path_ops'})
+    op.create_index('ix_consultants_specialties', 'consultants', ['specialties'],
+                    postgresql_using='gin', postgresql_ops={'specialties': 'jsonb_path_ops'})
+
+    # Free-text search over name, bio, specialties and languages (ILIKE '%term%')
+    op.add_column('consultants', sa.Column('search_text', sa.Text(),
+                                           sa.Computed(SEARCH_TEXT_EXPRESSION, persisted=True)))
+    op.create_index('ix_consultants_search_text_trgm', 'consultants', ['search_text'],
+                    postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'})
+    op.create_index('ix_consultants_location_trgm', 'consultants', ['location'],
+                    postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_consultants_location_trgm', table_name='consultants')
+    op.drop_index('ix_consultants_search_text_trgm', table_name='consultants')
+    op.drop_column('consultants', 'search_text')
+    op.drop_index('ix_consultants_specialties', table_name='consultants')
+    op.drop_index('ix_consultants_languages', table_name='consultants')
+    op.execute("ALTER TABLE consultants ALTER COLUMN specialties TYPE json USING specialties::json")
+    op.execute("ALTER TABLE consultants ALTER COLUMN languages TYPE json USING languages::json")
@@ -0,0 +1,55 @@
+"""add_cache_versions
+
+Revision ID: 20261017_110000
+Revises: 20261017_100000
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_110000'
+down_revision = '20261017_100000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One counter per cached dataset; workers compare it with the version their
+    # in-memory copy was built from (see app/crud/consultant_directory.py)
+    op.create_table(
+        'cache_versions',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.execute("INSERT INTO cache_versions (name) VALUES ('consultants')")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_cache_version()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            UPDATE cache_versions
+            SET version = version + 1, updated_at = now()
+            WHERE name = TG_ARGV[0];
+            RETURN NULL;
+        END;
+        $$
+    """)
+    # Statement-level, so a bulk write bumps the version once. Review inserts are
+    # covered too: create_consultant_review() updates the consultant's aggregates.
+    op.execute("""
+        CREATE TRIGGER consultants_bump_cache_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON consultants
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('consultants')
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS consultants_bump_cache_version ON consultants")
+    op.execute("DROP FUNCTION IF EXISTS bump_cache_version()")
+    op.drop_table('cache_versions')
@@ -0,0 +1,75 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: 20261017_120000
+Revises: 20261017_110000
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_120000'
+down_revision = '20261017_110000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (created_at, id) indexes for cursor pagination (see app.crud.base.apply_keyset)
+    op.create_index('ix_consultant_applications_created_at_id', 'consultant_applications',
+                    [sa.text('created_at DESC'), sa.text('id DESC')])
+    op.create_index('ix_client_intakes_created_at_id', 'client_intakes',
+                    [sa.text('created_at DESC'), sa.text('id DESC')])
+    op.create_index('ix_blog_posts_published_created_at_id', 'blog_posts',
+                    [sa.text('created_at DESC'), sa.text('id DESC')],
+                    postgresql_where=sa.text('is_published'))
+
+    # Keyset pages of Supabase Auth users for GET /users. The Auth admin API only
+    # pages by offset and cannot filter by role; this reads auth.users directly,
+    # so it is restricted to the service role.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION list_users_page(
+            p_role text DEFAULT NULL,
+            p_after_created_at timestamptz DEFAULT NULL,
+            p_after_id uuid DEFAULT NULL,
+            p_limit integer DEFAULT 100
+        ) RETURNS TABLE (
+            id uuid,
+            email text,
+            full_name text,
+            role text,
+            email_confirmed_at timestamptz,
+            banned_until timestamptz,
+            created_at timestamptz,
+            last_sign_in_at timestamptz
+        )
+        LANGUAGE sql
+        STABLE
+        SECURITY DEFINER
+        SET search_path = ''
+        AS $$
+            SELECT u.id,
+                   u.email::text,
+                   u.raw_user_meta_data->>'full_name',
+                   COALESCE(u.raw_user_meta_data->>'role', 'client'),
+                   u.email_confirmed_at,
+                   u.banned_until,
+                   u.created_at,
+                   u.last_sign_in_at
+            FROM auth.users u
+            WHERE (p_role IS NULL OR COALESCE(u.raw_user_meta_data->>'role', 'client') = p_role)
+              AND (p_after_created_at IS NULL OR (u.created_at, u.id) < (p_after_created_at, p_after_id))
+            ORDER BY u.created_at DESC, u.id DESC
+            LIMIT p_limit
+        $$
+    """)
+    op.execute("REVOKE ALL ON FUNCTION list_users_page(text, timestamptz, uuid, integer) FROM PUBLIC, anon, authenticated")
+    op.execute("GRANT EXECUTE ON FUNCTION list_users_page(text, timestamptz, uuid, integer) TO service_role")
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS list_users_page(text, timestamptz, uuid, integer)")
+    op.drop_index('ix_blog_posts_published_created_at_id', table_name='blog_posts')
+    op.drop_index('ix_client_intakes_created_at_id', table_name='client_intakes')
+    op.drop_index('ix_consultant_applications_created_at_id', table_name='consultant_applications')
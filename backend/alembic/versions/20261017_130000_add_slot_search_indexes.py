@@ -0,0 +1,32 @@
+"""add_slot_search_indexes
+
+Revision ID: 20261017_130000
+Revises: 20261017_120000
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_130000'
+down_revision = '20261017_120000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Active bookings per consultant by start time, read for every slot calculation
+    # (including the batched consultant_id IN (...) search for the earliest slot)
+    op.create_index('ix_bookings_consultant_booking_date', 'bookings',
+                    ['consultant_id', 'booking_date'],
+                    postgresql_where=sa.text("status IN ('pending', 'confirmed', 'rescheduled')"))
+    # Consultants offering a service template (earliest-slot search)
+    op.create_index('ix_consultant_services_template_active', 'consultant_services',
+                    ['service_template_id', 'consultant_id'],
+                    postgresql_where=sa.text('is_active'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_consultant_services_template_active', table_name='consultant_services')
+    op.drop_index('ix_bookings_consultant_booking_date', table_name='bookings')
@@ -0,0 +1,86 @@
+"""add_create_booking_with_duration
+
+Revision ID: 20261017_140000
+Revises: 20261017_130000
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261017_140000'
+down_revision = '20261017_130000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Validate the service, its price for the duration option and the option itself,
+    # insert the booking and return it shaped like crud_booking.BOOKING_SELECT, in one
+    # transaction and one round trip. Errors use PostgREST's PTxxx codes so the HTTP
+    # status (404/400) reaches the API layer.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_booking_with_duration(
+            p_client_id uuid,
+            p_consultant_id integer,
+            p_service_id integer,
+            p_duration_option_id integer,
+            p_booking_date timestamptz,
+            p_timezone text,
+            p_intake_form_data jsonb
+        ) RETURNS SETOF jsonb
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            service_active boolean;
+            option_price double precision;
+            option_row service_duration_options;
+            new_booking bookings;
+        BEGIN
+            SELECT is_active INTO service_active
+            FROM consultant_services
+            WHERE id = p_service_id AND consultant_id = p_consultant_id;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION 'Service not found for this consultant' USING ERRCODE = 'PT404';
+            END IF;
+            IF NOT service_active THEN
+                RAISE EXCEPTION 'This service is not currently available' USING ERRCODE = 'PT400';
+            END IF;
+
+            SELECT price INTO option_price
+            FROM consultant_service_pricing
+            WHERE consultant_service_id = p_service_id
+              AND duration_option_id = p_duration_option_id
+              AND is_active;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION 'The RCIC has not set pricing for this service and duration combination'
+                    USING ERRCODE = 'PT400';
+            END IF;
+
+            SELECT * INTO option_row FROM service_duration_options WHERE id = p_duration_option_id;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION 'Duration option not found' USING ERRCODE = 'PT404';
+            END IF;
+
+            INSERT INTO bookings (client_id, consultant_id, service_id, booking_date, timezone, status,
+                                  intake_form_data, total_amount, payment_status, duration_option_id)
+            VALUES (p_client_id, p_consultant_id, p_service_id, p_booking_date, p_timezone, 'confirmed',
+                    p_intake_form_data, option_price, 'pending', p_duration_option_id)
+            RETURNING * INTO new_booking;
+
+            RETURN NEXT to_jsonb(new_booking) || jsonb_build_object(
+                'documents', '[]'::jsonb,
+                'duration_option', jsonb_build_object(
+                    'duration_minutes', option_row.duration_minutes,
+                    'duration_label', option_row.duration_label
+                )
+            );
+        END;
+        $$
+    """)
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP FUNCTION IF EXISTS create_booking_with_duration(uuid, integer, integer, integer, timestamptz, text, jsonb)"
+    )
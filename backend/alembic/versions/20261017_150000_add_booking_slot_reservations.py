@@ -0,0 +1,325 @@
+"""add_booking_slot_reservations
+
+Revision ID: 20261017_150000
+Revises: 20261017_140000
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20261017_150000'
+down_revision = '20261017_140000'
+branch_labels = None
+depends_on = None
+
+# Statuses that occupy the consultant's time (as in the slot search index)
+ACTIVE_STATUSES = "('pending', 'confirmed', 'rescheduled')"
+# Session length when neither the duration option nor the service has one
+# (AvailabilityService.DEFAULT_SLOT_DURATION)
+DEFAULT_SESSION_MINUTES = 15
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    # Session length of a booking: the chosen duration option, else the service's
+    # duration, else the default. Never NULL, so every booking has a bounded range.
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION booking_duration_minutes(p_service_id integer, p_duration_option_id integer)
+        RETURNS integer
+        LANGUAGE sql STABLE
+        AS $$
+            SELECT COALESCE(
+                (SELECT duration_minutes FROM service_duration_options WHERE id = p_duration_option_id),
+                (SELECT duration FROM consultant_services WHERE id = p_service_id),
+                {DEFAULT_SESSION_MINUTES}
+            )
+        $$
+    """)
+
+    # ends_at is kept by a trigger so every insert path and reschedule is covered
+    op.execute("ALTER TABLE bookings ADD COLUMN ends_at timestamptz")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_booking_ends_at() RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            NEW.ends_at := NEW.booking_date
+                + make_interval(mins => booking_duration_minutes(NEW.service_id, NEW.duration_option_id));
+            RETURN NEW;
+        END;
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER bookings_set_ends_at
+        BEFORE INSERT OR UPDATE OF booking_date, service_id, duration_option_id ON bookings
+        FOR EACH ROW EXECUTE FUNCTION set_booking_ends_at()
+    """)
+    op.execute("""
+        UPDATE bookings
+        SET ends_at = booking_date + make_interval(mins => booking_duration_minutes(service_id, duration_option_id))
+    """)
+    op.execute("ALTER TABLE bookings ALTER COLUMN ends_at SET NOT NULL")
+
+    # No two active bookings of a consultant overlap. Existing overlaps must be
+    # cancelled or rescheduled before this migration can run.
+    op.execute(f"""
+        ALTER TABLE bookings ADD CONSTRAINT bookings_no_overlap
+        EXCLUDE USING gist (consultant_id WITH =, tstzrange(booking_date, ends_at) WITH &&)
+        WHERE (status IN {ACTIVE_STATUSES})
+    """)
+
+    # Short-lived holds a client takes on a slot while paying
+    op.execute("""
+        CREATE TABLE booking_holds (
+            id serial PRIMARY KEY,
+            consultant_id integer NOT NULL REFERENCES consultants(id) ON DELETE CASCADE,
+            client_id uuid NOT NULL,
+            service_id integer NOT NULL REFERENCES consultant_services(id) ON DELETE CASCADE,
+            duration_option_id integer REFERENCES service_duration_options(id),
+            starts_at timestamptz NOT NULL,
+            ends_at timestamptz NOT NULL,
+            expires_at timestamptz NOT NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT booking_holds_no_overlap
+                EXCLUDE USING gist (consultant_id WITH =, tstzrange(starts_at, ends_at) WITH &&)
+        )
+    """)
+
+    # Every booking write (plain inserts through PostgREST, reschedules, status changes)
+    # respects other clients' live holds. Runs after bookings_set_ends_at (BEFORE
+    # triggers fire in name order), under the same consultant lock as the functions below.
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION check_booking_holds() RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF NEW.status IN {ACTIVE_STATUSES} THEN
+                PERFORM pg_advisory_xact_lock(hashtext('booking_slots'), NEW.consultant_id);
+                IF EXISTS (
+                    SELECT 1 FROM booking_holds
+                    WHERE consultant_id = NEW.consultant_id AND client_id <> NEW.client_id
+                      AND expires_at > now()
+                      AND tstzrange(starts_at, ends_at) && tstzrange(NEW.booking_date, NEW.ends_at)
+                ) THEN
+                    RAISE EXCEPTION 'This time slot is no longer available' USING ERRCODE = 'PT409';
+                END IF;
+            END IF;
+            RETURN NEW;
+        END;
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER bookings_slot_hold_check
+        BEFORE INSERT OR UPDATE OF booking_date, service_id, duration_option_id, consultant_id, client_id, status
+        ON bookings
+        FOR EACH ROW EXECUTE FUNCTION check_booking_holds()
+    """)
+
+    # Both functions below take the consultant's transaction lock before checking
+    # bookings and holds, so a check and its insert never interleave with another
+    # request for the same consultant; the lock is held for microseconds and a
+    # taken slot fails at once with PT409 instead of retrying.
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION hold_booking_slot(
+            p_client_id uuid,
+            p_consultant_id integer,
+            p_service_id integer,
+            p_duration_option_id integer,
+            p_booking_date timestamptz,
+            p_hold_minutes integer
+        ) RETURNS SETOF booking_holds
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            slot_end timestamptz;
+        BEGIN
+            PERFORM 1 FROM consultant_services WHERE id = p_service_id AND consultant_id = p_consultant_id;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION 'Service not found for this consultant' USING ERRCODE = 'PT404';
+            END IF;
+            slot_end := p_booking_date
+                + make_interval(mins => booking_duration_minutes(p_service_id, p_duration_option_id));
+
+            PERFORM pg_advisory_xact_lock(hashtext('booking_slots'), p_consultant_id);
+
+            -- Expired holds and the client's earlier hold with this consultant give way
+            DELETE FROM booking_holds
+            WHERE consultant_id = p_consultant_id AND (expires_at <= now() OR client_id = p_client_id);
+
+            IF EXISTS (
+                SELECT 1 FROM booking_holds
+                WHERE consultant_id = p_consultant_id
+                  AND tstzrange(starts_at, ends_at) && tstzrange(p_booking_date, slot_end)
+            ) OR EXISTS (
+                SELECT 1 FROM bookings
+                WHERE consultant_id = p_consultant_id AND status IN {ACTIVE_STATUSES}
+                  AND tstzrange(booking_date, ends_at) && tstzrange(p_booking_date, slot_end)
+            ) THEN
+                RAISE EXCEPTION 'This time slot is no longer available' USING ERRCODE = 'PT409';
+            END IF;
+
+            RETURN QUERY
+            INSERT INTO booking_holds (consultant_id, client_id, service_id, duration_option_id,
+                                       starts_at, ends_at, expires_at)
+            VALUES (p_consultant_id, p_client_id, p_service_id, p_duration_option_id,
+                    p_booking_date, slot_end, now() + make_interval(mins => p_hold_minutes))
+            RETURNING *;
+        END;
+        $$
+    """)
+
+    # Same checks as before, then the slot: another client's live hold or an
+    # overlapping booking is PT409, and the client's own hold is used up
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION create_booking_with_duration(
+            p_client_id uuid,
+            p_consultant_id integer,
+            p_service_id integer,
+            p_duration_option_id integer,
+            p_booking_date timestamptz,
+            p_timezone text,
+            p_intake_form_data jsonb
+        ) RETURNS SETOF jsonb
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            service_active boolean;
+            option_price double precision;
+            option_row service_duration_options;
+            slot_end timestamptz;
+            new_booking bookings;
+        BEGIN
+            SELECT is_active INTO service_active
+            FROM consultant_services
+            WHERE id = p_service_id AND consultant_id = p_consultant_id;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION 'Service not found for this consultant' USING ERRCODE = 'PT404';
+            END IF;
+            IF NOT service_active THEN
+                RAISE EXCEPTION 'This service is not currently available' USING ERRCODE = 'PT400';
+            END IF;
+
+            SELECT price INTO option_price
+            FROM consultant_service_pricing
+            WHERE consultant_service_id = p_service_id
+              AND duration_option_id = p_duration_option_id
+              AND is_active;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION 'The RCIC has not set pricing for this service and duration combination'
+                    USING ERRCODE = 'PT400';
+            END IF;
+
+            SELECT * INTO option_row FROM service_duration_options WHERE id = p_duration_option_id;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION 'Duration option not found' USING ERRCODE = 'PT404';
+            END IF;
+            slot_end := p_booking_date + make_interval(mins => option_row.duration_minutes);
+
+            PERFORM pg_advisory_xact_lock(hashtext('booking_slots'), p_consultant_id);
+
+            IF EXISTS (
+                SELECT 1 FROM booking_holds
+                WHERE consultant_id = p_consultant_id AND client_id <> p_client_id AND expires_at > now()
+                  AND tstzrange(starts_at, ends_at) && tstzrange(p_booking_date, slot_end)
+            ) OR EXISTS (
+                SELECT 1 FROM bookings
+                WHERE consultant_id = p_consultant_id AND status IN {ACTIVE_STATUSES}
+                  AND tstzrange(booking_date, ends_at) && tstzrange(p_booking_date, slot_end)
+            ) THEN
+                RAISE EXCEPTION 'This time slot is no longer available' USING ERRCODE = 'PT409';
+            END IF;
+
+            DELETE FROM booking_holds
+            WHERE consultant_id = p_consultant_id AND client_id = p_client_id
+              AND tstzrange(starts_at, ends_at) && tstzrange(p_booking_date, slot_end);
+
+            INSERT INTO bookings (client_id, consultant_id, service_id, booking_date, timezone, status,
+                                  intake_form_data, total_amount, payment_status, duration_option_id)
+            VALUES (p_client_id, p_consultant_id, p_service_id, p_booking_date, p_timezone, 'confirmed',
+                    p_intake_form_data, option_price, 'pending', p_duration_option_id)
+            RETURNING * INTO new_booking;
+
+            RETURN NEXT to_jsonb(new_booking) || jsonb_build_object(
+                'documents', '[]'::jsonb,
+                'duration_option', jsonb_build_object(
+                    'duration_minutes', option_row.duration_minutes,
+                    'duration_label', option_row.duration_label
+                )
+            );
+        END;
+        $$
+    """)
+
+
+def downgrade() -> None:
+    # Previous create_booking_with_duration, without the slot checks
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_booking_with_duration(
+            p_client_id uuid,
+            p_consultant_id integer,
+            p_service_id integer,
+            p_duration_option_id integer,
+            p_booking_date timestamptz,
+            p_timezone text,
+            p_intake_form_data jsonb
+        ) RETURNS SETOF jsonb
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            service_active boolean;
+            option_price double precision;
+            option_row service_duration_options;
+            new_booking bookings;
+        BEGIN
+            SELECT is_active INTO service_active
+            FROM consultant_services
+            WHERE id = p_service_id AND consultant_id = p_consultant_id;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION 'Service not found for this consultant' USING ERRCODE = 'PT404';
+            END IF;
+            IF NOT service_active THEN
+                RAISE EXCEPTION 'This service is not currently available' USING ERRCODE = 'PT400';
+            END IF;
+
+            SELECT price INTO option_price
+            FROM consultant_service_pricing
+            WHERE consultant_service_id = p_service_id
+              AND duration_option_id = p_duration_option_id
+              AND is_active;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION 'The RCIC has not set pricing for this service and duration combination'
+                    USING ERRCODE = 'PT400';
+            END IF;
+
+            SELECT * INTO option_row FROM service_duration_options WHERE id = p_duration_option_id;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION 'Duration option not found' USING ERRCODE = 'PT404';
+            END IF;
+
+            INSERT INTO bookings (client_id, consultant_id, service_id, booking_date, timezone, status,
+                                  intake_form_data, total_amount, payment_status, duration_option_id)
+            VALUES (p_client_id, p_consultant_id, p_service_id, p_booking_date, p_timezone, 'confirmed',
+                    p_intake_form_data, option_price, 'pending', p_duration_option_id)
+            RETURNING * INTO new_booking;
+
+            RETURN NEXT to_jsonb(new_booking) || jsonb_build_object(
+                'documents', '[]'::jsonb,
+                'duration_option', jsonb_build_object(
+                    'duration_minutes', option_row.duration_minutes,
+                    'duration_label', option_row.duration_label
+                )
+            );
+        END;
+        $$
+    """)
+    op.execute("DROP FUNCTION IF EXISTS hold_booking_slot(uuid, integer, integer, integer, timestamptz, integer)")
+    op.execute("DROP TRIGGER IF EXISTS bookings_slot_hold_check ON bookings")
+    op.execute("DROP FUNCTION IF EXISTS check_booking_holds()")
+    op.execute("DROP TABLE IF EXISTS booking_holds")
+    op.execute("ALTER TABLE bookings DROP CONSTRAINT IF EXISTS bookings_no_overlap")
+    op.execute("DROP TRIGGER IF EXISTS bookings_set_ends_at ON bookings")
+    op.execute("DROP FUNCTION IF EXISTS set_booking_ends_at()")
+    op.execute("ALTER TABLE bookings DROP COLUMN IF EXISTS ends_at")
+    op.execute("DROP FUNCTION IF EXISTS booking_duration_minutes(integer, integer)")
@@ -0,0 +1,25 @@
+"""add_bookings_keyset_index
+
+Revision ID: 20261017_160000
+Revises: 20261017_150000
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_160000'
+down_revision = '20261017_150000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (created_at, id) for the admin booking pages and export (see app.crud.base.apply_keyset)
+    op.create_index('ix_bookings_created_at_id', 'bookings',
+                    [sa.text('created_at DESC'), sa.text('id DESC')])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookings_created_at_id', table_name='bookings')
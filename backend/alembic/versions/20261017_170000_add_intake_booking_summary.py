@@ -0,0 +1,28 @@
+"""add_intake_booking_summary
+
+Revision ID: 20261017_170000
+Revises: 20261017_160000
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '20261017_170000'
+down_revision = '20261017_160000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Intake summary copied onto each booking, stored with the intake revision it was
+    # built from (see CRUDIntake.get_booking_summary); existing rows fill in on first use
+    op.add_column('client_intakes', sa.Column('booking_summary', postgresql.JSONB(), nullable=True))
+    op.add_column('client_intakes', sa.Column('booking_summary_updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('client_intakes', 'booking_summary_updated_at')
+    op.drop_column('client_intakes', 'booking_summary')
@@ -14,7 +14,7 @@ router = APIRouter()
 
 @router.post("/register", response_model=UserResponse)
 def register(
-    *, db: Client = Depends(deps.get_db), user_in: UserRegister
+    *, db: Client = Depends(deps.get_auth_db), user_in: UserRegister
 ) -> Any:
     """
     Register a new user using Supabase Auth
@@ -68,7 +68,7 @@ def register(
 
 @router.post("/login", response_model=UserResponse)
 def login(
-    *, db: Client = Depends(deps.get_db), user_in: UserLogin
+    *, db: Client = Depends(deps.get_auth_db), user_in: UserLogin
 ) -> Any:
     """
     Login user using Supabase Auth
@@ -180,7 +180,7 @@ def resend_confirmation(
 
 @router.post("/logout")
 def logout(
-    *, db: Client = Depends(deps.get_db), current_user: dict = Depends(deps.get_current_user)
+    *, db: Client = Depends(deps.get_auth_db), current_user: dict = Depends(deps.get_current_user)
 ) -> Any:
     """
     Logout user using Supabase Auth
@@ -196,7 +196,7 @@ def logout(
 
 @router.post("/refresh")
 def refresh_token(
-    *, db: Client = Depends(deps.get_db), refresh_token: str
+    *, db: Client = Depends(deps.get_auth_db), refresh_token: str
 ) -> Any:
     """
     Refresh access token using Supabase Auth
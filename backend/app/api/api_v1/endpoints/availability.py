@@ -2,7 +2,8 @@ from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from supabase import Client
 from sqlalchemy.orm import Session
-from datetime import date, datetime
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
 
 from app.api import deps
 from app.crud.crud_availability import crud_availability
@@ -18,6 +19,8 @@ from app.schemas.availability import (
     BlockedTimeUpdate,
     BlockedTimeResponse,
     AvailableTimeSlots,
+    AvailableSlotsRange,
+    EarliestAvailableSlots,
     COMMON_TIMEZONES_CANADA_INDIA,
     is_valid_timezone
 )
@@ -32,24 +35,22 @@ router = APIRouter()
 @router.get("/my-schedule", response_model=WeeklyScheduleResponse)
 def get_my_weekly_schedule(
     *,
-    supabase_db: Client = Depends(deps.get_db),
     sql_db: Session = Depends(deps.get_sqlalchemy_db),
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Get RCIC's complete weekly schedule.
     Only accessible by RCIC users.
     """
-    if current_user["role"] != "rcic":
+    if principal.role != "rcic":
         raise HTTPException(status_code=403, detail="Only RCICs can access this endpoint")
     
     # Get consultant profile
-    consultant_response = supabase_db.table("consultants").select("id, timezone").eq("user_id", current_user["id"]).execute()
-    if not consultant_response.data:
+    if principal.consultant_id is None:
         raise HTTPException(status_code=404, detail="Consultant profile not found")
     
-    consultant_id = consultant_response.data[0]["id"]
-    consultant_tz = consultant_response.data[0]["timezone"] or "America/Toronto"
+    consultant_id = principal.consultant_id
+    consultant_tz = principal.consultant_timezone or "America/Toronto"
     
     # Get all availability slots
     slots = crud_availability.get_consultant_availability(
@@ -68,25 +69,23 @@ def get_my_weekly_schedule(
 @router.post("/my-schedule/slots", response_model=AvailabilitySlotResponse)
 def create_availability_slot(
     *,
-    supabase_db: Client = Depends(deps.get_db),
     sql_db: Session = Depends(deps.get_sqlalchemy_db),
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
     slot_in: AvailabilitySlotCreate,
 ) -> Any:
     """
     Create a new availability slot.
     Only accessible by RCIC users.
     """
-    if current_user["role"] != "rcic":
+    if principal.role != "rcic":
         raise HTTPException(status_code=403, detail="Only RCICs can manage availability")
     
     # Get consultant profile
-    consultant_response = supabase_db.table("consultants").select("id, timezone").eq("user_id", current_user["id"]).execute()
-    if not consultant_response.data:
+    if principal.consultant_id is None:
         raise HTTPException(status_code=404, detail="Consultant profile not found")
     
-    consultant_id = consultant_response.data[0]["id"]
-    consultant_profile_tz = consultant_response.data[0].get("timezone", "America/Toronto")
+    consultant_id = principal.consultant_id
+    consultant_profile_tz = principal.consultant_timezone or "America/Toronto"
     
     # Log incoming request
     log_availability_creation(consultant_id, {
@@ -123,9 +122,8 @@ def create_availability_slot(
 @router.put("/my-schedule/slots/{slot_id}", response_model=AvailabilitySlotResponse)
 def update_availability_slot(
     *,
-    supabase_db: Client = Depends(deps.get_db),
     sql_db: Session = Depends(deps.get_sqlalchemy_db),
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
     slot_id: int,
     slot_in: AvailabilitySlotUpdate,
 ) -> Any:
@@ -133,15 +131,14 @@ def update_availability_slot(
     Update an availability slot.
     Only accessible by RCIC users.
     """
-    if current_user["role"] != "rcic":
+    if principal.role != "rcic":
         raise HTTPException(status_code=403, detail="Only RCICs can manage availability")
     
     # Get consultant profile
-    consultant_response = supabase_db.table("consultants").select("id").eq("user_id", current_user["id"]).execute()
-    if not consultant_response.data:
+    if principal.consultant_id is None:
         raise HTTPException(status_code=404, detail="Consultant profile not found")
     
-    consultant_id = consultant_response.data[0]["id"]
+    consultant_id = principal.consultant_id
     
     # Verify slot belongs to this consultant
     existing_slot = crud_availability.get_availability_slot(sql_db, slot_id)
@@ -164,24 +161,22 @@ def update_availability_slot(
 @router.delete("/my-schedule/slots/{slot_id}")
 def delete_availability_slot(
     *,
-    supabase_db: Client = Depends(deps.get_db),
     sql_db: Session = Depends(deps.get_sqlalchemy_db),
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
     slot_id: int,
 ) -> Any:
     """
     Delete an availability slot.
     Only accessible by RCIC users.
     """
-    if current_user["role"] != "rcic":
+    if principal.role != "rcic":
         raise HTTPException(status_code=403, detail="Only RCICs can manage availability")
     
     # Get consultant profile
-    consultant_response = supabase_db.table("consultants").select("id").eq("user_id", current_user["id"]).execute()
-    if not consultant_response.data:
+    if principal.consultant_id is None:
         raise HTTPException(status_code=404, detail="Consultant profile not found")
     
-    consultant_id = consultant_response.data[0]["id"]
+    consultant_id = principal.consultant_id
     
     # Verify slot belongs to this consultant
     existing_slot = crud_availability.get_availability_slot(sql_db, slot_id)
@@ -200,26 +195,24 @@ def delete_availability_slot(
 @router.post("/my-schedule/replace", response_model=WeeklyScheduleResponse)
 def replace_weekly_schedule(
     *,
-    supabase_db: Client = Depends(deps.get_db),
     sql_db: Session = Depends(deps.get_sqlalchemy_db),
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
     schedule_in: WeeklyScheduleCreate,
 ) -> Any:
     """
     Replace entire weekly schedule at once (bulk update).
-    Deletes all existing slots and creates new ones.
+    Only windows that were added, changed or removed are written.
     Only accessible by RCIC users.
     """
-    if current_user["role"] != "rcic":
+    if principal.role != "rcic":
         raise HTTPException(status_code=403, detail="Only RCICs can manage availability")
     
     # Get consultant profile
-    consultant_response = supabase_db.table("consultants").select("id, timezone").eq("user_id", current_user["id"]).execute()
-    if not consultant_response.data:
+    if principal.consultant_id is None:
         raise HTTPException(status_code=404, detail="Consultant profile not found")
     
-    consultant_id = consultant_response.data[0]["id"]
-    consultant_tz = consultant_response.data[0]["timezone"] or "America/Toronto"
+    consultant_id = principal.consultant_id
+    consultant_tz = principal.consultant_timezone or "America/Toronto"
     
     # Replace all slots
     try:
@@ -245,9 +238,8 @@ def replace_weekly_schedule(
 @router.get("/my-schedule/blocked", response_model=List[BlockedTimeResponse])
 def get_my_blocked_times(
     *,
-    supabase_db: Client = Depends(deps.get_db),
     sql_db: Session = Depends(deps.get_sqlalchemy_db),
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
 ) -> Any:
@@ -255,16 +247,15 @@ def get_my_blocked_times(
     Get RCIC's blocked times (holidays, vacations, etc.).
     Only accessible by RCIC users.
     """
-    if current_user["role"] != "rcic":
+    if principal.role != "rcic":
         raise HTTPException(status_code=403, detail="Only RCICs can access this endpoint")
     
     # Get consultant profile
     try:
-        consultant_response = supabase_db.table("consultants").select("id").eq("user_id", current_user["id"]).execute()
-        if not consultant_response.data:
+        if principal.consultant_id is None:
             raise HTTPException(status_code=404, detail="Consultant profile not found")
         
-        consultant_id = consultant_response.data[0]["id"]
+        consultant_id = principal.consultant_id
         
         blocked_times = crud_availability.get_consultant_blocked_times(
             db=sql_db,
@@ -290,24 +281,22 @@ def get_my_blocked_times(
 @router.post("/my-schedule/blocked", response_model=BlockedTimeResponse)
 def create_blocked_time(
     *,
-    supabase_db: Client = Depends(deps.get_db),
     sql_db: Session = Depends(deps.get_sqlalchemy_db),
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
     blocked_in: BlockedTimeCreate,
 ) -> Any:
     """
     Create a blocked time period (holiday, vacation, etc.).
     Only accessible by RCIC users.
     """
-    if current_user["role"] != "rcic":
+    if principal.role != "rcic":
         raise HTTPException(status_code=403, detail="Only RCICs can manage blocked times")
     
     # Get consultant profile
-    consultant_response = supabase_db.table("consultants").select("id").eq("user_id", current_user["id"]).execute()
-    if not consultant_response.data:
+    if principal.consultant_id is None:
         raise HTTPException(status_code=404, detail="Consultant profile not found")
     
-    consultant_id = consultant_response.data[0]["id"]
+    consultant_id = principal.consultant_id
     
     blocked_time = crud_availability.create_blocked_time(
         db=sql_db,
@@ -321,24 +310,22 @@ def create_blocked_time(
 @router.delete("/my-schedule/blocked/{blocked_id}")
 def delete_blocked_time(
     *,
-    supabase_db: Client = Depends(deps.get_db),
     sql_db: Session = Depends(deps.get_sqlalchemy_db),
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
     blocked_id: int,
 ) -> Any:
     """
     Delete a blocked time period.
     Only accessible by RCIC users.
     """
-    if current_user["role"] != "rcic":
+    if principal.role != "rcic":
         raise HTTPException(status_code=403, detail="Only RCICs can manage blocked times")
     
     # Get consultant profile
-    consultant_response = supabase_db.table("consultants").select("id").eq("user_id", current_user["id"]).execute()
-    if not consultant_response.data:
+    if principal.consultant_id is None:
         raise HTTPException(status_code=404, detail="Consultant profile not found")
     
-    consultant_id = consultant_response.data[0]["id"]
+    consultant_id = principal.consultant_id
     
     # Verify blocked time belongs to this consultant
     blocked_time = crud_availability.get_blocked_time(sql_db, blocked_id)
@@ -420,6 +407,135 @@ def get_available_slots(
         raise HTTPException(status_code=500, detail=f"Failed to fetch available slots: {str(e)}")
 
 
+@router.get("/consultants/{consultant_id}/slots/range", response_model=AvailableSlotsRange)
+def get_available_slots_range(
+    *,
+    supabase_db: Client = Depends(deps.get_db),
+    sql_db: Session = Depends(deps.get_sqlalchemy_db),
+    consultant_id: int,
+    start_date: str = Query(..., description="First date in YYYY-MM-DD format (client's timezone)"),
+    end_date: str = Query(..., description="Last date in YYYY-MM-DD format (client's timezone)"),
+    client_timezone: str = Query("America/Toronto", description="Client's timezone"),
+    service_id: Optional[int] = Query(None, description="Service ID to determine duration"),
+    duration_minutes: Optional[int] = Query(None, description="Custom duration in minutes"),
+) -> Any:
+    """
+    Get available time slots for every date in a range (week or month view).
+    
+    Same rules as /consultants/{consultant_id}/slots, but the schedule, blocked
+    times and bookings are fetched once for the whole range and slots are
+    grouped by the client-local date they start on.
+    
+    Accessible by anyone (no authentication required for browsing).
+    """
+    # Validate and parse dates
+    try:
+        first_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+        last_date = datetime.strptime(end_date, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    days_in_range = (last_date - first_date).days + 1
+    if days_in_range < 1 or days_in_range > availability_service.MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"end_date must be on or after start_date and the range at most "
+                   f"{availability_service.MAX_RANGE_DAYS} days"
+        )
+    
+    # Validate timezone
+    if not is_valid_timezone(client_timezone):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid timezone: {client_timezone}. Must be a valid IANA timezone. "
+                   f"Common options: {', '.join(COMMON_TIMEZONES_CANADA_INDIA[:3])}..."
+        )
+    
+    # Validate duration if provided
+    if duration_minutes is not None and duration_minutes < 15:
+        raise HTTPException(status_code=400, detail="Duration must be at least 15 minutes")
+    
+    try:
+        available_slots = availability_service.get_available_slots_for_range(
+            sql_db=sql_db,
+            supabase_db=supabase_db,
+            consultant_id=consultant_id,
+            start_date=first_date,
+            end_date=last_date,
+            client_timezone=client_timezone,
+            slot_duration_minutes=duration_minutes,
+            service_id=service_id
+        )
+        
+        # Log successful fetch
+        log_slot_fetch(consultant_id, f"{start_date}..{end_date}", client_timezone, available_slots.total_slots)
+        
+        return available_slots
+    
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch available slots: {str(e)}")
+
+
+@router.get("/earliest", response_model=EarliestAvailableSlots)
+def get_earliest_available_slots(
+    *,
+    sql_db: Session = Depends(deps.get_sqlalchemy_db),
+    service_template_id: int = Query(..., description="Service template the client wants"),
+    duration_minutes: int = Query(..., description="Session duration in minutes"),
+    client_timezone: str = Query("America/Toronto", description="Client's timezone"),
+    start_date: Optional[str] = Query(None, description="First date in YYYY-MM-DD format (client's timezone), default today"),
+    days: int = Query(14, ge=1, le=30, description="Number of days to search"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of consultants"),
+) -> Any:
+    """
+    Find the consultants who can see the client soonest for a service.
+    
+    Returns each matching consultant's next free slot in the search window,
+    soonest first, with times in the client's timezone.
+    
+    Accessible by anyone (no authentication required for browsing).
+    """
+    # Validate timezone
+    if not is_valid_timezone(client_timezone):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid timezone: {client_timezone}. Must be a valid IANA timezone. "
+                   f"Common options: {', '.join(COMMON_TIMEZONES_CANADA_INDIA[:3])}..."
+        )
+    
+    if duration_minutes < 15:
+        raise HTTPException(status_code=400, detail="Duration must be at least 15 minutes")
+    
+    client_tz = ZoneInfo(client_timezone)
+    if start_date is None:
+        first_date = datetime.now(client_tz).date()
+    else:
+        try:
+            first_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    window_start = datetime.combine(first_date, time.min).replace(tzinfo=client_tz)
+    window_end = datetime.combine(first_date + timedelta(days=days), time.min).replace(tzinfo=client_tz)
+    
+    try:
+        return availability_service.find_earliest_available_slots(
+            sql_db=sql_db,
+            service_template_id=service_template_id,
+            slot_duration_minutes=duration_minutes,
+            client_timezone=client_timezone,
+            window_start=window_start,
+            window_end=window_end,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search available slots: {str(e)}")
+
+
 @router.get("/consultants/{consultant_id}/schedule")
 def get_consultant_schedule(
     *,
@@ -445,7 +561,7 @@ def get_consultant_schedule(
 # ============================================================
 
 @router.get("/timezones")
-def get_supported_timezones(
+async def get_supported_timezones(
     common_only: bool = Query(True, description="Return only common Canada/India timezones")
 ) -> Any:
     """
@@ -489,7 +605,7 @@ def get_supported_timezones(
 
 
 @router.get("/timezone-offset")
-def get_timezone_offset(
+async def get_timezone_offset(
     tz1: str = Query(..., description="First timezone"),
     tz2: str = Query(..., description="Second timezone"),
 ) -> Any:
@@ -1,24 +1,33 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from supabase import Client
 
 from app.api import deps
 from app.crud import crud_blog
+from app.crud.base import NEXT_CURSOR_HEADER, next_cursor
 from app.schemas.blog import BlogPostInDB, BlogPostCreate, BlogPostUpdate, BlogCommentCreate, BlogLikeCreate
 
 router = APIRouter()
 
 @router.get("/", response_model=List[BlogPostInDB])
 def read_blog_posts(
+    response: Response,
     db: Client = Depends(deps.get_db),
     skip: int = 0,
     limit: int = Query(default=10, le=100),
     category: str = None,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header; empty for the first page"),
 ) -> Any:
     """
-    Retrieve blog posts.
+    Retrieve blog posts. With a cursor, pages continue after the cursor and skip is ignored.
     """
-    posts = crud_blog.get_blog_posts(db, skip=skip, limit=limit, category=category)
+    try:
+        posts = crud_blog.get_blog_posts(db, skip=skip, limit=limit, category=category, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_page = next_cursor(posts, limit) if cursor is not None else None
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
     return posts
 
 @router.get("/search", response_model=List[BlogPostInDB])
@@ -1,14 +1,24 @@
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
 from supabase import Client
+from postgrest import AsyncPostgrestClient
+from postgrest.exceptions import APIError
 from pydantic import BaseModel
 
 from app.api import deps
 from app.crud import crud_booking, crud_consultant, crud_intake
-from app.schemas.booking import BookingInDB, BookingCreate, BookingUpdate, BookingDocumentCreate
+from app.crud.async_repository import booking_repository
+from app.crud.base import NEXT_CURSOR_HEADER, next_cursor
+from app.schemas.booking import (
+    BookingInDB, BookingCreate, BookingUpdate, BookingDocumentCreate, BookingHoldCreate, BookingHoldInDB
+)
 from app.models.booking import BookingStatus, PaymentStatus
 from app.utils.email_service import EmailService
-from app.services.intake_extraction_service import intake_extraction_service
 
 router = APIRouter()
 
@@ -22,20 +32,17 @@ class PriceResponse(BaseModel):
     duration_label: str
 
 @router.post("/calculate-price", response_model=PriceResponse)
-def calculate_price(
+async def calculate_price(
     *, 
-    db: Client = Depends(deps.get_db),
+    db: AsyncPostgrestClient = Depends(deps.get_async_db),
     price_request: PriceRequest
 ) -> Any:
     """
     Get the price for a specific service and duration option.
     Uses the new duration-based pricing system.
     """
-    from app.crud.crud_consultant_service_pricing import consultant_service_pricing
-    from app.crud.crud_service_duration_option import service_duration_option
-    
-    # Get the pricing set by RCIC for this service and duration
-    pricing = consultant_service_pricing.get_price_by_duration(
+    # Get the pricing set by RCIC for this service and duration, plus the duration option details
+    pricing, duration_option = await booking_repository.get_price_and_duration_option(
         db, 
         consultant_service_id=price_request.service_id,
         duration_option_id=price_request.duration_option_id
@@ -47,8 +54,6 @@ def calculate_price(
             detail="Price not set for this service and duration combination"
         )
     
-    # Get duration option details
-    duration_option = service_duration_option.get(db, option_id=price_request.duration_option_id)
     if not duration_option:
         raise HTTPException(status_code=404, detail="Duration option not found")
     
@@ -58,64 +63,138 @@ def calculate_price(
         "duration_label": duration_option["duration_label"]
     }
 
+# Postgres exclusion_violation: the bookings_no_overlap constraint caught an overlapping booking
+EXCLUSION_VIOLATION = "23P01"
+
+def booking_write_error(e: APIError, action: str) -> HTTPException:
+    """
+    HTTP error for a failed booking write. The booking functions report their
+    HTTP status as PostgREST PTxxx codes; an overlap caught by the constraint
+    on any other write is a 409 as well.
+    """
+    if e.code and e.code.startswith("PT"):
+        return HTTPException(status_code=int(e.code[2:]), detail=e.message)
+    if e.code == EXCLUSION_VIOLATION:
+        return HTTPException(status_code=409, detail="This time slot is no longer available")
+    return HTTPException(status_code=500, detail=f"Failed to {action}: {e.message}")
+
+def sanitize_booking(booking: dict) -> dict:
+    """Default null status and payment_status to pending, in place"""
+    if booking.get('status') is None:
+        booking['status'] = BookingStatus.pending.value
+    if booking.get('payment_status') is None:
+        booking['payment_status'] = PaymentStatus.pending.value
+    return booking
+
 def sanitize_booking_data(bookings: List[dict]) -> List[dict]:
-    """Sanitize booking data to handle null status and payment_status"""
-    sanitized = []
+    """Sanitize booking data to handle null status and payment_status (rows are freshly fetched, so in place)"""
     for booking in bookings:
-        # Create a copy to avoid modifying original data
-        booking_copy = booking.copy()
-        
-        # Handle null status and payment_status
-        if booking_copy.get('status') is None:
-            booking_copy['status'] = BookingStatus.pending.value
-        if booking_copy.get('payment_status') is None:
-            booking_copy['payment_status'] = PaymentStatus.pending.value
-            
-        sanitized.append(booking_copy)
-    return sanitized
+        sanitize_booking(booking)
+    return bookings
 
 @router.get("/", response_model=List[BookingInDB])
-def read_bookings(
-    db: Client = Depends(deps.get_db),
-    current_user: dict = Depends(deps.get_current_active_user),
+async def read_bookings(
+    response: Response,
+    db: AsyncPostgrestClient = Depends(deps.get_async_db),
+    principal: deps.Principal = Depends(deps.get_current_principal),
+    status: Optional[BookingStatus] = None,
+    payment_status: Optional[PaymentStatus] = None,
+    consultant_id: Optional[int] = None,
+    date_from: Optional[datetime] = Query(None, description="Bookings on or after this time"),
+    date_to: Optional[datetime] = Query(None, description="Bookings before this time"),
+    skip: int = 0,
+    limit: int = Query(default=100, le=500),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header; empty for the first page"),
 ) -> Any:
     """
     Retrieve bookings for the current user.
+    
+    Admins get one page of all bookings, newest first, narrowed by the filters.
+    With a cursor, pages continue after the cursor and skip is ignored.
     """
-    if current_user["role"] == "client":
-        bookings = crud_booking.get_bookings_by_client(db, client_id=current_user["id"])
-    elif current_user["role"] == "rcic":
-        # First get consultant profile for this user
-        consultant_response = db.table("consultants").select("id").eq("user_id", current_user["id"]).execute()
-        if not consultant_response.data:
+    if principal.role == "client":
+        bookings = await booking_repository.get_by_client(db, client_id=principal.id)
+    elif principal.role == "rcic":
+        if principal.consultant_id is None:
             # Check if there are any consultants at all and what user_ids they have
-            all_consultants = db.table("consultants").select("id, user_id, name").execute()
-            detail_msg = f"Consultant profile not found for user_id: {current_user['id']}. "
+            all_consultants = await db.table("consultants").select("id, user_id, name").execute()
+            detail_msg = f"Consultant profile not found for user_id: {principal.id}. "
             if all_consultants.data:
                 detail_msg += f"Available consultants: {all_consultants.data}"
             else:
                 detail_msg += "No consultants found in database."
             raise HTTPException(status_code=404, detail=detail_msg)
-        consultant_id = consultant_response.data[0]["id"]
-        bookings = crud_booking.get_bookings_by_consultant(db, consultant_id=consultant_id)
+        bookings = await booking_repository.get_by_consultant(db, consultant_id=principal.consultant_id)
     else:
         # Admin can see all bookings
-        bookings = db.table("bookings").select("*, documents:booking_documents(*)").execute().data
+        try:
+            bookings = await booking_repository.get_page(
+                db, skip=skip, limit=limit, cursor=cursor, status=status, payment_status=payment_status,
+                consultant_id=consultant_id, date_from=date_from, date_to=date_to,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        next_page = next_cursor(bookings, limit) if cursor is not None else None
+        if next_page:
+            response.headers[NEXT_CURSOR_HEADER] = next_page
     
     # Sanitize booking data to handle null values
     return sanitize_booking_data(bookings)
 
+async def ndjson_lines(bookings: AsyncIterator[dict]) -> AsyncIterator[str]:
+    async for booking in bookings:
+        yield json.dumps(sanitize_booking(booking), default=str) + "\n"
+
+async def csv_lines(bookings: AsyncIterator[dict]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=crud_booking.BOOKING_EXPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    async for booking in bookings:
+        writer.writerow(sanitize_booking(booking))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when nothing matched
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+@router.get("/export")
+async def export_bookings(
+    db: AsyncPostgrestClient = Depends(deps.get_async_db),
+    current_user: dict = Depends(deps.get_current_admin_user),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    status: Optional[BookingStatus] = None,
+    payment_status: Optional[PaymentStatus] = None,
+    consultant_id: Optional[int] = None,
+    date_from: Optional[datetime] = Query(None, description="Bookings on or after this time"),
+    date_to: Optional[datetime] = Query(None, description="Bookings before this time"),
+) -> Any:
+    """
+    Export all matching bookings (admin only) as NDJSON or CSV, newest first.
+    
+    Rows are streamed as each keyset page arrives, so memory stays flat however
+    many bookings match.
+    """
+    bookings = booking_repository.stream(
+        db, status=status, payment_status=payment_status, consultant_id=consultant_id,
+        date_from=date_from, date_to=date_to,
+    )
+    if export_format == "csv":
+        return StreamingResponse(csv_lines(bookings), media_type="text/csv",
+                                 headers={"Content-Disposition": 'attachment; filename="bookings.csv"'})
+    return StreamingResponse(ndjson_lines(bookings), media_type="application/x-ndjson")
+
 @router.get("/{booking_id}", response_model=BookingInDB)
-def read_booking(
+async def read_booking(
     *,
-    db: Client = Depends(deps.get_db),
+    db: AsyncPostgrestClient = Depends(deps.get_async_db),
     booking_id: int,
     current_user: dict = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get booking by ID.
     """
-    booking = crud_booking.get_booking(db=db, booking_id=booking_id)
+    booking = await booking_repository.get(db, booking_id=booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
@@ -164,14 +243,15 @@ def create_booking(
         
         # Calculate price based on duration
         price_per_minute = service_data['price'] / service_data['duration']
-        booking_in.price = price_per_minute * duration
-        booking_in.duration = duration
+        booking_in.total_amount = price_per_minute * duration
     else:
-        # Use default service price and duration
-        booking_in.price = service_data['price']
-        booking_in.duration = service_data['duration']
+        # Use default service price (the slot length comes from the service, see bookings.ends_at)
+        booking_in.total_amount = service_data['price']
 
-    booking = crud_booking.create_booking(db=db, obj_in=booking_in)
+    try:
+        booking = crud_booking.create_booking(db=db, obj_in=booking_in)
+    except APIError as e:
+        raise booking_write_error(e, "create booking")
     # Sanitize booking data to handle null values
     return sanitize_booking_data([booking])[0]
 
@@ -195,87 +275,96 @@ def create_booking_with_duration(
     """
     Create new booking using the new duration-based pricing system.
     Client selects a specific duration option that the RCIC has priced.
-    """
-    from app.crud.crud_consultant_service_pricing import consultant_service_pricing
-    from app.crud.crud_service_duration_option import service_duration_option
     
+    The service, pricing and duration option checks and the insert happen in
+    one database call; only the client's stored intake summary is read beforehand.
+    """
     # Only clients can create bookings through this endpoint
     if current_user["role"] != "client":
         raise HTTPException(status_code=403, detail="Only clients can book services")
     
-    # Verify service belongs to consultant
-    service_response = db.table("consultant_services").select("*").eq("id", booking_request.service_id).eq("consultant_id", booking_request.consultant_id).execute()
-    if not service_response.data:
-        raise HTTPException(status_code=404, detail="Service not found for this consultant")
-    
-    service = service_response.data[0]
-    if not service["is_active"]:
-        raise HTTPException(status_code=400, detail="This service is not currently available")
-    
-    # Get the pricing set by RCIC for this service and duration
-    pricing = consultant_service_pricing.get_price_by_duration(
-        db,
-        consultant_service_id=booking_request.service_id,
-        duration_option_id=booking_request.duration_option_id
-    )
-    
-    if not pricing:
-        raise HTTPException(
-            status_code=400,
-            detail="The RCIC has not set pricing for this service and duration combination"
-        )
-    
-    # Get duration option details
-    duration_option = service_duration_option.get(db, option_id=booking_request.duration_option_id)
-    if not duration_option:
-        raise HTTPException(status_code=404, detail="Duration option not found")
-    
-    # Extract intake data for this client
-    intake_data = None
+    # Intake summary for this client, as stored with its latest revision
     extracted_intake = None
     try:
-        intake_data = crud_intake.intake.get_by_client_id(db, current_user["id"])
-        if intake_data:
-            extracted_intake = intake_extraction_service.extract_intake_summary(intake_data)
-            print(f"✅ BookingAPI: Extracted intake data for client {current_user['id']}")
+        extracted_intake = crud_intake.intake.get_booking_summary(db, current_user["id"])
+        if extracted_intake:
+            print(f"✅ BookingAPI: Loaded intake summary for client {current_user['id']}")
         else:
             print(f"⚠️ BookingAPI: No intake data found for client {current_user['id']}")
     except Exception as e:
         print(f"⚠️ BookingAPI: Failed to extract intake data: {str(e)}")
     
-    # Create booking with duration-based pricing
-    booking_data = {
-        "client_id": current_user["id"],
-        "consultant_id": booking_request.consultant_id,
-        "service_id": booking_request.service_id,
-        "booking_date": booking_request.booking_date,
-        "timezone": booking_request.timezone,
-        "total_amount": pricing["price"],
-        "intake_form_data": extracted_intake or booking_request.intake_form_data or {"summary": "No intake data available"},
-        "duration_option_id": booking_request.duration_option_id,
-    }
-    
     try:
-        # Use the existing booking creation function
-        from app.schemas.booking import BookingCreate
-        booking_create = BookingCreate(**booking_data)
-        booking = crud_booking.create_booking(db=db, obj_in=booking_create)
-        
-        # Sanitize booking data to handle null values
-        return sanitize_booking_data([booking])[0]
+        booking = crud_booking.create_booking_with_duration(
+            db,
+            client_id=current_user["id"],
+            consultant_id=booking_request.consultant_id,
+            service_id=booking_request.service_id,
+            duration_option_id=booking_request.duration_option_id,
+            booking_date=booking_request.booking_date,
+            timezone=booking_request.timezone,
+            intake_form_data=extracted_intake or booking_request.intake_form_data or {"summary": "No intake data available"}
+        )
+    except APIError as e:
+        raise booking_write_error(e, "create booking")
     
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to create booking: {str(e)}"
+    # Sanitize booking data to handle null values
+    return sanitize_booking_data([booking])[0]
+
+
+@router.post("/holds", response_model=BookingHoldInDB)
+def hold_booking_slot(
+    *,
+    db: Client = Depends(deps.get_db),
+    hold_request: BookingHoldCreate,
+    current_user: dict = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Hold a slot for the current client while they pay.
+    
+    The hold expires after BOOKING_HOLD_MINUTES; until then nobody else can book
+    or hold an overlapping time, and /bookings/create-with-duration for the
+    slot uses it up. A slot that is already booked or held fails at once with 409.
+    """
+    if current_user["role"] != "client":
+        raise HTTPException(status_code=403, detail="Only clients can book services")
+    
+    try:
+        hold = crud_booking.hold_booking_slot(
+            db,
+            client_id=current_user["id"],
+            consultant_id=hold_request.consultant_id,
+            service_id=hold_request.service_id,
+            duration_option_id=hold_request.duration_option_id,
+            booking_date=hold_request.booking_date,
         )
+    except APIError as e:
+        raise booking_write_error(e, "hold time slot")
+    
+    print(f"✅ BookingAPI: Slot held for client {current_user['id']} until {hold['expires_at']}")
+    return hold
+
+
+@router.delete("/holds/{hold_id}")
+def release_booking_hold(
+    *,
+    db: Client = Depends(deps.get_db),
+    hold_id: int,
+    current_user: dict = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Release the current client's hold, e.g. when they abandon payment.
+    """
+    if not crud_booking.release_booking_hold(db, hold_id=hold_id, client_id=current_user["id"]):
+        raise HTTPException(status_code=404, detail="Hold not found")
+    return {"message": "Hold released successfully"}
 
 @router.post("/{booking_id}/room", response_model=BookingInDB)
 async def create_or_get_room(
     *,
     db: Client = Depends(deps.get_db),
     booking_id: int,
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Create a meeting room for the booking if not exists using Daily.co API.
@@ -290,12 +379,10 @@ async def create_or_get_room(
         raise HTTPException(status_code=404, detail="Booking not found")
     
     # Permission: client or rcic belonging to this booking can create/get the room
-    if current_user["role"] == "client" and booking["client_id"] != current_user["id"]:
+    if principal.role == "client" and booking["client_id"] != principal.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    if principal.role == "rcic" and not principal.owns_consultant(booking["consultant_id"]):
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    if current_user["role"] == "rcic":
-        consultant_resp = db.table("consultants").select("id").eq("user_id", current_user["id"]).execute()
-        if not consultant_resp.data or consultant_resp.data[0]["id"] != booking["consultant_id"]:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
 
     # If room already exists, return it
     if booking.get("meeting_url"):
@@ -361,9 +448,12 @@ def update_booking(
     if current_user["role"] == "client" and booking["client_id"] != current_user["id"]:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    updated_booking = crud_booking.update_booking(
-        db=db, booking_id=booking_id, obj_in=booking_in
-    )
+    try:
+        updated_booking = crud_booking.update_booking(
+            db=db, booking_id=booking_id, obj_in=booking_in
+        )
+    except APIError as e:
+        raise booking_write_error(e, "update booking")
     # Sanitize booking data to handle null values
     return sanitize_booking_data([updated_booking])[0]
 
@@ -505,7 +595,7 @@ def get_booking_documents(
     *,
     db: Client = Depends(deps.get_db),
     booking_id: int,
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Get all documents for a booking (for RCIC panel viewing).
@@ -517,44 +607,37 @@ def get_booking_documents(
         raise HTTPException(status_code=404, detail="Booking not found")
     
     # Check permissions - only RCIC, client, or admin can view documents
-    if current_user["role"] == "client" and booking["client_id"] != current_user["id"]:
+    if principal.role == "client" and booking["client_id"] != principal.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    
+    # Ensure RCIC owns this booking
+    if principal.role == "rcic" and not principal.owns_consultant(booking["consultant_id"]):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    if current_user["role"] == "rcic":
-        # Ensure RCIC owns this booking
-        consultant_response = db.table("consultants").select("id").eq("user_id", current_user["id"]).execute()
-        if not consultant_response.data or booking["consultant_id"] != consultant_response.data[0]["id"]:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
+    # Sign every document's URL in one storage call (none when they are all cached)
+    documents = booking.get("documents") or []
+    url_error = "file could not be signed"
+    try:
+        signed_urls = storage_service.get_file_urls([doc["file_path"] for doc in documents], expires_in=3600)  # 1 hour expiry
+    except HTTPException as e:
+        print(f"Error generating URLs for booking {booking_id} documents: {e.detail}")
+        signed_urls, url_error = {}, e.detail
     
-    # Get all documents for this booking
     documents_with_urls = []
-    if booking.get("documents"):
-        for doc in booking["documents"]:
-            try:
-                # Generate signed URL for document access
-                signed_url = storage_service.get_file_url(doc["file_path"], expires_in=3600)  # 1 hour expiry
-                documents_with_urls.append({
-                    "id": doc["id"],
-                    "booking_id": doc["booking_id"],
-                    "file_name": doc["file_name"],
-                    "file_type": doc["file_type"],
-                    "file_size": doc["file_size"],
-                    "uploaded_at": doc["uploaded_at"],
-                    "download_url": signed_url
-                })
-            except Exception as e:
-                print(f"Error generating URL for document {doc['id']}: {e}")
-                # Include document info but without URL if generation fails
-                documents_with_urls.append({
-                    "id": doc["id"],
-                    "booking_id": doc["booking_id"],
-                    "file_name": doc["file_name"],
-                    "file_type": doc["file_type"],
-                    "file_size": doc["file_size"],
-                    "uploaded_at": doc["uploaded_at"],
-                    "download_url": None,
-                    "error": f"Cannot access file: {str(e)}"
-                })
+    for doc in documents:
+        document = {
+            "id": doc["id"],
+            "booking_id": doc["booking_id"],
+            "file_name": doc["file_name"],
+            "file_type": doc["file_type"],
+            "file_size": doc["file_size"],
+            "uploaded_at": doc["uploaded_at"],
+            "download_url": signed_urls.get(doc["file_path"])
+        }
+        if document["download_url"] is None:
+            # Include document info but without URL if generation fails
+            document["error"] = f"Cannot access file: {url_error}"
+        documents_with_urls.append(document)
     
     return {
         "booking_id": booking_id,
@@ -568,7 +651,7 @@ def download_booking_document(
     db: Client = Depends(deps.get_db),
     booking_id: int,
     document_id: int,
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Get download URL for a specific document.
@@ -580,13 +663,11 @@ def download_booking_document(
         raise HTTPException(status_code=404, detail="Booking not found")
     
     # Check permissions
-    if current_user["role"] == "client" and booking["client_id"] != current_user["id"]:
+    if principal.role == "client" and booking["client_id"] != principal.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    if current_user["role"] == "rcic":
-        consultant_response = db.table("consultants").select("id").eq("user_id", current_user["id"]).execute()
-        if not consultant_response.data or booking["consultant_id"] != consultant_response.data[0]["id"]:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
+    if principal.role == "rcic" and not principal.owns_consultant(booking["consultant_id"]):
+        raise HTTPException(status_code=403, detail="Not enough permissions")
     
     # Find the specific document
     document = None
@@ -629,7 +710,7 @@ def send_booking_notes(
     admin_db: Client = Depends(deps.get_admin_db),
     booking_id: int,
     payload: SendNotesRequest,
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Send meeting notes to the booking's client via email.
@@ -640,13 +721,11 @@ def send_booking_notes(
         raise HTTPException(status_code=404, detail="Booking not found")
 
     # Permissions: RCIC for this booking, the client, or admin
-    if current_user["role"] == "client" and booking["client_id"] != current_user["id"]:
+    if principal.role == "client" and booking["client_id"] != principal.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    # Ensure rcic owns this booking
+    if principal.role == "rcic" and not principal.owns_consultant(booking["consultant_id"]):
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    if current_user["role"] == "rcic":
-        # Ensure rcic owns this booking
-        consultant_resp = db.table("consultants").select("id").eq("user_id", current_user["id"]).execute()
-        if not consultant_resp.data or booking["consultant_id"] != consultant_resp.data[0]["id"]:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
 
     # Fetch client email using admin privileges
     client_resp = admin_db.auth.admin.get_user_by_id(booking["client_id"])  # type: ignore[attr-defined]
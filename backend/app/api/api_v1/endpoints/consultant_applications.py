@@ -1,7 +1,8 @@
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Response
 from supabase import Client
 from app.api import deps
+from app.crud.base import NEXT_CURSOR_HEADER, next_cursor
 from app.crud.crud_consultant_application import consultant_application
 from app.schemas.consultant_application import (
     ConsultantApplicationCreate,
@@ -338,17 +339,26 @@ async def create_consultant_application(
 
 @router.get("/", response_model=List[ConsultantApplicationResponse])
 def get_consultant_applications(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header; empty for the first page"),
     db: Client = Depends(deps.get_db)
 ):
     """
-    Get all consultant applications with optional status filter
+    Get all consultant applications with optional status filter.
+    With a cursor, pages are newest first and continue after the cursor; skip is ignored.
     """
-    applications = consultant_application.get_multi(
-        db=db, skip=skip, limit=limit, status=status
-    )
+    try:
+        applications = consultant_application.get_multi(
+            db=db, skip=skip, limit=limit, status=status, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_page = next_cursor(applications, limit) if cursor is not None else None
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
     return applications
 
 @router.get("/stats")
@@ -1,9 +1,14 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from supabase import Client
+from postgrest import AsyncPostgrestClient
 
 from app.api import deps
 from app.crud import crud_consultant
+from app.crud.async_repository import consultant_repository
+from app.crud.base import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.crud.consultant_directory import consultant_directory
+from app.crud.profile_cache import invalidate_profile
 from app.crud.crud_service_template import service_template
 from app.crud.crud_service_duration_option import service_duration_option
 from app.crud.crud_consultant_service_pricing import consultant_service_pricing
@@ -23,65 +28,58 @@ from app.schemas.service_template import ServiceTemplateResponse
 router = APIRouter()
 
 @router.get("/", response_model=List[ConsultantInDB])
-def read_consultants(
-    db: Client = Depends(deps.get_db),
+async def read_consultants(
+    response: Response,
+    db: AsyncPostgrestClient = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
     language: str = Query(None),
     province: str = Query(None),
     specialty: str = Query(None),
     search: str = Query(None),
+    sort: str = Query(None, description="rating, name or reviews; defaults to consultant id"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header; empty for the first page"),
 ) -> Any:
     """
-    Retrieve consultants with optional filtering.
+    Retrieve consultants with optional filtering, served from this worker's directory snapshot.
+    With a cursor, pages continue after the previous page's last consultant and skip is ignored.
     """
-    # For now, get all consultants and filter in memory
-    # In production, you would implement database-level filtering
-    consultants = crud_consultant.consultant.get_multi(db, skip=skip, limit=limit)
-    
-    # Apply filters
-    filtered_consultants = consultants
-    
-    # Filter by language
-    if language:
-        filtered_consultants = [c for c in filtered_consultants if language in c.get('languages', [])]
-    
-    # Filter by province
-    if province:
-        filtered_consultants = [c for c in filtered_consultants if province in c.get('location', '')]
-    
-    # Filter by specialty
-    if specialty:
-        filtered_consultants = [c for c in filtered_consultants if specialty in c.get('specialties', [])]
-    
-    # Filter by search term (name, bio, specialties, languages)
-    if search:
-        search_lower = search.lower()
-        filtered_consultants = [
-            c for c in filtered_consultants 
-            if search_lower in c.get('name', '').lower() or
-               search_lower in c.get('bio', '').lower() or
-               any(search_lower in spec.lower() for spec in c.get('specialties', [])) or
-               any(search_lower in lang.lower() for lang in c.get('languages', []))
-        ]
-    
-    return filtered_consultants
+    snapshot = await consultant_directory.get_snapshot(db)
+    try:
+        after = None
+        if cursor:
+            sort_name, *after = decode_cursor(cursor)
+            if sort_name != (sort or "id"):
+                raise ValueError("Cursor belongs to a different sort order")
+        consultants = snapshot.query(
+            skip=0 if cursor is not None else skip,
+            limit=limit,
+            sort=sort,
+            after=after,
+            language=language,
+            province=province,
+            specialty=specialty,
+            search=search,
+        )
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if cursor is not None and len(consultants) == limit:
+        last_key = snapshot.sort_key(consultants[-1]["id"], sort)
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort or "id", *last_key)
+    return consultants
 
 @router.get("/{consultant_id}", response_model=ConsultantInDB)
-def read_consultant(
+async def read_consultant(
     *,
-    db: Client = Depends(deps.get_db),
+    db: AsyncPostgrestClient = Depends(deps.get_async_db),
     consultant_id: int,
 ) -> Any:
     """
     Get consultant by ID.
     """
-    consultant = crud_consultant.consultant.get(db=db, consultant_id=consultant_id)
+    consultant = await consultant_repository.get_profile(db, consultant_id=consultant_id)
     if not consultant:
         raise HTTPException(status_code=404, detail="Consultant not found")
-    # Add services to the consultant object
-    services = crud_consultant.get_services_by_consultant(db=db, consultant_id=consultant_id)
-    consultant["services"] = services
     return consultant
 
 @router.post("/", response_model=ConsultantInDB)
@@ -161,39 +159,36 @@ def update_consultant_service(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{consultant_id}/services")
-def get_consultant_services(
+async def get_consultant_services(
     *,
-    db: Client = Depends(deps.get_db),
+    db: AsyncPostgrestClient = Depends(deps.get_async_db),
     consultant_id: int,
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Get all services for a consultant (for consultant's own management).
     Shows all services (active and inactive) so consultant can manage them.
     """
-    # Get consultant info to verify ownership
-    consultant = crud_consultant.consultant.get_by_user_id(db, current_user["id"])
-    
-    if not consultant or consultant["id"] != consultant_id:
+    if not principal.owns_consultant(consultant_id):
         # If not the consultant themselves, only show active services
-        services = crud_consultant.get_services_by_consultant(db=db, consultant_id=consultant_id, active_only=True)
+        services = await consultant_repository.get_services(db, consultant_id=consultant_id, active_only=True)
     else:
         # If it's the consultant's own request, show all services
-        services = crud_consultant.get_services_by_consultant(db=db, consultant_id=consultant_id, active_only=False)
+        services = await consultant_repository.get_services(db, consultant_id=consultant_id, active_only=False)
     
     return services
 
 @router.get("/{consultant_id}/services/active")
-def get_consultant_active_services(
+async def get_consultant_active_services(
     *,
-    db: Client = Depends(deps.get_db),
+    db: AsyncPostgrestClient = Depends(deps.get_async_db),
     consultant_id: int,
 ) -> Any:
     """
     Get only active services for a consultant (public endpoint for booking).
     This is what clients see when they want to book services.
     """
-    services = crud_consultant.get_services_by_consultant(db=db, consultant_id=consultant_id, active_only=True)
+    services = await consultant_repository.get_services(db, consultant_id=consultant_id, active_only=True)
     return services
 
 @router.patch("/{consultant_id}/services/{service_id}/toggle")
@@ -224,6 +219,7 @@ def toggle_consultant_service_status(
         
         # Update the service status
         response = db.table("consultant_services").update({"is_active": new_status}).eq("id", service_id).execute()
+        invalidate_profile(consultant_id)
         
         if response.data:
             status_text = "activated" if new_status else "deactivated"
@@ -337,17 +333,16 @@ def get_consultant_services_with_pricing(
     db: Client = Depends(deps.get_db),
     consultant_id: int,
     active_only: bool = Query(False),
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Get all services for a consultant with their duration-based pricing.
     Used by RCIC panel to manage service pricing.
     """
     # Verify consultant ownership for full access
-    consultant = crud_consultant.consultant.get_by_user_id(db, current_user["id"])
-    if consultant and consultant["id"] == consultant_id:
+    if principal.owns_consultant(consultant_id):
         # Own services - can see all (active and inactive)
-        services = crud_consultant.get_services_with_pricing(db, consultant_id, active_only=False if not active_only else True)
+        services = crud_consultant.get_services_with_pricing(db, consultant_id, active_only=active_only)
     else:
         # Other user - only see active services
         services = crud_consultant.get_services_with_pricing(db, consultant_id, active_only=True)
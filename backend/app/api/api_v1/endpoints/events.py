@@ -125,7 +125,7 @@ async def stream_booking_updates(
 async def get_booking_status(
     booking_id: int,
     db: Client = Depends(deps.get_db),
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
 ):
     """
     Simple endpoint to get current status of a specific booking.
@@ -140,20 +140,18 @@ async def get_booking_status(
     booking = booking_response.data[0]
     
     # Check permissions
-    if current_user["role"] == "client":
+    if principal.role == "client":
         # Verify this booking belongs to the client
         full_booking = db.table("bookings").select("client_id").eq("id", booking_id).execute()
-        if not full_booking.data or full_booking.data[0]["client_id"] != current_user["id"]:
+        if not full_booking.data or full_booking.data[0]["client_id"] != principal.id:
             raise HTTPException(status_code=403, detail="Not authorized to view this booking")
-    elif current_user["role"] == "rcic":
+    elif principal.role == "rcic":
         # Verify this booking belongs to the RCIC's consultant record
-        consultant_query = db.table("consultants").select("id").eq("user_id", current_user["id"]).execute()
-        if not consultant_query.data:
+        if principal.consultant_id is None:
             raise HTTPException(status_code=403, detail="RCIC consultant record not found")
         
-        consultant_id = consultant_query.data[0]['id']
         full_booking = db.table("bookings").select("consultant_id").eq("id", booking_id).execute()
-        if not full_booking.data or full_booking.data[0]["consultant_id"] != consultant_id:
+        if not full_booking.data or full_booking.data[0]["consultant_id"] != principal.consultant_id:
             raise HTTPException(status_code=403, detail="Not authorized to view this booking")
     
     return {
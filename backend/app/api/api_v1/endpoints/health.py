@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from fastapi import APIRouter
 from app.core.config import settings
+from app.db.supabase import supabase_registry
 
 router = APIRouter()
 
@@ -17,3 +18,8 @@ def health_check():
         "version": settings.API_V1_STR,
         "time": datetime.now(timezone.utc).isoformat(),
     }
+
+@router.get("/db-pool")
+def db_pool_metrics():
+    """Supabase client and HTTP connection reuse counters for this worker."""
+    return supabase_registry.metrics.snapshot()
@@ -1,9 +1,12 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Response
 from supabase import Client
+from postgrest import AsyncPostgrestClient
 
 from app.api import deps
 from app.crud import crud_intake
+from app.crud.async_repository import intake_repository
+from app.crud.base import NEXT_CURSOR_HEADER, next_cursor
 from app.schemas.intake import (
     IntakeResponse, IntakeUpdateRequest, IntakeCompleteStageRequest,
     IntakeSummaryResponse, IntakeCreateRequest
@@ -17,9 +20,9 @@ from app.utils.intake_validation import (
 router = APIRouter()
 
 @router.get("/me", response_model=IntakeResponse)
-def get_my_intake(
+async def get_my_intake(
     *,
-    db: Client = Depends(deps.get_db),
+    db: AsyncPostgrestClient = Depends(deps.get_async_db),
     current_user: dict = Depends(deps.get_current_active_user)
 ) -> Any:
     """
@@ -32,10 +35,10 @@ def get_my_intake(
             detail="RCICs and admins don't have intake data"
         )
     
-    intake = crud_intake.intake.get_by_client_id(db, current_user["id"])
+    intake = await intake_repository.get_by_client_id(db, current_user["id"])
     if not intake:
         # Auto-create intake if it doesn't exist
-        intake = crud_intake.intake.create_for_user(
+        intake = await intake_repository.create_for_user(
             db, 
             current_user["id"], 
             current_user.get("full_name"), 
@@ -45,9 +48,9 @@ def get_my_intake(
     return intake
 
 @router.get("/me/summary", response_model=IntakeSummaryResponse)
-def get_my_intake_summary(
+async def get_my_intake_summary(
     *,
-    db: Client = Depends(deps.get_db),
+    db: AsyncPostgrestClient = Depends(deps.get_async_db),
     current_user: dict = Depends(deps.get_current_active_user)
 ) -> Any:
     """
@@ -59,23 +62,22 @@ def get_my_intake_summary(
             detail="RCICs and admins don't have intake data"
         )
     
-    summary = crud_intake.intake.get_summary(db, current_user["id"])
-    if not summary:
+    intake = await intake_repository.get_by_client_id(db, current_user["id"])
+    if not intake:
         # Auto-create intake if it doesn't exist
-        intake = crud_intake.intake.create_for_user(
+        intake = await intake_repository.create_for_user(
             db, 
             current_user["id"], 
             current_user.get("full_name"), 
             current_user.get("email")
         )
-        summary = crud_intake.intake.get_summary(db, current_user["id"])
     
-    return summary
+    return crud_intake.intake.build_summary(intake) if intake else None
 
 @router.post("/me/update", response_model=IntakeResponse)
-def update_my_intake(
+async def update_my_intake(
     *,
-    db: Client = Depends(deps.get_db),
+    db: AsyncPostgrestClient = Depends(deps.get_async_db),
     current_user: dict = Depends(deps.get_current_active_user),
     intake_data: IntakeUpdateRequest
 ) -> Any:
@@ -105,7 +107,7 @@ def update_my_intake(
             detail=str(e)
         )
     
-    intake = crud_intake.intake.update_stage_data(
+    intake = await intake_repository.update_stage_data(
         db, 
         current_user["id"], 
         intake_data.stage, 
@@ -121,9 +123,9 @@ def update_my_intake(
     return intake
 
 @router.post("/me/complete-stage", response_model=IntakeResponse)
-def complete_intake_stage(
+async def complete_intake_stage(
     *,
-    db: Client = Depends(deps.get_db),
+    db: AsyncPostgrestClient = Depends(deps.get_async_db),
     current_user: dict = Depends(deps.get_current_active_user),
     stage_data: IntakeCompleteStageRequest
 ) -> Any:
@@ -137,7 +139,7 @@ def complete_intake_stage(
         )
     
     # Get intake to validate completion requirements
-    intake = crud_intake.intake.get_by_client_id(db, current_user["id"])
+    intake = await intake_repository.get_by_client_id(db, current_user["id"])
     if not intake:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -152,10 +154,11 @@ def complete_intake_stage(
             detail=f"Stage {stage_data.stage} cannot be completed. Missing fields: {validation_result['missing_fields']}"
         )
     
-    updated_intake = crud_intake.intake.complete_stage(
+    updated_intake = await intake_repository.complete_stage(
         db, 
         current_user["id"], 
-        stage_data.stage
+        stage_data.stage,
+        db_obj=intake
     )
     
     return updated_intake
@@ -322,32 +325,26 @@ def delete_intake_document(
 @router.get("/admin/all", response_model=List[IntakeSummaryResponse])
 def get_all_intakes(
     *,
+    response: Response,
     db: Client = Depends(deps.get_db),
     current_user: dict = Depends(deps.get_current_admin_user),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header; empty for the first page"),
 ) -> Any:
     """
-    Get all intake summaries (admin only)
+    Get all intake summaries (admin only), newest first.
+    With a cursor, pages continue after the cursor and skip is ignored.
     """
-    intakes = crud_intake.intake.get_multi(db, skip=skip, limit=limit)
-    
-    summaries = []
-    for intake in intakes:
-        summary = {
-            "id": intake.id,
-            "client_id": intake.client_id,
-            "status": intake.status,
-            "current_stage": intake.current_stage,
-            "completed_stages": intake.completed_stages,
-            "completion_percentage": crud_intake.intake.get_completion_percentage(intake),
-            "created_at": intake.created_at,
-            "updated_at": intake.updated_at,
-            "completed_at": intake.completed_at
-        }
-        summaries.append(summary)
+    try:
+        intakes = crud_intake.intake.get_multi(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_page = next_cursor(intakes, limit) if cursor is not None else None
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
     
-    return summaries
+    return [crud_intake.intake.build_summary(intake) for intake in intakes]
 
 @router.get("/admin/{client_id}", response_model=IntakeResponse)
 def get_client_intake(
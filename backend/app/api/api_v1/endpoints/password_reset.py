@@ -45,7 +45,7 @@ def request_password_reset(
 @router.post("/update-password")
 def update_password(
     new_password: str = Form(...),
-    db: Client = Depends(deps.get_db)
+    db: Client = Depends(deps.get_auth_db)
 ):
     """
     Update user password (called from authenticated frontend after reset)
@@ -48,20 +48,20 @@ def create_session_note(
     db: Client = Depends(deps.get_db),
     booking_id: int,
     note_in: SessionNoteCreate,
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Create a new session note for a booking.
     Only RCIC consultants can create notes.
     """
     print(f"DEBUG: Creating session note for booking {booking_id}")
-    print(f"DEBUG: User role: {current_user.get('role')}")
+    print(f"DEBUG: User role: {principal.role}")
     print(f"DEBUG: Note data: {note_in}")
     print(f"DEBUG: Note data dict: {note_in.dict()}")
     
     # Verify user is RCIC
-    if current_user["role"] != "rcic":
-        print(f"DEBUG: Permission denied - user role is {current_user['role']}, expected 'rcic'")
+    if principal.role != "rcic":
+        print(f"DEBUG: Permission denied - user role is {principal.role}, expected 'rcic'")
         raise HTTPException(status_code=403, detail="Only RCIC consultants can create session notes")
     
     # Get booking and verify it exists and belongs to this consultant
@@ -69,15 +69,11 @@ def create_session_note(
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
-    # Get consultant profile
-    consultant_response = db.table("consultants").select("id, name").eq("user_id", current_user["id"]).execute()
-    if not consultant_response.data:
+    if principal.consultant_id is None:
         raise HTTPException(status_code=404, detail="Consultant profile not found")
     
-    consultant = consultant_response.data[0]
-    
     # Verify this booking belongs to the consultant
-    if booking["consultant_id"] != consultant["id"]:
+    if not principal.owns_consultant(booking["consultant_id"]):
         raise HTTPException(status_code=403, detail="Not authorized to add notes to this booking")
     
     # Override booking_id from URL
@@ -91,7 +87,7 @@ def create_session_note(
         note = crud_session_note.create_session_note(
             db=db, 
             obj_in=note_in, 
-            consultant_id=consultant["id"], 
+            consultant_id=principal.consultant_id, 
             client_id=booking["client_id"]
         )
         print(f"DEBUG: Successfully created note: {note}")
@@ -101,7 +97,7 @@ def create_session_note(
         raise HTTPException(status_code=500, detail=f"Failed to create session note: {str(e)}")
     
     # Add consultant info and time_ago for response
-    note["consultant_name"] = consultant["name"]
+    note["consultant_name"] = principal.consultant_name
     note["time_ago"] = get_time_ago(note["created_at"])
     
     return note
@@ -112,7 +108,7 @@ def get_booking_session_notes(
     *,
     db: Client = Depends(deps.get_db),
     booking_id: int,
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Get all session notes for a booking.
@@ -124,15 +120,14 @@ def get_booking_session_notes(
         raise HTTPException(status_code=404, detail="Booking not found")
     
     # Check user permissions
-    if current_user["role"] == "client":
-        if booking["client_id"] != current_user["id"]:
+    if principal.role == "client":
+        if booking["client_id"] != principal.id:
             raise HTTPException(status_code=403, detail="Not enough permissions")
         # Client only sees shared notes
         include_private = False
-    elif current_user["role"] == "rcic":
+    elif principal.role == "rcic":
         # Verify RCIC owns this booking
-        consultant_response = db.table("consultants").select("id").eq("user_id", current_user["id"]).execute()
-        if not consultant_response.data or booking["consultant_id"] != consultant_response.data[0]["id"]:
+        if not principal.owns_consultant(booking["consultant_id"]):
             raise HTTPException(status_code=403, detail="Not enough permissions")
         # RCIC sees all notes
         include_private = True
@@ -160,7 +155,7 @@ def update_session_note(
     db: Client = Depends(deps.get_db),
     note_id: int,
     note_in: SessionNoteUpdate,
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Update a session note.
@@ -172,18 +167,17 @@ def update_session_note(
         raise HTTPException(status_code=404, detail="Session note not found")
     
     # Verify user is RCIC and owns this note
-    if current_user["role"] != "rcic":
+    if principal.role != "rcic":
         raise HTTPException(status_code=403, detail="Only RCIC consultants can update session notes")
     
-    consultant_response = db.table("consultants").select("id, name").eq("user_id", current_user["id"]).execute()
-    if not consultant_response.data or note["consultant_id"] != consultant_response.data[0]["id"]:
+    if not principal.owns_consultant(note["consultant_id"]):
         raise HTTPException(status_code=403, detail="Not authorized to update this note")
     
     # Update the note
     updated_note = crud_session_note.update_session_note(db=db, note_id=note_id, obj_in=note_in)
     
     # Add consultant info and time_ago for response
-    updated_note["consultant_name"] = consultant_response.data[0]["name"]
+    updated_note["consultant_name"] = principal.consultant_name
     updated_note["time_ago"] = get_time_ago(updated_note["created_at"])
     
     return updated_note
@@ -194,7 +188,7 @@ def delete_session_note(
     *,
     db: Client = Depends(deps.get_db),
     note_id: int,
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Delete a session note.
@@ -206,11 +200,10 @@ def delete_session_note(
         raise HTTPException(status_code=404, detail="Session note not found")
     
     # Verify user is RCIC and owns this note
-    if current_user["role"] != "rcic":
+    if principal.role != "rcic":
         raise HTTPException(status_code=403, detail="Only RCIC consultants can delete session notes")
     
-    consultant_response = db.table("consultants").select("id").eq("user_id", current_user["id"]).execute()
-    if not consultant_response.data or note["consultant_id"] != consultant_response.data[0]["id"]:
+    if not principal.owns_consultant(note["consultant_id"]):
         raise HTTPException(status_code=403, detail="Not authorized to delete this note")
     
     # Delete the note
@@ -228,14 +221,14 @@ def share_session_notes(
     admin_db: Client = Depends(deps.get_admin_db),
     booking_id: int,
     share_request: ShareNoteRequest,
-    current_user: dict = Depends(deps.get_current_active_user),
+    principal: deps.Principal = Depends(deps.get_current_principal),
 ) -> Any:
     """
     Share session notes with the client.
     Optionally send email notification.
     """
     # Verify user is RCIC
-    if current_user["role"] != "rcic":
+    if principal.role != "rcic":
         raise HTTPException(status_code=403, detail="Only RCIC consultants can share session notes")
     
     # Get booking and verify it exists and belongs to this consultant
@@ -243,12 +236,9 @@ def share_session_notes(
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
-    consultant_response = db.table("consultants").select("id, name").eq("user_id", current_user["id"]).execute()
-    if not consultant_response.data or booking["consultant_id"] != consultant_response.data[0]["id"]:
+    if not principal.owns_consultant(booking["consultant_id"]):
         raise HTTPException(status_code=403, detail="Not authorized to share notes for this booking")
     
-    consultant = consultant_response.data[0]
-    
     # Verify all notes belong to this booking and consultant
     for note_id in share_request.note_ids:
         note = crud_session_note.get_session_note(db=db, note_id=note_id)
@@ -256,7 +246,7 @@ def share_session_notes(
             raise HTTPException(status_code=404, detail=f"Session note {note_id} not found")
         if note["booking_id"] != booking_id:
             raise HTTPException(status_code=400, detail=f"Note {note_id} does not belong to this booking")
-        if note["consultant_id"] != consultant["id"]:
+        if note["consultant_id"] != principal.consultant_id:
             raise HTTPException(status_code=403, detail=f"Not authorized to share note {note_id}")
     
     # Share the notes
@@ -284,7 +274,7 @@ def share_session_notes(
                         })
                 
                 # Compose email
-                subject = share_request.email_subject or f"New Session Notes from {consultant['name']}"
+                subject = share_request.email_subject or f"New Session Notes from {principal.consultant_name}"
                 
                 notes_html = ""
                 for note in notes_content:
@@ -299,7 +289,7 @@ def share_session_notes(
                 
                 body = f"""
                     <p>Hello,</p>
-                    <p>Your RCIC <strong>{consultant['name']}</strong> has shared notes from your recent session:</p>
+                    <p>Your RCIC <strong>{principal.consultant_name}</strong> has shared notes from your recent session:</p>
                     {notes_html}
                     <p style="margin-top:24px;">You can view all your session notes by logging into your account and visiting your bookings.</p>
                     <p>You can reply to this email if you have any questions.</p>
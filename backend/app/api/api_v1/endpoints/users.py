@@ -1,26 +1,41 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from supabase import Client
 
 from app.api import deps
+from app.crud import crud_user
+from app.crud.base import NEXT_CURSOR_HEADER, next_cursor
 from app.schemas.user import UserInDB, UserUpdate
 
 router = APIRouter()
 
 @router.get("/", response_model=List[UserInDB])
 def read_users(
+    response: Response,
     db: Client = Depends(deps.get_db),
     current_user: dict = Depends(deps.get_current_active_user),
     skip: int = 0,
     limit: int = Query(default=100, le=100),
     role: str = Query(None),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header; empty for the first page"),
 ) -> Any:
     """
     Retrieve users. Only accessible by admin users.
+    With a cursor, pages are newest first and continue after the cursor; skip is ignored.
     """
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
+    if cursor is not None:
+        try:
+            users = crud_user.list_users_page(db, limit=limit, cursor=cursor, role=role)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        next_page = next_cursor(users, limit)
+        if next_page:
+            response.headers[NEXT_CURSOR_HEADER] = next_page
+        return users
+    
     try:
         # Get users from Supabase Auth
         users_response = db.auth.admin.list_users()
@@ -1,10 +1,17 @@
-from typing import Generator
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.concurrency import run_in_threadpool
 from jose import jwt, JWTError
 from pydantic import ValidationError
 from app.core.config import settings
-from app.db.supabase import get_supabase, get_supabase_admin, SessionLocal
+from app.core.security import decode_supabase_token
+from app.crud.async_repository import consultant_repository
+from app.db.supabase import get_supabase, get_supabase_admin, get_async_postgrest, create_session_client, SessionLocal
+from postgrest import AsyncPostgrestClient
 from supabase import Client
 from sqlalchemy.orm import Session
 import requests
@@ -18,6 +25,10 @@ def get_db() -> Generator:
     finally:
         pass
 
+async def get_async_db() -> AsyncPostgrestClient:
+    """Get the shared async PostgREST client for async def endpoints"""
+    return get_async_postgrest()
+
 def get_admin_db() -> Generator:
     """Get admin database client that bypasses RLS for public/admin operations"""
     db = get_supabase_admin()
@@ -27,6 +38,18 @@ def get_admin_db() -> Generator:
     finally:
         pass
 
+def get_auth_db() -> Generator:
+    """
+    Get a dedicated Supabase client for auth flows (sign up/in/out, refresh).
+    These calls store a user session on the client, so they must not run on
+    the shared pooled client returned by get_db.
+    """
+    db = create_session_client()
+    try:
+        yield db
+    finally:
+        pass
+
 def get_sqlalchemy_db() -> Generator[Session, None, None]:
     """Get SQLAlchemy database session for direct database operations"""
     db = SessionLocal()
@@ -35,46 +58,160 @@ def get_sqlalchemy_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
-def get_current_user(
-    db: Client = Depends(get_db), 
+def _user_from_supabase(user) -> dict:
+    """Build the current-user dict from a Supabase Auth user object"""
+    return {
+        "id": user.id,
+        "email": user.email,
+        "full_name": user.user_metadata.get("full_name"),
+        "role": user.user_metadata.get("role", "client"),
+        "email_verified": user.email_confirmed_at is not None,
+        "is_active": True  # Supabase Auth users are active by default
+    }
+
+def _user_from_claims(claims: dict) -> dict:
+    """Build the current-user dict from verified Supabase JWT claims"""
+    user_metadata = claims.get("user_metadata") or {}
+    return {
+        "id": claims["sub"],
+        "email": claims.get("email"),
+        "full_name": user_metadata.get("full_name"),
+        "role": user_metadata.get("role", "client"),
+        "email_verified": bool(user_metadata.get("email_verified", claims.get("email_verified", False))),
+        "is_active": True
+    }
+
+# Local verification mode: when each session was last confirmed by Supabase Auth
+_session_checked_at: Dict[str, float] = {}
+_session_checked_lock = threading.Lock()
+_SESSION_CACHE_MAX_ENTRIES = 10000
+
+def _needs_revocation_check(session_key: str) -> bool:
+    """True if the session has not been confirmed remotely within the configured interval"""
+    checked_at = _session_checked_at.get(session_key)
+    return checked_at is None or time.monotonic() - checked_at >= settings.AUTH_REVOCATION_CHECK_SECONDS
+
+def _mark_session_checked(session_key: str) -> None:
+    now = time.monotonic()
+    with _session_checked_lock:
+        if len(_session_checked_at) >= _SESSION_CACHE_MAX_ENTRIES:
+            # Drop entries that are due for a re-check anyway
+            expired = [
+                key for key, checked_at in _session_checked_at.items()
+                if now - checked_at >= settings.AUTH_REVOCATION_CHECK_SECONDS
+            ]
+            for key in expired:
+                del _session_checked_at[key]
+            if len(_session_checked_at) >= _SESSION_CACHE_MAX_ENTRIES:
+                _session_checked_at.clear()
+        _session_checked_at[session_key] = now
+
+def _forget_session(session_key: str) -> None:
+    with _session_checked_lock:
+        _session_checked_at.pop(session_key, None)
+
+def resolve_user_from_token(token: str, get_client: Callable[[], Client]) -> dict:
+    """
+    Resolve the current user from a Supabase access token.
+
+    In "remote" mode every token is sent to Supabase Auth. In "local" mode the
+    JWT is verified in-process and Supabase Auth is only asked again once per
+    AUTH_REVOCATION_CHECK_SECONDS per session, to catch signed-out or deleted users.
+    `get_client` is only called when a remote check is needed.
+    Raises on any verification failure.
+    """
+    if settings.AUTH_VERIFICATION_MODE != "local":
+        user_response = get_client().auth.get_user(token)
+        if not user_response.user:
+            raise JWTError("Supabase Auth returned no user for token")
+        return _user_from_supabase(user_response.user)
+
+    claims = decode_supabase_token(token)
+    session_key = claims.get("session_id") or token
+    if _needs_revocation_check(session_key):
+        try:
+            user_response = get_client().auth.get_user(token)
+        except Exception:
+            _forget_session(session_key)
+            raise
+        if not user_response.user or user_response.user.id != claims["sub"]:
+            _forget_session(session_key)
+            raise JWTError("Session is no longer valid")
+        _mark_session_checked(session_key)
+    return _user_from_claims(claims)
+
+async def resolve_user_from_token_async(token: str) -> dict:
+    """
+    resolve_user_from_token for the event loop. Decoding may fetch the JWKS and
+    the Supabase Auth call may be needed, so both run in the threadpool.
+    """
+    if settings.AUTH_VERIFICATION_MODE == "local":
+        claims = await run_in_threadpool(decode_supabase_token, token)
+        if not _needs_revocation_check(claims.get("session_id") or token):
+            return _user_from_claims(claims)
+    return await run_in_threadpool(resolve_user_from_token, token, get_supabase)
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security_bearer)
 ) -> dict:
     """
     Get current user from Supabase Auth JWT token
     """
     try:
-        # Get user from Supabase Auth using the JWT token
-        user_response = db.auth.get_user(credentials.credentials)
-        
-        if not user_response.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-            )
-        
-        user = user_response.user
-        return {
-            "id": user.id,
-            "email": user.email,
-            "full_name": user.user_metadata.get("full_name"),
-            "role": user.user_metadata.get("role", "client"),
-            "email_verified": user.email_confirmed_at is not None,
-            "is_active": True  # Supabase Auth users are active by default
-        }
-        
+        return await resolve_user_from_token_async(credentials.credentials)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
 
-def get_current_active_user(
+async def get_current_active_user(
     current_user: dict = Depends(get_current_user),
 ) -> dict:
     if not current_user.get("is_active", True):
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated caller, resolved once per request.
+    For RCIC users the consultant profile is attached (None if it does not exist).
+    """
+    id: str
+    email: Optional[str]
+    full_name: Optional[str]
+    role: str
+    email_verified: bool
+    is_active: bool
+    consultant_id: Optional[int] = None
+    consultant_name: Optional[str] = None
+    consultant_timezone: Optional[str] = None
+
+    def owns_consultant(self, consultant_id: Optional[int]) -> bool:
+        """True if this caller is the RCIC behind the given consultant id"""
+        return self.consultant_id is not None and self.consultant_id == consultant_id
+
+async def get_current_principal(
+    db: AsyncPostgrestClient = Depends(get_async_db),
+    current_user: dict = Depends(get_current_active_user),
+) -> Principal:
+    """Get the current user as a Principal, with the RCIC's consultant profile resolved"""
+    consultant = None
+    if current_user.get("role") == "rcic":
+        consultant = await consultant_repository.get_identity_by_user_id(db, current_user["id"])
+    return Principal(
+        id=current_user["id"],
+        email=current_user.get("email"),
+        full_name=current_user.get("full_name"),
+        role=current_user.get("role", "client"),
+        email_verified=current_user.get("email_verified", False),
+        is_active=current_user.get("is_active", True),
+        consultant_id=consultant["id"] if consultant else None,
+        consultant_name=consultant.get("name") if consultant else None,
+        consultant_timezone=consultant.get("timezone") if consultant else None,
+    )
+
 def get_current_admin_user(
     current_user: dict = Depends(get_current_active_user),
 ) -> dict:
@@ -92,26 +229,7 @@ def verify_token(token: str) -> dict:
     Verify JWT token for real-time events (used with query parameters)
     """
     try:
-        # Get user from Supabase Auth using the JWT token
-        db = get_supabase()
-        user_response = db.auth.get_user(token)
-        
-        if not user_response.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-            )
-        
-        user = user_response.user
-        return {
-            "id": user.id,
-            "email": user.email,
-            "full_name": user.user_metadata.get("full_name"),
-            "role": user.user_metadata.get("role", "client"),
-            "email_verified": user.email_confirmed_at is not None,
-            "is_active": True
-        }
-        
+        return resolve_user_from_token(token, get_supabase)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -7,12 +7,43 @@ class Settings(BaseSettings):
     SUPABASE_ANON_KEY: str
     SUPABASE_SERVICE_ROLE_KEY: str
     DATABASE_URL: str
+
+    # Supabase HTTP connection pooling (per worker, shared by all requests)
+    SUPABASE_POOL_MAX_CONNECTIONS: int = 100
+    SUPABASE_POOL_MAX_KEEPALIVE: int = 20
+    SUPABASE_POOL_KEEPALIVE_EXPIRY: float = 30.0  # seconds an idle connection is kept open
+    SUPABASE_HTTP_TIMEOUT: float = 30.0  # seconds
     
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
-    
+
+    # Supabase Auth token verification
+    # "remote" asks Supabase Auth about every token, "local" checks the JWT signature in-process
+    AUTH_VERIFICATION_MODE: str = "remote"
+    SUPABASE_JWT_SECRET: Optional[str] = None  # Falls back to SECRET_KEY for HS256 tokens
+    SUPABASE_JWKS_URL: Optional[str] = None  # Defaults to {SUPABASE_URL}/auth/v1/.well-known/jwks.json
+    SUPABASE_JWT_AUDIENCE: str = "authenticated"
+    # In local mode, how often (seconds) a session is re-checked remotely to catch revocations
+    AUTH_REVOCATION_CHECK_SECONDS: int = 300
+    # Per-worker cache of the caller's consultant record (id, name, timezone)
+    IDENTITY_CACHE_TTL_SECONDS: int = 60
+    IDENTITY_CACHE_MAX_ENTRIES: int = 1024
+    # How often (seconds) a worker checks whether its consultant directory snapshot is stale
+    DIRECTORY_SNAPSHOT_CHECK_SECONDS: int = 30
+    # Consultant profile aggregates (consultant, services, reviews); in Redis when REDIS_URL is set
+    PROFILE_CACHE_TTL_SECONDS: int = 300
+    PROFILE_CACHE_MAX_ENTRIES: int = 2048
+    # Free slot starts per consultant, day and duration; in Redis when REDIS_URL is set
+    SLOT_CACHE_TTL_SECONDS: int = 120
+    SLOT_CACHE_MAX_ENTRIES: int = 8192
+    # Signed storage URLs are reused until this long before they expire; in Redis when REDIS_URL is set
+    SIGNED_URL_EXPIRY_MARGIN_SECONDS: int = 300
+    SIGNED_URL_CACHE_MAX_ENTRIES: int = 8192
+    # How long a slot stays held for a client while they pay
+    BOOKING_HOLD_MINUTES: int = 10
+
     # Application
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "ImmigWise API"
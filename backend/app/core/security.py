@@ -1,6 +1,9 @@
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Any, Union
-from jose import jwt
+from typing import Any, Dict, Optional, Union
+import httpx
+from jose import jwt, JWTError
 from passlib.context import CryptContext
 from app.core.config import settings
 
@@ -8,6 +11,20 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 ALGORITHM = "HS256"
 
+# Algorithms accepted for Supabase-issued access tokens
+SUPABASE_SYMMETRIC_ALGORITHMS = ["HS256"]
+SUPABASE_ASYMMETRIC_ALGORITHMS = ["RS256", "ES256"]
+
+# How long fetched signing keys are trusted before the JWKS document is fetched again
+JWKS_CACHE_SECONDS = 600
+
+# Tokens whose kid is not in the cached set may force a refetch, but only this often,
+# so a stream of tokens with made-up key ids cannot hammer Supabase Auth
+JWKS_MIN_REFRESH_SECONDS = 60
+
+_jwks_cache: Dict[str, Any] = {"keys": None, "fetched_at": 0.0, "attempted_at": None}
+_jwks_lock = threading.Lock()
+
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
 ) -> str:
@@ -26,3 +43,69 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+def _get_supabase_jwks(force_refresh: bool = False) -> Dict[str, Any]:
+    """
+    Fetch (and cache) the Supabase Auth JSON Web Key Set. Fetches, forced or
+    not, happen at most once per JWKS_MIN_REFRESH_SECONDS; concurrent callers
+    wait for the one in flight.
+    """
+    with _jwks_lock:
+        now = time.monotonic()
+        keys = _jwks_cache["keys"]
+        if keys is not None and now - _jwks_cache["fetched_at"] < (
+            JWKS_MIN_REFRESH_SECONDS if force_refresh else JWKS_CACHE_SECONDS
+        ):
+            return keys
+        attempted_at = _jwks_cache["attempted_at"]
+        if attempted_at is not None and now - attempted_at < JWKS_MIN_REFRESH_SECONDS:
+            # Fetched (or failed) too recently; keep what we have
+            if keys is None:
+                raise JWTError("Supabase signing keys are unavailable")
+            return keys
+
+        _jwks_cache["attempted_at"] = now
+        jwks_url = settings.SUPABASE_JWKS_URL or f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json"
+        response = httpx.get(jwks_url, timeout=10.0)
+        response.raise_for_status()
+        _jwks_cache["keys"] = response.json()
+        _jwks_cache["fetched_at"] = time.monotonic()
+        return _jwks_cache["keys"]
+
+def _find_signing_key(kid: Optional[str]) -> Dict[str, Any]:
+    """Find the JWK matching a token's key id, refreshing the JWKS on a miss (rate limited)"""
+    for force_refresh in (False, True):
+        for key in _get_supabase_jwks(force_refresh=force_refresh).get("keys", []):
+            if key.get("kid") == kid:
+                return key
+    raise JWTError(f"No signing key found for kid {kid}")
+
+def decode_supabase_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a Supabase-issued access token locally and return its claims.
+
+    HS256 tokens are checked against SUPABASE_JWT_SECRET (or SECRET_KEY),
+    asymmetric tokens against the project's JWKS. Raises JWTError when the
+    signature, expiry or audience is invalid.
+    """
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get("alg")
+
+    if algorithm in SUPABASE_SYMMETRIC_ALGORITHMS:
+        key: Any = settings.SUPABASE_JWT_SECRET or settings.SECRET_KEY
+        algorithms = SUPABASE_SYMMETRIC_ALGORITHMS
+    elif algorithm in SUPABASE_ASYMMETRIC_ALGORITHMS:
+        key = _find_signing_key(header.get("kid"))
+        algorithms = SUPABASE_ASYMMETRIC_ALGORITHMS
+    else:
+        raise JWTError(f"Unsupported token algorithm: {algorithm}")
+
+    claims = jwt.decode(
+        token,
+        key,
+        algorithms=algorithms,
+        audience=settings.SUPABASE_JWT_AUDIENCE,
+    )
+    if not claims.get("sub"):
+        raise JWTError("Token has no subject")
+    return claims
@@ -0,0 +1,184 @@
+"""
+Async data access for `async def` endpoints.
+
+Each repository mirrors the table and column selections of its sync
+counterpart in app/crud and reuses its row post-processing, but runs on the
+shared AsyncPostgrestClient (see app.db.supabase.get_async_postgrest), so a
+request waiting on PostgREST does not hold one of FastAPI's threadpool workers.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from postgrest import AsyncPostgrestClient
+
+from app.crud.base import apply_keyset, next_cursor
+from app.crud.crud_booking import (
+    BOOKING_EXPORT_COLUMNS, BOOKING_SELECT, apply_booking_filters, flatten_duration_option,
+)
+from app.crud.crud_consultant import _identity_cache
+from app.crud.crud_intake import intake as crud_intake
+from app.crud.profile_cache import profile_cache
+
+
+class AsyncBookingRepository:
+    async def get(self, db: AsyncPostgrestClient, booking_id: int) -> Optional[Dict]:
+        response = await db.table("bookings").select(BOOKING_SELECT).eq("id", booking_id).execute()
+        return flatten_duration_option(response.data[0]) if response.data else None
+
+    async def get_by_client(self, db: AsyncPostgrestClient, client_id: str) -> List[Dict]:
+        response = await db.table("bookings").select(BOOKING_SELECT).eq("client_id", client_id).execute()
+        return [flatten_duration_option(booking) for booking in response.data]
+
+    async def get_by_consultant(self, db: AsyncPostgrestClient, consultant_id: int) -> List[Dict]:
+        response = await db.table("bookings").select(BOOKING_SELECT).eq("consultant_id", consultant_id).execute()
+        return [flatten_duration_option(booking) for booking in response.data]
+
+    async def get_page(
+        self,
+        db: AsyncPostgrestClient,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        **filters
+    ) -> List[Dict]:
+        """
+        One page of bookings with documents (admin view), newest first, filtered
+        in the database (see apply_booking_filters). Pass a cursor (empty for the
+        first page) for keyset pagination.
+        """
+        query = apply_booking_filters(db.table("bookings").select("*, documents:booking_documents(*)"), **filters)
+        if cursor is not None:
+            query = apply_keyset(query, cursor, limit)
+        else:
+            query = query.order("created_at", desc=True).range(skip, skip + limit - 1)
+        response = await query.execute()
+        return response.data
+
+    async def stream(self, db: AsyncPostgrestClient, *, page_size: int = 1000, **filters) -> AsyncIterator[Dict]:
+        """
+        Every matching booking's export columns, newest first, read in keyset
+        pages so only one page is held in memory whatever the table size.
+        """
+        columns = ", ".join(BOOKING_EXPORT_COLUMNS)
+        cursor = ""
+        while cursor is not None:
+            query = apply_booking_filters(db.table("bookings").select(columns), **filters)
+            response = await apply_keyset(query, cursor, page_size).execute()
+            for booking in response.data:
+                yield booking
+            cursor = next_cursor(response.data, page_size)
+
+    async def get_price_and_duration_option(
+        self, db: AsyncPostgrestClient, *, consultant_service_id: int, duration_option_id: int
+    ) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """RCIC-set pricing and the duration option it applies to, fetched concurrently"""
+        pricing_response, option_response = await asyncio.gather(
+            db.table("consultant_service_pricing")
+            .select("*")
+            .eq("consultant_service_id", consultant_service_id)
+            .eq("duration_option_id", duration_option_id)
+            .eq("is_active", True)
+            .execute(),
+            db.table("service_duration_options").select("*").eq("id", duration_option_id).execute(),
+        )
+        pricing = pricing_response.data[0] if pricing_response.data else None
+        duration_option = option_response.data[0] if option_response.data else None
+        return pricing, duration_option
+
+
+class AsyncConsultantRepository:
+    async def get(self, db: AsyncPostgrestClient, consultant_id: int) -> Optional[Dict]:
+        consultant_response, services_response, reviews_response = await asyncio.gather(
+            db.table("consultants").select("*").eq("id", consultant_id).execute(),
+            db.table("consultant_services").select("*").eq("consultant_id", consultant_id).execute(),
+            db.table("consultant_reviews").select("*").eq("consultant_id", consultant_id).execute(),
+        )
+        if not consultant_response.data:
+            return None
+
+        consultant = consultant_response.data[0]
+        consultant["services"] = services_response.data or []
+        consultant["reviews"] = reviews_response.data or []
+        consultant["review_count"] = consultant.get("review_count") or 0
+        return consultant
+
+    async def get_profile(self, db: AsyncPostgrestClient, consultant_id: int) -> Optional[Dict]:
+        """
+        get() through the profile cache (see app/crud/profile_cache.py). The result
+        may be shared with other requests, so treat it as read-only.
+        """
+        profile = await profile_cache.aget(consultant_id)
+        if profile is None:
+            profile = await self.get(db, consultant_id)
+            if profile is not None:
+                await profile_cache.aset(consultant_id, profile)
+        return profile
+
+    async def get_services(
+        self, db: AsyncPostgrestClient, consultant_id: int, active_only: bool = False
+    ) -> List[Dict]:
+        query = db.table("consultant_services").select("*").eq("consultant_id", consultant_id)
+        if active_only:
+            query = query.eq("is_active", True)
+        response = await query.execute()
+        return response.data or []
+
+    async def get_identity_by_user_id(self, db: AsyncPostgrestClient, user_id: str) -> Optional[Dict[str, Any]]:
+        """Same as CRUDConsultant.get_identity_by_user_id, sharing its cache"""
+        identity = _identity_cache.get(user_id)
+        if identity is not None:
+            return identity
+        response = await db.table("consultants").select("id, name, timezone").eq("user_id", user_id).execute()
+        if not response.data:
+            return None
+        identity = response.data[0]
+        _identity_cache.set(user_id, identity)
+        return identity
+
+
+class AsyncIntakeRepository:
+    async def get_by_client_id(self, db: AsyncPostgrestClient, client_id: str) -> Optional[Dict[str, Any]]:
+        response = await db.table("client_intakes").select("*").eq("client_id", client_id).execute()
+        return response.data[0] if response.data else None
+
+    async def create_for_user(
+        self,
+        db: AsyncPostgrestClient,
+        client_id: str,
+        full_name: Optional[str] = None,
+        email: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        existing = await self.get_by_client_id(db, client_id)
+        if existing:
+            return existing
+        intake_data = crud_intake.build_initial(client_id, full_name, email)
+        response = await db.table("client_intakes").insert(intake_data).execute()
+        return response.data[0] if response.data else None
+
+    async def update_stage_data(
+        self, db: AsyncPostgrestClient, client_id: str, stage: int, data: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        db_obj = await self.get_by_client_id(db, client_id)
+        if not db_obj:
+            return None
+        update_data = crud_intake.build_stage_update(db_obj, stage, data)
+        response = await db.table("client_intakes").update(update_data).eq("client_id", client_id).execute()
+        return response.data[0] if response.data else None
+
+    async def complete_stage(
+        self, db: AsyncPostgrestClient, client_id: str, stage: int, db_obj: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Mark a stage as completed; pass the already-loaded intake as db_obj to skip re-reading it"""
+        if db_obj is None:
+            db_obj = await self.get_by_client_id(db, client_id)
+        if not db_obj:
+            return None
+        update_data = crud_intake.build_stage_completion(db_obj, stage)
+        response = await db.table("client_intakes").update(update_data).eq("client_id", client_id).execute()
+        return response.data[0] if response.data else None
+
+
+booking_repository = AsyncBookingRepository()
+consultant_repository = AsyncConsultantRepository()
+intake_repository = AsyncIntakeRepository()
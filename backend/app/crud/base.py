@@ -1,3 +1,6 @@
+import base64
+import binascii
+import json
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
@@ -10,6 +13,54 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Response header carrying the cursor of the next page in cursor pagination mode
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque cursor for the sort key of the last row on a page"""
+    payload = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or not values:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def apply_keyset(query, cursor: Optional[str], limit: int, *, column: str = "created_at", desc: bool = True):
+    """
+    Keyset pagination for a PostgREST query, newest first by default: order by
+    (column, id) and, after the first page (empty cursor), keep only rows past the
+    cursor. Every page is an index range scan on (column, id), whatever its depth.
+    """
+    # A single order parameter: PostgREST does not combine repeated ones
+    query = query.order(f"{column}{'.desc' if desc else ''},id", desc=desc)
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != 2 or not isinstance(values[0], str) or '"' in values[0] or not isinstance(values[1], int):
+            raise ValueError("Invalid cursor")
+        after, after_id = values
+        past, past_or_equal = ("lt", "lte") if desc else ("gt", "gte")
+        # (column, id) past the cursor; the plain bound lets Postgres use the index range
+        query = query.filter(column, past_or_equal, after).or_(
+            f'{column}.{past}."{after}",id.{past}.{after_id}'
+        )
+    return query.limit(limit)
+
+
+def next_cursor(rows: List[Dict[str, Any]], limit: int, *, column: str = "created_at") -> Optional[str]:
+    """Cursor for the page after `rows`, or None when this was the last page"""
+    if len(rows) < limit:
+        return None
+    return encode_cursor(rows[-1][column], rows[-1]["id"])
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
@@ -0,0 +1,257 @@
+"""
+Per-worker, in-memory snapshot of the public consultant directory.
+
+The directory is read far more often than it changes, so GET /consultants is
+served from a columnar snapshot of every consultant instead of a query per
+request. Language and specialty filters are bitsets over snapshot positions
+(bit i set = consultant i matches), so combining filters is a few big-int ANDs;
+province and search are substring scans over one joined string per column.
+
+The snapshot is rebuilt when this worker writes a consultant or a review
+(ConsultantDirectory.invalidate) and, for writes made by other workers or
+directly in the database, when the `consultants` row in cache_versions moves
+(bumped by a statement trigger, see migration 20261017_110000).
+"""
+import asyncio
+import time
+from array import array
+from bisect import bisect_right
+from heapq import nsmallest
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
+
+from postgrest import AsyncPostgrestClient
+
+from app.core.config import settings
+from app.core.logging_config import api_logger
+
+LOAD_BATCH_SIZE = 1000  # PostgREST caps responses at max-rows (1000 by default)
+SORTS = ("rating", "name", "reviews")
+
+
+def as_directory_entry(consultant: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shape a consultants row for listings. rating and review_count are the stored
+    aggregates kept current by create_consultant_review, so no reviews are read.
+    """
+    # Services are loaded separately by DurationBasedServiceSelection when needed
+    consultant["services"] = []
+    consultant["reviews"] = []
+    consultant["review_count"] = consultant.get("review_count") or 0
+    return consultant
+
+
+def _bitset(positions: Iterable[int], size: int) -> int:
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _set_bits(bits: int) -> List[int]:
+    """Positions of the set bits, ascending"""
+    flags = bin(bits)[:1:-1]
+    positions, position = [], flags.find("1")
+    while position != -1:
+        positions.append(position)
+        position = flags.find("1", position + 1)
+    return positions
+
+
+class _SubstringColumn:
+    """A text column joined into one string, so a substring filter is a str.find loop"""
+
+    def __init__(self, values: List[str]):
+        self.starts = array("q")
+        offset = 0
+        for value in values:
+            self.starts.append(offset)
+            offset += len(value) + 1
+        self.blob = "\n".join(values)
+        self.size = len(values)
+
+    def matches(self, term: str) -> int:
+        if "\n" in term:
+            return 0
+        positions = []
+        found = self.blob.find(term)
+        while found != -1:
+            position = bisect_right(self.starts, found) - 1
+            positions.append(position)
+            if position + 1 >= self.size:
+                break
+            found = self.blob.find(term, self.starts[position + 1])
+        return _bitset(positions, self.size)
+
+
+class DirectorySnapshot:
+    """Immutable columnar view of the consultants table at one cache version"""
+
+    def __init__(self, rows: List[Dict[str, Any]], version: Optional[int] = None):
+        self.version = version
+        self.rows = sorted((as_directory_entry(row) for row in rows), key=lambda row: row["id"])
+        size = len(self.rows)
+        self.size = size
+        self.ids = array("q", (row["id"] for row in self.rows))
+        self.names = [row.get("name") or "" for row in self.rows]
+        self.ratings = array("d", (row["rating"] if row.get("rating") is not None else -1.0 for row in self.rows))
+        self.review_counts = array("q", (row["review_count"] for row in self.rows))
+
+        self.all = (1 << size) - 1
+        self.languages = self._postings(row.get("languages") for row in self.rows)
+        self.specialties = self._postings(row.get("specialties") for row in self.rows)
+        self.locations = _SubstringColumn([row.get("location") or "" for row in self.rows])
+        self.search_texts = _SubstringColumn([self._search_text(row).lower() for row in self.rows])
+
+        # Snapshot positions in each sort order (None = by id), and each position's rank in it
+        self.sort_keys = {
+            None: lambda i: (self.ids[i],),
+            "rating": lambda i: (-self.ratings[i], -self.review_counts[i], self.ids[i]),
+            "name": lambda i: (self.names[i].casefold(), self.ids[i]),
+            "reviews": lambda i: (-self.review_counts[i], -self.ratings[i], self.ids[i]),
+        }
+        self.orders = {None: range(size)}
+        self.ranks = {}
+        for sort in SORTS:
+            order = sorted(range(size), key=self.sort_keys[sort])
+            self.orders[sort] = order
+            rank = array("q", bytes(8 * size))
+            for position, index in enumerate(order):
+                rank[index] = position
+            self.ranks[sort] = rank
+
+    def _postings(self, values_per_row: Iterable[Optional[List[str]]]) -> Dict[str, int]:
+        positions: Dict[str, List[int]] = {}
+        for index, values in enumerate(values_per_row):
+            for value in values or []:
+                positions.setdefault(value, []).append(index)
+        return {value: _bitset(indices, self.size) for value, indices in positions.items()}
+
+    @staticmethod
+    def _search_text(row: Dict[str, Any]) -> str:
+        # Rows carry the consultants.search_text generated column; rebuild it if absent
+        if row.get("search_text") is not None:
+            return row["search_text"]
+        return " ".join([
+            row.get("name") or "",
+            row.get("bio") or "",
+            " ".join(row.get("specialties") or []),
+            " ".join(row.get("languages") or []),
+        ])
+
+    def match(
+        self,
+        *,
+        language: Optional[str] = None,
+        province: Optional[str] = None,
+        specialty: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> int:
+        """Bitset of the snapshot positions matching every given filter"""
+        bits = self.all
+        if language:
+            bits &= self.languages.get(language, 0)
+        if specialty:
+            bits &= self.specialties.get(specialty, 0)
+        if province and bits:
+            bits &= self.locations.matches(province)
+        if search and bits:
+            bits &= self.search_texts.matches(search.lower())
+        return bits
+
+    def query(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        sort: Optional[str] = None,
+        after: Optional[List[Any]] = None,
+        **filters,
+    ) -> List[Dict[str, Any]]:
+        """
+        One directory page of the consultants matching every filter, by id or
+        sorted by rating, name or review count.
+        `after` is the sort_key() of the previous page's last row (keyset pagination).
+        """
+        if sort is not None and sort not in SORTS:
+            raise ValueError(f"Unknown sort '{sort}', expected one of {', '.join(SORTS)}")
+        bits = self.match(**filters)
+        order = self.orders[sort]
+        start = 0 if after is None else bisect_right(order, tuple(after), key=self.sort_keys[sort])
+        if bits == self.all:
+            page = order[start + skip:start + skip + limit]
+        elif sort is None:
+            page = [start + i for i in _set_bits(bits >> start)[skip:skip + limit]]
+        elif bits.bit_count() * 8 < self.size:
+            rank = self.ranks[sort]
+            matches = [i for i in _set_bits(bits) if rank[i] >= start]
+            page = nsmallest(skip + limit, matches, key=rank.__getitem__)[skip:]
+        else:
+            flags = bin(bits)[:1:-1]
+            candidates = (i for i in islice(order, start, None) if i < len(flags) and flags[i] == "1")
+            page = list(islice(candidates, skip, skip + limit))
+        return [dict(self.rows[i]) for i in page]
+
+    def sort_key(self, consultant_id: int, sort: Optional[str] = None) -> List[Any]:
+        """Keyset position of a consultant in a sort order, for query(after=...)"""
+        return list(self.sort_keys[sort](bisect_right(self.ids, consultant_id) - 1))
+
+
+class ConsultantDirectory:
+    """Holds this worker's DirectorySnapshot and decides when to rebuild it"""
+
+    def __init__(self, check_seconds: float):
+        self.check_seconds = check_seconds
+        self._snapshot: Optional[DirectorySnapshot] = None
+        self._stale = True
+        self._checked_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def invalidate(self) -> None:
+        """Rebuild on the next read; called after this worker writes consultants or reviews"""
+        self._stale = True
+
+    async def get_snapshot(self, db: AsyncPostgrestClient) -> DirectorySnapshot:
+        if self._is_current():
+            return self._snapshot
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._is_current():
+                return self._snapshot
+            version = await self._fetch_version(db)
+            if self._stale or self._snapshot is None or version != self._snapshot.version:
+                # Clear the flag first so an invalidation during the load triggers another rebuild
+                self._stale = False
+                rows = await self._fetch_rows(db)
+                self._snapshot = DirectorySnapshot(rows, version)
+                api_logger.debug(f"Consultant directory snapshot rebuilt: {len(rows)} consultants (version {version})")
+            self._checked_at = time.monotonic()
+        return self._snapshot
+
+    def _is_current(self) -> bool:
+        return (
+            self._snapshot is not None
+            and not self._stale
+            and time.monotonic() - self._checked_at < self.check_seconds
+        )
+
+    async def _fetch_version(self, db: AsyncPostgrestClient) -> Optional[int]:
+        response = await db.table("cache_versions").select("version").eq("name", "consultants").execute()
+        return response.data[0]["version"] if response.data else None
+
+    async def _fetch_rows(self, db: AsyncPostgrestClient) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        while True:
+            response = await (
+                db.table("consultants")
+                .select("*")
+                .order("id")
+                .range(len(rows), len(rows) + LOAD_BATCH_SIZE - 1)
+                .execute()
+            )
+            rows.extend(response.data or [])
+            if len(response.data or []) < LOAD_BATCH_SIZE:
+                return rows
+
+
+consultant_directory = ConsultantDirectory(check_seconds=settings.DIRECTORY_SNAPSHOT_CHECK_SECONDS)
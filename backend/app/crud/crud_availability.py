@@ -1,7 +1,9 @@
+from sqlalchemy import case, delete, insert, update
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import time, datetime, date
 from app.models.availability import ConsultantAvailability, ConsultantBlockedTime, DayOfWeek
+from app.crud.slot_cache import invalidate_slots
 from app.schemas.availability import (
     AvailabilitySlotCreate,
     AvailabilitySlotUpdate,
@@ -11,7 +13,13 @@ from app.schemas.availability import (
 
 
 class CRUDAvailability:
-    """CRUD operations for consultant availability"""
+    """
+    CRUD operations for consultant availability.
+    Every write invalidates the consultant's cached slots (see app.crud.slot_cache).
+    """
+    
+    # Availability window columns a schedule replace can change
+    WINDOW_FIELDS = ("end_time", "timezone", "slot_interval_minutes", "is_active")
     
     # ============================================================
     # Availability Slots
@@ -36,6 +44,7 @@ class CRUDAvailability:
         db.add(db_slot)
         db.commit()
         db.refresh(db_slot)
+        invalidate_slots(consultant_id)
         return db_slot
     
     def get_availability_slot(self, db: Session, slot_id: int) -> Optional[ConsultantAvailability]:
@@ -67,6 +76,25 @@ class CRUDAvailability:
             ConsultantAvailability.start_time
         ).all()
     
+    def get_availability_for_consultants(
+        self,
+        db: Session,
+        consultant_ids: List[int],
+        is_active: Optional[bool] = True
+    ) -> List[ConsultantAvailability]:
+        """Get availability slots for many consultants in one query"""
+        query = db.query(ConsultantAvailability).filter(
+            ConsultantAvailability.consultant_id.in_(consultant_ids)
+        )
+        
+        if is_active is not None:
+            query = query.filter(ConsultantAvailability.is_active == is_active)
+        
+        return query.order_by(
+            ConsultantAvailability.consultant_id,
+            ConsultantAvailability.start_time
+        ).all()
+    
     def update_availability_slot(
         self, 
         db: Session, 
@@ -84,6 +112,7 @@ class CRUDAvailability:
         
         db.commit()
         db.refresh(db_slot)
+        invalidate_slots(db_slot.consultant_id)
         return db_slot
     
     def delete_availability_slot(self, db: Session, slot_id: int) -> bool:
@@ -94,6 +123,7 @@ class CRUDAvailability:
         
         db.delete(db_slot)
         db.commit()
+        invalidate_slots(db_slot.consultant_id)
         return True
     
     def delete_consultant_availability(self, db: Session, consultant_id: int) -> int:
@@ -102,6 +132,7 @@ class CRUDAvailability:
             ConsultantAvailability.consultant_id == consultant_id
         ).delete()
         db.commit()
+        invalidate_slots(consultant_id)
         return count
     
     def bulk_create_availability(
@@ -126,6 +157,7 @@ class CRUDAvailability:
         
         db.add_all(db_slots)
         db.commit()
+        invalidate_slots(consultant_id)
         
         for slot in db_slots:
             db.refresh(slot)
@@ -138,12 +170,74 @@ class CRUDAvailability:
         consultant_id: int, 
         slots: List[AvailabilitySlotCreate]
     ) -> List[ConsultantAvailability]:
-        """Replace entire weekly schedule (delete old, create new)"""
-        # Delete existing slots
-        self.delete_consultant_availability(db, consultant_id)
+        """
+        Replace entire weekly schedule with the given windows (returned in order).
+        
+        Windows are matched to the current schedule by (day_of_week, start_time),
+        the schedule's unique key: new ones are inserted, changed ones updated and
+        missing ones deleted, one bulk statement each in a single transaction.
+        Unchanged rows keep their ids and timestamps.
         
-        # Create new slots
-        return self.bulk_create_availability(db, consultant_id, slots)
+        Raises:
+            ValueError: If two windows share a day and start time
+        """
+        desired = {}
+        for slot in slots:
+            key = (slot.day_of_week, slot.start_time)
+            if key in desired:
+                raise ValueError(f"Duplicate availability window: {slot.day_of_week.value} at {slot.start_time}")
+            desired[key] = slot
+        
+        current = {
+            (row.day_of_week, row.start_time): row
+            for row in self.get_consultant_availability(db, consultant_id)
+        }
+        
+        removed_ids = [row.id for key, row in current.items() if key not in desired]
+        changed = {}
+        new_rows = []
+        for key, slot in desired.items():
+            row = current.get(key)
+            values = {field: getattr(slot, field) for field in self.WINDOW_FIELDS}
+            if row is None:
+                new_rows.append({"consultant_id": consultant_id, "day_of_week": slot.day_of_week,
+                                 "start_time": slot.start_time, **values})
+            elif any(getattr(row, field) != value for field, value in values.items()):
+                changed[row.id] = values
+        
+        if removed_ids:
+            db.execute(delete(ConsultantAvailability).where(ConsultantAvailability.id.in_(removed_ids)))
+        
+        if changed:
+            # One UPDATE for every changed row: SET field = CASE id WHEN ... END
+            db.scalars(
+                update(ConsultantAvailability)
+                .where(ConsultantAvailability.id.in_(list(changed)))
+                .values({
+                    field: case(
+                        {row_id: values[field] for row_id, values in changed.items()},
+                        value=ConsultantAvailability.id
+                    )
+                    for field in self.WINDOW_FIELDS
+                })
+                .returning(ConsultantAvailability),
+                execution_options={"populate_existing": True}
+            ).all()
+        
+        inserted = {}
+        if new_rows:
+            for row in db.scalars(insert(ConsultantAvailability).returning(ConsultantAvailability), new_rows):
+                inserted[(row.day_of_week, row.start_time)] = row
+        
+        result = [current.get(key) or inserted[key] for key in desired]
+        for row in result:
+            # Detach before commit so the returned rows aren't expired and re-read one by one
+            db.expunge(row)
+        db.commit()
+        
+        if removed_ids or changed or new_rows:
+            invalidate_slots(consultant_id)
+        return result
     
     # ============================================================
     # Blocked Time
@@ -165,6 +259,7 @@ class CRUDAvailability:
         db.add(db_blocked)
         db.commit()
         db.refresh(db_blocked)
+        invalidate_slots(consultant_id)
         return db_blocked
     
     def get_blocked_time(self, db: Session, blocked_id: int) -> Optional[ConsultantBlockedTime]:
@@ -193,6 +288,20 @@ class CRUDAvailability:
         
         return query.order_by(ConsultantBlockedTime.start_datetime).all()
     
+    def get_blocked_times_for_consultants(
+        self,
+        db: Session,
+        consultant_ids: List[int],
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[ConsultantBlockedTime]:
+        """Get blocked times overlapping a date range for many consultants in one query"""
+        return db.query(ConsultantBlockedTime).filter(
+            ConsultantBlockedTime.consultant_id.in_(consultant_ids),
+            ConsultantBlockedTime.end_datetime >= start_date,
+            ConsultantBlockedTime.start_datetime <= end_date
+        ).order_by(ConsultantBlockedTime.start_datetime).all()
+    
     def update_blocked_time(
         self, 
         db: Session, 
@@ -210,6 +319,7 @@ class CRUDAvailability:
         
         db.commit()
         db.refresh(db_blocked)
+        invalidate_slots(db_blocked.consultant_id)
         return db_blocked
     
     def delete_blocked_time(self, db: Session, blocked_id: int) -> bool:
@@ -220,6 +330,7 @@ class CRUDAvailability:
         
         db.delete(db_blocked)
         db.commit()
+        invalidate_slots(db_blocked.consultant_id)
         return True
 
 
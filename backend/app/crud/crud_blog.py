@@ -1,5 +1,6 @@
 from typing import List, Optional, Dict, Any
 from supabase import Client
+from app.crud.base import apply_keyset
 from app.schemas.blog import BlogPostCreate, BlogPostUpdate, BlogCommentCreate, BlogLikeCreate
 from slugify import slugify
 
@@ -7,12 +8,18 @@ def get_blog_post(db: Client, post_id: int) -> Optional[Dict]:
     response = db.table("blog_posts").select("*, comments:blog_comments(*)").eq("id", post_id).eq("is_published", True).execute()
     return response.data[0] if response.data else None
 
-def get_blog_posts(db: Client, skip: int = 0, limit: int = 10, category: str = None) -> List[Dict]:
+def get_blog_posts(
+    db: Client, skip: int = 0, limit: int = 10, category: str = None, cursor: Optional[str] = None
+) -> List[Dict]:
+    """Published posts, newest first; a cursor (empty for the first page) switches to keyset pagination"""
     query = db.table("blog_posts").select("*, comments:blog_comments(*)").eq("is_published", True)
     
     if category:
         query = query.eq("category", category)
     
+    if cursor is not None:
+        response = apply_keyset(query, cursor, limit).execute()
+        return response.data
     response = query.range(skip, skip + limit - 1).order("created_at", desc=True).execute()
     return response.data
 
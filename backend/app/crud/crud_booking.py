@@ -1,51 +1,86 @@
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 from supabase import Client
+from app.models.booking import BookingStatus, PaymentStatus
 from app.schemas.booking import BookingCreate, BookingUpdate, BookingDocumentCreate
+from app.core.config import settings
+from app.crud.slot_cache import invalidate_slots
+
+# Booking columns plus documents and the chosen duration option
+BOOKING_SELECT = (
+    "id, client_id, consultant_id, service_id, booking_date, timezone, status, intake_form_data, "
+    "total_amount, payment_status, payment_intent_id, meeting_url, meeting_notes, created_at, updated_at, "
+    "duration_option_id, documents:booking_documents(*), "
+    "duration_option:service_duration_options(duration_minutes, duration_label)"
+)
+
+# Columns of the admin export, in CSV column order
+BOOKING_EXPORT_COLUMNS = (
+    "id", "client_id", "consultant_id", "service_id", "duration_option_id", "booking_date", "timezone",
+    "status", "payment_status", "total_amount", "payment_intent_id", "meeting_url", "created_at", "updated_at",
+)
+
+def apply_booking_filters(
+    query,
+    *,
+    status: Optional[BookingStatus] = None,
+    payment_status: Optional[PaymentStatus] = None,
+    consultant_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """
+    Push the admin booking filters into a bookings query so they run before the
+    page is cut. date_from/date_to bound booking_date as [date_from, date_to).
+    """
+    if status:
+        query = query.eq("status", status.value)
+    if payment_status:
+        query = query.eq("payment_status", payment_status.value)
+    if consultant_id is not None:
+        query = query.eq("consultant_id", consultant_id)
+    if date_from:
+        query = query.gte("booking_date", date_from.isoformat())
+    if date_to:
+        query = query.lt("booking_date", date_to.isoformat())
+    return query
+
+def flatten_duration_option(booking: Dict) -> Dict:
+    """Copy duration_option fields onto the booking for easier access"""
+    if booking.get('duration_option'):
+        booking['duration_minutes'] = booking['duration_option'].get('duration_minutes')
+        booking['duration_label'] = booking['duration_option'].get('duration_label')
+    return booking
 
 def get_booking(db: Client, booking_id: int) -> Optional[Dict]:
     # Join with service_duration_options to get duration_minutes
-    response = db.table("bookings").select(
-        "id, client_id, consultant_id, service_id, booking_date, timezone, status, intake_form_data, total_amount, payment_status, payment_intent_id, meeting_url, meeting_notes, created_at, updated_at, duration_option_id, documents:booking_documents(*), duration_option:service_duration_options(duration_minutes, duration_label)"
-    ).eq("id", booking_id).execute()
+    response = db.table("bookings").select(BOOKING_SELECT).eq("id", booking_id).execute()
     
     if response.data:
-        booking = response.data[0]
         # Flatten duration_option into booking object for easier access
-        if booking.get('duration_option'):
-            booking['duration_minutes'] = booking['duration_option'].get('duration_minutes')
-            booking['duration_label'] = booking['duration_option'].get('duration_label')
-        return booking
+        return flatten_duration_option(response.data[0])
     return None
 
 def get_bookings_by_client(db: Client, client_id: str) -> List[Dict]:
-    response = db.table("bookings").select(
-        "id, client_id, consultant_id, service_id, booking_date, timezone, status, intake_form_data, total_amount, payment_status, payment_intent_id, meeting_url, meeting_notes, created_at, updated_at, duration_option_id, documents:booking_documents(*), duration_option:service_duration_options(duration_minutes, duration_label)"
-    ).eq("client_id", client_id).execute()
+    response = db.table("bookings").select(BOOKING_SELECT).eq("client_id", client_id).execute()
     
     # Flatten duration_option for each booking
-    bookings = response.data
-    for booking in bookings:
-        if booking.get('duration_option'):
-            booking['duration_minutes'] = booking['duration_option'].get('duration_minutes')
-            booking['duration_label'] = booking['duration_option'].get('duration_label')
-    
-    return bookings
+    return [flatten_duration_option(booking) for booking in response.data]
 
 def get_bookings_by_consultant(db: Client, consultant_id: int) -> List[Dict]:
-    response = db.table("bookings").select(
-        "id, client_id, consultant_id, service_id, booking_date, timezone, status, intake_form_data, total_amount, payment_status, payment_intent_id, meeting_url, meeting_notes, created_at, updated_at, duration_option_id, documents:booking_documents(*), duration_option:service_duration_options(duration_minutes, duration_label)"
-    ).eq("consultant_id", consultant_id).execute()
+    response = db.table("bookings").select(BOOKING_SELECT).eq("consultant_id", consultant_id).execute()
     
     # Flatten duration_option for each booking
-    bookings = response.data
-    for booking in bookings:
-        if booking.get('duration_option'):
-            booking['duration_minutes'] = booking['duration_option'].get('duration_minutes')
-            booking['duration_label'] = booking['duration_option'].get('duration_label')
-    
-    return bookings
+    return [flatten_duration_option(booking) for booking in response.data]
 
 def create_booking(db: Client, *, obj_in: BookingCreate) -> Dict:
+    """
+    Insert a booking and return it as get_booking would.
+    
+    Raises:
+        APIError: PT409 from the bookings_slot_hold_check trigger when another
+            client holds an overlapping slot, 23P01 when it overlaps a booking
+    """
     booking_data = obj_in.dict()
     # Set defaults: immediately confirmed; payment stays pending by default
     if "status" not in booking_data or booking_data["status"] is None:
@@ -58,10 +93,81 @@ def create_booking(db: Client, *, obj_in: BookingCreate) -> Dict:
     
     response = db.table("bookings").insert(booking_data).execute()
     booking_id = response.data[0]["id"]
+    invalidate_slots(response.data[0].get("consultant_id"))
     
     # Return the booking with documents included (initially empty)
     return get_booking(db, booking_id)
 
+def create_booking_with_duration(
+    db: Client,
+    *,
+    client_id: str,
+    consultant_id: int,
+    service_id: int,
+    duration_option_id: int,
+    booking_date: str,
+    timezone: str,
+    intake_form_data: Any
+) -> Dict:
+    """
+    Check the consultant's service, its price for the duration option and the
+    option itself, insert the confirmed booking priced from that option and
+    return it as get_booking would, in one round trip (the
+    create_booking_with_duration database function).
+    
+    The slot must not overlap an active booking or another client's live hold;
+    the client's own hold on it is used up.
+    
+    Raises:
+        APIError: code PT404/PT400 (the HTTP status) when a check fails,
+            PT409 when the slot is taken
+    """
+    response = db.rpc("create_booking_with_duration", {
+        "p_client_id": str(client_id),
+        "p_consultant_id": consultant_id,
+        "p_service_id": service_id,
+        "p_duration_option_id": duration_option_id,
+        "p_booking_date": booking_date,
+        "p_timezone": timezone,
+        "p_intake_form_data": intake_form_data,
+    }).execute()
+    booking = response.data[0]
+    invalidate_slots(booking.get("consultant_id"))
+    return flatten_duration_option(booking)
+
+def hold_booking_slot(
+    db: Client,
+    *,
+    client_id: str,
+    consultant_id: int,
+    service_id: int,
+    duration_option_id: Optional[int],
+    booking_date: str
+) -> Dict:
+    """
+    Hold a consultant's slot for the client for settings.BOOKING_HOLD_MINUTES
+    while they pay (the hold_booking_slot database function). The client's
+    earlier hold with this consultant is released.
+    
+    Raises:
+        APIError: code PT404 for an unknown service, PT409 when the slot is
+            booked or held by someone else
+    """
+    response = db.rpc("hold_booking_slot", {
+        "p_client_id": str(client_id),
+        "p_consultant_id": consultant_id,
+        "p_service_id": service_id,
+        "p_duration_option_id": duration_option_id,
+        "p_booking_date": booking_date,
+        "p_hold_minutes": settings.BOOKING_HOLD_MINUTES,
+    }).execute()
+    return response.data[0]
+
+def release_booking_hold(db: Client, *, hold_id: int, client_id: str) -> bool:
+    """Release a client's hold; False when it does not exist (or already expired and was replaced)"""
+    response = db.table("booking_holds").delete().eq("id", hold_id).eq("client_id", str(client_id)).execute()
+    return bool(response.data)
+
 def update_booking(db: Client, *, booking_id: int, obj_in: BookingUpdate) -> Dict:
     from datetime import datetime, timezone
     
@@ -70,6 +176,7 @@ def update_booking(db: Client, *, booking_id: int, obj_in: BookingUpdate) -> Dic
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
     
     response = db.table("bookings").update(update_data).eq("id", booking_id).execute()
+    invalidate_slots(response.data[0].get("consultant_id"))
     return response.data[0]
 
 def create_booking_document(db: Client, *, obj_in: BookingDocumentCreate) -> Dict:
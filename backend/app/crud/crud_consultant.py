@@ -4,6 +4,17 @@ from app.schemas.consultant import ConsultantCreate, ConsultantUpdate, Consultan
 from app.crud.crud_service_template import service_template
 from app.crud.crud_service_duration_option import service_duration_option
 from app.crud.crud_consultant_service_pricing import consultant_service_pricing
+from app.core.config import settings
+from app.crud.consultant_directory import consultant_directory
+from app.crud.profile_cache import invalidate_profile
+from app.crud.slot_cache import invalidate_slots
+from app.utils.cache import TTLCache
+
+# user_id -> {"id", "name", "timezone"} of that user's consultant profile
+_identity_cache = TTLCache(
+    max_entries=settings.IDENTITY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.IDENTITY_CACHE_TTL_SECONDS,
+)
 
 class CRUDConsultant:
     def create(self, db: Client, *, obj_in: ConsultantCreate) -> Dict[str, Any]:
@@ -13,6 +24,7 @@ class CRUDConsultant:
         if data.get('user_id'):
             data['user_id'] = str(data['user_id'])
         response = db.table("consultants").insert(data).execute()
+        consultant_directory.invalidate()
         
         if response.data:
             consultant = response.data[0]
@@ -38,50 +50,13 @@ class CRUDConsultant:
         services_response = db.table("consultant_services").select("*").eq("consultant_id", consultant_id).execute()
         consultant["services"] = services_response.data or []
         
-        # Get reviews
+        # Get reviews (for display only; rating and review_count are stored on the consultant)
         reviews_response = db.table("consultant_reviews").select("*").eq("consultant_id", consultant_id).execute()
-        reviews = reviews_response.data or []
-        consultant["reviews"] = reviews
-        
-        # Calculate review stats
-        if reviews:
-            total_rating = sum(review["rating"] for review in reviews)
-            consultant["rating"] = round(total_rating / len(reviews), 1)
-            consultant["review_count"] = len(reviews)
-        else:
-            consultant["rating"] = None  # No rating if no reviews
-            consultant["review_count"] = 0
+        consultant["reviews"] = reviews_response.data or []
+        consultant["review_count"] = consultant.get("review_count") or 0
         
         return consultant
 
-    def get_multi(self, db: Client, skip: int = 0, limit: int = 100) -> List[Dict]:
-        # Get consultants basic info
-        consultants_response = db.table("consultants").select("*").range(skip, skip + limit - 1).execute()
-        consultants = consultants_response.data or []
-        
-        for consultant in consultants:
-            consultant_id = consultant["id"]
-            
-            # Services are loaded separately by DurationBasedServiceSelection when needed
-            # Removing this to fix timeout issues in consultants list API
-            consultant["services"] = []
-            
-            # Get reviews for rating calculation
-            reviews_response = db.table("consultant_reviews").select("*").eq("consultant_id", consultant_id).execute()
-            reviews = reviews_response.data or []
-            consultant["reviews"] = reviews
-            
-            # Calculate review stats
-            if reviews:
-                total_rating = sum(review["rating"] for review in reviews)
-                consultant["rating"] = round(total_rating / len(reviews), 1)
-                consultant["review_count"] = len(reviews)
-            else:
-                consultant["rating"] = None  # No rating if no reviews
-                consultant["review_count"] = 0
-        
-        return consultants
-
     def get_by_rcic_number(self, db: Client, rcic_number: str) -> Optional[Dict[str, Any]]:
         """Get consultant by RCIC number"""
         response = db.table("consultants").select("*").eq("rcic_number", rcic_number).execute()
@@ -92,10 +67,39 @@ class CRUDConsultant:
         response = db.table("consultants").select("*").eq("user_id", user_id).execute()
         return response.data[0] if response.data else None
 
+    def get_identity_by_user_id(self, db: Client, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the id, name and timezone of a user's consultant profile.
+        Served from a short-lived per-worker cache; missing profiles are not cached.
+        """
+        identity = _identity_cache.get(user_id)
+        if identity is not None:
+            return identity
+        response = db.table("consultants").select("id, name, timezone").eq("user_id", user_id).execute()
+        if not response.data:
+            return None
+        identity = response.data[0]
+        _identity_cache.set(user_id, identity)
+        return identity
+
+    def invalidate_identity(self, consultant_id: int) -> None:
+        """Drop cached identities for a consultant after its profile changes"""
+        _identity_cache.delete_where(lambda user_id, identity: identity["id"] == consultant_id)
+
     def update(self, db: Client, *, consultant_id: int, obj_in: ConsultantUpdate) -> Dict:
         response = db.table("consultants").update(obj_in.dict(exclude_unset=True)).eq("id", consultant_id).execute()
+        self.invalidate_identity(consultant_id)
+        invalidate_profile(consultant_id)
+        # Cached slot days are consultant wall-clock times, so a timezone change shifts them
+        invalidate_slots(consultant_id)
+        consultant_directory.invalidate()
         return response.data[0] if response.data else {}
 
+    def reconcile_rating_aggregates(self, db: Client) -> int:
+        """Recompute stored rating aggregates from review rows; returns the number of consultants repaired"""
+        response = db.rpc("reconcile_consultant_rating_aggregates", {}).execute()
+        return response.data or 0
+
 consultant = CRUDConsultant()
 
 # Consultant Service CRUD
@@ -116,6 +120,7 @@ def update_consultant_service(db: Client, *, service_id: int, obj_in: Consultant
     update_data = obj_in.dict(exclude_unset=True)
     
     response = db.table("consultant_services").update(update_data).eq("id", service_id).execute()
+    invalidate_profile(response.data[0]["consultant_id"])
     return response.data[0]
 
 def create_default_consultant_services(db: Client, consultant_id: int) -> List[Dict]:
@@ -141,6 +146,7 @@ def create_default_consultant_services(db: Client, consultant_id: int) -> List[D
         if response.data:
             created_services.append(response.data[0])
     
+    invalidate_profile(consultant_id)
     return created_services
 
 def get_bookings_by_service(db: Client, service_id: int) -> List[Dict]:
@@ -151,22 +157,27 @@ def get_bookings_by_service(db: Client, service_id: int) -> List[Dict]:
 def delete_consultant_service(db: Client, *, service_id: int) -> bool:
     """Soft delete a consultant service by setting is_active to False"""
     response = db.table("consultant_services").update({"is_active": False}).eq("id", service_id).execute()
+    for service in response.data:
+        invalidate_profile(service["consultant_id"])
     return len(response.data) > 0
 
 # Duration-based pricing functions
+SERVICES_WITH_PRICING_SELECT = "*, pricing_options:consultant_service_pricing(*, duration_option:service_duration_options(*))"
+
 def get_services_with_pricing(db: Client, consultant_id: int, active_only: bool = False) -> List[Dict]:
-    """Get all services for a consultant with their duration-based pricing options"""
-    services = get_services_by_consultant(db, consultant_id, active_only)
+    """
+    Get all services for a consultant with their duration-based pricing options,
+    embedded by PostgREST so the whole tree comes back in one round trip
+    """
+    query = db.table("consultant_services").select(SERVICES_WITH_PRICING_SELECT).eq("consultant_id", consultant_id)
     
-    for service in services:
-        # Get pricing options with duration details for each service
-        # Note: For pricing, we want active pricing unless specifically requested otherwise
-        pricing_data = consultant_service_pricing.get_by_service_with_duration(
-            db, consultant_service_id=service["id"], is_active=None if not active_only else True
-        )
-        service["pricing_options"] = pricing_data
+    # Public views only see active services and their active pricing;
+    # the consultant's own management view sees everything
+    if active_only:
+        query = query.eq("is_active", True).eq("pricing_options.is_active", True)
     
-    return services
+    response = query.execute()
+    return response.data or []
 
 def get_service_price_for_duration(db: Client, service_id: int, duration_option_id: int) -> Optional[Dict]:
     """Get the price set by RCIC for a specific service and duration"""
@@ -215,5 +226,14 @@ def initialize_default_pricing_for_service(db: Client, service_id: int) -> List[
 
 # Consultant Review CRUD
 def create_consultant_review(db: Client, *, obj_in: Dict) -> Dict:
-    response = db.table("consultant_reviews").insert(obj_in).execute()
+    """Insert a review and update the consultant's rating aggregate in the same transaction"""
+    response = db.rpc("create_consultant_review", {
+        "p_consultant_id": obj_in["consultant_id"],
+        "p_client_id": str(obj_in["client_id"]),
+        "p_rating": obj_in["rating"],
+        "p_comment": obj_in.get("comment"),
+        "p_outcome": obj_in.get("outcome"),
+    }).execute()
+    invalidate_profile(obj_in["consultant_id"])
+    consultant_directory.invalidate()
     return response.data[0]
@@ -2,6 +2,7 @@ from typing import List, Optional, Dict, Any
 from supabase import Client
 from datetime import datetime
 import json
+from app.crud.base import apply_keyset
 from app.schemas.consultant_application import (
     ConsultantApplicationCreate,
     ConsultantApplicationUpdate,
@@ -127,15 +128,23 @@ class CRUDConsultantApplication:
         *, 
         skip: int = 0, 
         limit: int = 100,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get multiple consultant applications with optional status filter"""
+        """
+        Get multiple consultant applications with optional status filter.
+        Pass a cursor (empty for the first page) for keyset pagination, newest first.
+        """
         query = db.table("consultant_applications").select("*")
         
         if status:
             query = query.eq("status", status)
             
-        response = query.range(skip, skip + limit - 1).execute()
+        if cursor is not None:
+            query = apply_keyset(query, cursor, limit)
+        else:
+            query = query.range(skip, skip + limit - 1)
+        response = query.execute()
         if response.data:
             # Process JSON fields and provide default values for new fields if they don't exist
             for i, app in enumerate(response.data):
@@ -1,6 +1,7 @@
 from typing import List, Optional, Dict, Any
 from supabase import Client
 
+from app.crud.profile_cache import invalidate_profile_for_service
 from app.schemas.consultant import (
     ConsultantServicePricingCreate,
     ConsultantServicePricingUpdate,
@@ -108,6 +109,7 @@ class CRUDConsultantServicePricing:
                 "updated_at": "now()"
             }
             response = db.table("consultant_service_pricing").update(update_data).eq("id", existing["id"]).execute()
+            invalidate_profile_for_service(db, obj_in.consultant_service_id)
             return response.data[0]
         
         # Validate price is within the duration option's range
@@ -119,6 +121,7 @@ class CRUDConsultantServicePricing:
         
         obj_data = obj_in.dict()
         response = db.table("consultant_service_pricing").insert(obj_data).execute()
+        invalidate_profile_for_service(db, obj_in.consultant_service_id)
         return response.data[0]
 
     def update(
@@ -143,6 +146,7 @@ class CRUDConsultantServicePricing:
             
             obj_data["updated_at"] = "now()"
             response = db.table("consultant_service_pricing").update(obj_data).eq("id", pricing_id).execute()
+            invalidate_profile_for_service(db, response.data[0]["consultant_service_id"])
             return response.data[0]
         else:
             return self.get(db, pricing_id=pricing_id)
@@ -186,6 +190,8 @@ class CRUDConsultantServicePricing:
     def delete(self, db: Client, *, pricing_id: int) -> bool:
         """Soft delete consultant service pricing"""
         response = db.table("consultant_service_pricing").update({"is_active": False}).eq("id", pricing_id).execute()
+        for pricing in response.data:
+            invalidate_profile_for_service(db, pricing["consultant_service_id"])
         return len(response.data) > 0
 
     def delete_by_service(self, db: Client, *, consultant_service_id: int) -> bool:
@@ -196,6 +202,7 @@ class CRUDConsultantServicePricing:
             .eq("consultant_service_id", consultant_service_id)
             .execute()
         )
+        invalidate_profile_for_service(db, consultant_service_id)
         return len(response.data) > 0
 
 
@@ -2,6 +2,14 @@ from typing import Optional, List, Dict, Any
 from supabase import Client
 from datetime import datetime, timezone
 import uuid
+from app.crud.base import apply_keyset
+from app.services.intake_extraction_service import intake_extraction_service
+
+def _same_instant(first: Optional[str], second: Optional[str]) -> bool:
+    """Compare timestamps as instants; Postgres and Python format them differently"""
+    if first is None or second is None:
+        return first is second
+    return datetime.fromisoformat(first) == datetime.fromisoformat(second)
 
 class CRUDIntake:
     
@@ -18,7 +26,18 @@ class CRUDIntake:
         if existing:
             return existing
             
-        intake_data = {
+        intake_data = self.build_initial(client_id, full_name, email)
+        response = db.table("client_intakes").insert(intake_data).execute()
+        return response.data[0] if response.data else None
+    
+    def build_initial(
+        self,
+        client_id: str,
+        full_name: Optional[str] = None,
+        email: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Initial client_intakes row for a new user"""
+        return {
             "client_id": client_id,
             "full_name": full_name,
             "email": email,
@@ -26,15 +45,24 @@ class CRUDIntake:
             "current_stage": 1,
             "completed_stages": []
         }
-        
-        response = db.table("client_intakes").insert(intake_data).execute()
-        return response.data[0] if response.data else None
     
     def get_by_client_id(self, db: Client, client_id: str) -> Optional[Dict[str, Any]]:
         """Get intake by client ID"""
         response = db.table("client_intakes").select("*").eq("client_id", client_id).execute()
         return response.data[0] if response.data else None
     
+    def get_multi(
+        self, db: Client, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """All intakes (admin view); a cursor (empty for the first page) switches to keyset pagination"""
+        query = db.table("client_intakes").select("*")
+        if cursor is not None:
+            query = apply_keyset(query, cursor, limit)
+        else:
+            query = query.order("created_at.desc,id", desc=True).range(skip, skip + limit - 1)
+        response = query.execute()
+        return response.data or []
+    
     def update_stage_data(
         self, 
         db: Client, 
@@ -47,6 +75,12 @@ class CRUDIntake:
         if not db_obj:
             return None
         
+        update_data = self.build_stage_update(db_obj, stage, data)
+        response = db.table("client_intakes").update(update_data).eq("client_id", client_id).execute()
+        return response.data[0] if response.data else None
+    
+    def build_stage_update(self, db_obj: Dict[str, Any], stage: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the client_intakes update for saving a stage's data"""
         # Prepare update data
         update_data = data.copy()
         
@@ -60,9 +94,8 @@ class CRUDIntake:
             
         # Set updated timestamp
         update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-        
-        response = db.table("client_intakes").update(update_data).eq("client_id", client_id).execute()
-        return response.data[0] if response.data else None
+        update_data.update(self.build_booking_summary_columns({**db_obj, **update_data}))
+        return update_data
     
     def complete_stage(
         self, 
@@ -75,6 +108,12 @@ class CRUDIntake:
         if not db_obj:
             return None
         
+        update_data = self.build_stage_completion(db_obj, stage)
+        response = db.table("client_intakes").update(update_data).eq("client_id", client_id).execute()
+        return response.data[0] if response.data else None
+    
+    def build_stage_completion(self, db_obj: Dict[str, Any], stage: int) -> Dict[str, Any]:
+        """Build the client_intakes update for marking a stage as completed"""
         # Add stage to completed stages if not already there
         completed_stages = db_obj.get("completed_stages", [])
         if stage not in completed_stages:
@@ -89,9 +128,45 @@ class CRUDIntake:
         if len(completed_stages) >= 12:
             update_data["status"] = "completed"
             update_data["completed_at"] = datetime.now(timezone.utc).isoformat()
+        update_data.update(self.build_booking_summary_columns({**db_obj, **update_data}))
+        return update_data
+    
+    def build_booking_summary_columns(self, db_obj: Dict[str, Any]) -> Dict[str, Any]:
+        """Booking summary of an intake revision, and that revision's updated_at to tell when it is stale"""
+        return {
+            "booking_summary": intake_extraction_service.extract_intake_summary(db_obj),
+            "booking_summary_updated_at": db_obj.get("updated_at"),
+        }
+    
+    def get_booking_summary(self, db: Client, client_id: str) -> Optional[Dict[str, Any]]:
+        """
+        The client's intake summary for a booking, without reading the whole intake.
         
-        response = db.table("client_intakes").update(update_data).eq("client_id", client_id).execute()
-        return response.data[0] if response.data else None
+        update_stage_data and complete_stage store the summary with each revision.
+        Intakes saved before that, or changed elsewhere (reset_intake), have a
+        missing or stale summary; it is built from the full row and stored once.
+        The returned copy's extraction_date is now, when it is used for the booking.
+        """
+        response = db.table("client_intakes").select(
+            "booking_summary, booking_summary_updated_at, updated_at"
+        ).eq("client_id", client_id).execute()
+        if not response.data:
+            return None
+        stored = response.data[0]
+        summary = stored.get("booking_summary")
+        if not summary or not _same_instant(stored.get("booking_summary_updated_at"), stored.get("updated_at")):
+            db_obj = self.get_by_client_id(db, client_id)
+            if not db_obj:
+                return None
+            columns = self.build_booking_summary_columns(db_obj)
+            query = db.table("client_intakes").update(columns).eq("client_id", client_id)
+            if db_obj.get("updated_at"):
+                # Unless the intake changed in the meantime
+                query = query.eq("updated_at", db_obj["updated_at"])
+            query.execute()
+            summary = columns["booking_summary"]
+        # Same format as IntakeExtractionService.extract_intake_summary
+        return {**summary, "extraction_date": datetime.now(timezone.utc).replace(tzinfo=None).isoformat()}
     
     def get_completion_percentage(self, db_obj: Dict[str, Any]) -> float:
         """Calculate completion percentage based on completed stages"""
@@ -106,6 +181,10 @@ class CRUDIntake:
         if not db_obj:
             return None
         
+        return self.build_summary(db_obj)
+    
+    def build_summary(self, db_obj: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize an intake row for quick status checks"""
         return {
             "id": db_obj.get("id"),
             "client_id": db_obj.get("client_id"),
@@ -130,6 +209,8 @@ class CRUDIntake:
             "current_stage": 1,
             "completed_stages": [],
             "completed_at": None,
+            "booking_summary": None,
+            "booking_summary_updated_at": None,
             "updated_at": datetime.now(timezone.utc).isoformat()
         }
         
@@ -2,6 +2,8 @@ from typing import Any, Dict, Optional, Union, List
 from supabase import Client
 from gotrue.errors import AuthApiError
 
+from app.crud.base import decode_cursor
+
 
 def get_user_by_id(db: Client, *, user_id: str) -> Optional[Dict]:
     """
@@ -52,6 +54,41 @@ def get_user_by_email(db: Client, *, email: str) -> Optional[Dict]:
     return None
 
 
+def list_users_page(
+    db: Client, *, limit: int, cursor: Optional[str] = None, role: Optional[str] = None
+) -> List[Dict]:
+    """
+    One keyset page of Supabase Auth users, newest first, via the list_users_page()
+    database function (the Auth admin API only offers offset pages).
+    Pass an empty cursor for the first page.
+    """
+    after_created_at, after_id = None, None
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != 2 or not all(isinstance(value, str) for value in values):
+            raise ValueError("Invalid cursor")
+        after_created_at, after_id = values
+    response = db.rpc("list_users_page", {
+        "p_role": role,
+        "p_after_created_at": after_created_at,
+        "p_after_id": after_id,
+        "p_limit": limit,
+    }).execute()
+    return [
+        {
+            "id": user["id"],
+            "email": user["email"],
+            "full_name": user.get("full_name"),
+            "role": user.get("role") or "client",
+            "email_verified": user.get("email_confirmed_at") is not None,
+            "is_active": not user.get("banned_until"),
+            "created_at": user["created_at"],
+            "last_sign_in": user.get("last_sign_in_at"),
+        }
+        for user in response.data or []
+    ]
+
+
 def update_user_metadata(db: Client, *, user_id: str, metadata: Dict[str, Any]) -> Optional[Dict]:
     """
     Update user metadata in Supabase Auth
@@ -0,0 +1,34 @@
+"""
+Cache of public consultant profile aggregates (consultant row, services and
+reviews), keyed by consultant id.
+
+Entries live in Redis when settings.REDIS_URL is set, otherwise in a per-worker
+LRU. Every write to consultants, consultant_services, consultant_service_pricing
+or consultant_reviews goes through the CRUD modules, which call the invalidate
+helpers below; the TTL bounds staleness from writes made outside the API.
+"""
+from typing import Optional
+
+from supabase import Client
+
+from app.core.config import settings
+from app.utils.cache import build_cache
+
+profile_cache = build_cache(
+    "consultant_profile",
+    max_entries=settings.PROFILE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PROFILE_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_profile(consultant_id: Optional[int]) -> None:
+    """Drop the cached profile of a consultant after a write that changes it"""
+    if consultant_id is not None:
+        profile_cache.delete(consultant_id)
+
+
+def invalidate_profile_for_service(db: Client, consultant_service_id: int) -> None:
+    """Drop the cached profile that owns a consultant service (pricing writes only know the service)"""
+    response = db.table("consultant_services").select("consultant_id").eq("id", consultant_service_id).execute()
+    if response.data:
+        invalidate_profile(response.data[0]["consultant_id"])
@@ -0,0 +1,59 @@
+"""
+Cache of computed free slot starts, keyed by consultant, consultant-local date
+and slot duration.
+
+Entries hold wall-clock start times in the consultant's timezone, before any
+past-time filtering, so one entry serves every client timezone and never goes
+stale as the day passes. Each consultant has a generation token that is part of
+every key; invalidate_slots() replaces it, which orphans all of that
+consultant's entries at once (they expire with the TTL). Availability, booking
+and consultant profile writes go through crud_availability, crud_booking and
+crud_consultant, which call it.
+
+Entries live in Redis when settings.REDIS_URL is set, otherwise in a per-worker
+LRU; the TTL bounds staleness from writes made by other workers or outside the API.
+"""
+import uuid
+from datetime import date
+from typing import List, Optional
+
+from app.core.config import settings
+from app.utils.cache import build_cache
+
+slot_cache = build_cache(
+    "consultant_slots",
+    max_entries=settings.SLOT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SLOT_CACHE_TTL_SECONDS,
+)
+
+
+def _generation_key(consultant_id: int) -> str:
+    return f"{consultant_id}:generation"
+
+
+def slot_generation(consultant_id: int) -> str:
+    """Current generation token of a consultant's entries (read it before computing slots)"""
+    generation = slot_cache.get(_generation_key(consultant_id))
+    if generation is None:
+        generation = uuid.uuid4().hex
+        slot_cache.set(_generation_key(consultant_id), generation)
+    return generation
+
+
+def day_key(consultant_id: int, generation: str, day: date, duration_minutes: int) -> str:
+    return f"{consultant_id}:{generation}:{day.isoformat()}:{duration_minutes}"
+
+
+def get_day_starts(consultant_id: int, generation: str, day: date, duration_minutes: int) -> Optional[List[str]]:
+    """Cached free slot starts ("YYYY-MM-DDTHH:MM:SS", consultant wall-clock) or None"""
+    return slot_cache.get(day_key(consultant_id, generation, day, duration_minutes))
+
+
+def set_day_starts(consultant_id: int, generation: str, day: date, duration_minutes: int, starts: List[str]) -> None:
+    slot_cache.set(day_key(consultant_id, generation, day, duration_minutes), starts)
+
+
+def invalidate_slots(consultant_id: Optional[int]) -> None:
+    """Drop every cached day of a consultant after an availability or booking write"""
+    if consultant_id is not None:
+        slot_cache.set(_generation_key(consultant_id), uuid.uuid4().hex)
@@ -1,4 +1,9 @@
+import threading
+from typing import Dict
+import httpx
+from postgrest import AsyncPostgrestClient
 from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
 from app.core.config import settings
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
@@ -18,25 +23,214 @@ def get_db():
     finally:
         db.close()
 
+
+class PoolMetrics:
+    """Counters describing how well clients and HTTP connections are reused"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clients_created = 0
+        self.client_reuses = 0
+        self.requests_sent = 0
+        self.connections_opened = 0
+
+    def increment(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def trace(self, event_name: str, info: dict) -> None:
+        """httpcore trace hook: counts new TCP connections"""
+        if event_name == "connection.connect_tcp.complete":
+            self.increment("connections_opened")
+
+    async def atrace(self, event_name: str, info: dict) -> None:
+        """Async variant of trace for httpx.AsyncClient requests"""
+        self.trace(event_name, info)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            requests_sent = self.requests_sent
+            connections_opened = self.connections_opened
+            return {
+                "clients_created": self.clients_created,
+                "client_reuses": self.client_reuses,
+                "requests_sent": requests_sent,
+                "connections_opened": connections_opened,
+                "connection_reuse_ratio": (
+                    round(1 - connections_opened / requests_sent, 4) if requests_sent else 0.0
+                ),
+            }
+
+
+class SupabaseClientRegistry:
+    """
+    Per-worker registry of long-lived Supabase clients.
+
+    Clients are created once per API key and their PostgREST, Storage and Auth
+    HTTP sessions are replaced with keep-alive pools sized by the
+    SUPABASE_POOL_* settings, so requests reuse open connections instead of
+    building a new client (and TLS handshake) every time.
+
+    Pooled clients must never be used for session-changing auth calls
+    (sign in/out, refresh): those would swap the shared client's token.
+    Use `create_session_client()` for that.
+
+    `get_async_postgrest()` returns an AsyncPostgrestClient on a shared
+    httpx.AsyncClient pool for `async def` endpoints, which must not block
+    the event loop with the sync client.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, Client] = {}
+        self._async_clients: Dict[str, AsyncPostgrestClient] = {}
+        self._lock = threading.Lock()
+        self.metrics = PoolMetrics()
+
+    def get(self, key: str) -> Client:
+        client = self._clients.get(key)
+        if client is not None:
+            self.metrics.increment("client_reuses")
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._create_pooled_client(key)
+                self._clients[key] = client
+                self.metrics.increment("clients_created")
+            else:
+                self.metrics.increment("client_reuses")
+        return client
+
+    def clear(self) -> None:
+        """Close all pooled connections and forget the clients (tests / shutdown)"""
+        with self._lock:
+            for client in self._clients.values():
+                client.postgrest.session.close()
+                client.storage.session.close()
+                client.auth._http_client.close()
+            self._clients.clear()
+
+    def get_async_postgrest(self, key: str) -> AsyncPostgrestClient:
+        client = self._async_clients.get(key)
+        if client is not None:
+            self.metrics.increment("client_reuses")
+            return client
+        with self._lock:
+            client = self._async_clients.get(key)
+            if client is None:
+                client = self._create_async_postgrest(key)
+                self._async_clients[key] = client
+                self.metrics.increment("clients_created")
+            else:
+                self.metrics.increment("client_reuses")
+        return client
+
+    async def aclose(self) -> None:
+        """Close the async PostgREST pools (app shutdown / tests)"""
+        with self._lock:
+            clients = list(self._async_clients.values())
+            self._async_clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.SUPABASE_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SUPABASE_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.SUPABASE_POOL_KEEPALIVE_EXPIRY,
+        )
+
+    def _count_request(self, request: httpx.Request) -> None:
+        self.metrics.increment("requests_sent")
+        request.extensions["trace"] = self.metrics.trace
+
+    async def _count_async_request(self, request: httpx.Request) -> None:
+        self.metrics.increment("requests_sent")
+        request.extensions["trace"] = self.metrics.atrace
+
+    def _pooled_session(self, session: httpx.Client, **kwargs) -> httpx.Client:
+        """Replace an SDK-created httpx session with a pooled, instrumented one"""
+        # Keep the SDK's own client subclass (it adds the aclose() the SDK calls)
+        pooled = type(session)(
+            base_url=session.base_url,
+            headers=session.headers,
+            timeout=httpx.Timeout(settings.SUPABASE_HTTP_TIMEOUT),
+            limits=self._limits(),
+            event_hooks={"request": [self._count_request]},
+            **kwargs,
+        )
+        session.close()
+        return pooled
+
+    def _create_pooled_client(self, key: str) -> Client:
+        client = create_client(
+            settings.SUPABASE_URL,
+            key,
+            options=ClientOptions(
+                auto_refresh_token=False,
+                persist_session=False,
+                postgrest_client_timeout=settings.SUPABASE_HTTP_TIMEOUT,
+                storage_client_timeout=int(settings.SUPABASE_HTTP_TIMEOUT),
+            ),
+        )
+        client.postgrest.session = self._pooled_session(client.postgrest.session)
+        storage = client.storage
+        storage.session = self._pooled_session(storage.session, follow_redirects=True, http2=True)
+        storage._client = storage.session
+        auth_http = self._pooled_session(client.auth._http_client, follow_redirects=True)
+        client.auth._http_client = auth_http
+        client.auth.admin._http_client = auth_http
+        return client
+
+    def _create_async_postgrest(self, key: str) -> AsyncPostgrestClient:
+        client = AsyncPostgrestClient(
+            f"{settings.SUPABASE_URL}/rest/v1",
+            headers={
+                "apiKey": key,
+                "Authorization": f"Bearer {key}",
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            },
+        )
+        sdk_session = client.session
+        # The SDK session has no pool limits or metrics; swap it like the sync ones
+        client.session = type(sdk_session)(
+            base_url=sdk_session.base_url,
+            headers=sdk_session.headers,
+            timeout=httpx.Timeout(settings.SUPABASE_HTTP_TIMEOUT),
+            limits=self._limits(),
+            event_hooks={"request": [self._count_async_request]},
+        )
+        return client
+
+
+supabase_registry = SupabaseClientRegistry()
+
 def get_supabase() -> Client:
     """Get Supabase client instance with service role key"""
-    return create_client(
-        settings.SUPABASE_URL,
-        settings.SUPABASE_SERVICE_ROLE_KEY
-    )
+    return supabase_registry.get(settings.SUPABASE_SERVICE_ROLE_KEY)
 
 def get_supabase_admin() -> Client:
     """Get Supabase client instance with service role key that bypasses RLS"""
     # Service role key automatically bypasses RLS policies
-    client = create_client(
-        settings.SUPABASE_URL,
-        settings.SUPABASE_SERVICE_ROLE_KEY
-    )
-    return client
+    return supabase_registry.get(settings.SUPABASE_SERVICE_ROLE_KEY)
 
 def get_supabase_anon() -> Client:
     """Get Supabase client instance with anon key"""
+    return supabase_registry.get(settings.SUPABASE_ANON_KEY)
+
+def get_async_postgrest() -> AsyncPostgrestClient:
+    """Get the shared async PostgREST client with service role key"""
+    return supabase_registry.get_async_postgrest(settings.SUPABASE_SERVICE_ROLE_KEY)
+
+def create_session_client() -> Client:
+    """
+    Create a short-lived, unpooled client for auth flows that sign a user in,
+    out, or refresh a session. These calls change the client's own session,
+    so they must never run on a shared pooled client.
+    """
     return create_client(
         settings.SUPABASE_URL,
-        settings.SUPABASE_ANON_KEY
+        settings.SUPABASE_SERVICE_ROLE_KEY,
+        options=ClientOptions(),
     )
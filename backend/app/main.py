@@ -6,7 +6,9 @@ import json
 
 from app.api.api_v1.api import api_router
 from app.core.config import settings
+from app.crud.base import NEXT_CURSOR_HEADER
 from app.services.storage_service import storage_service
+from app.db.supabase import supabase_registry
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -21,6 +23,7 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
 @app.exception_handler(RequestValidationError)
@@ -62,4 +65,9 @@ async def startup_event():
     storage_service.create_bucket_if_not_exists()
     print("Application startup complete.")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled Supabase connections"""
+    await supabase_registry.aclose()
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
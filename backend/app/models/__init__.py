@@ -3,7 +3,7 @@ from .user import UserRole
 from .consultant import Consultant, ConsultantService, ConsultantReview
 from .consultant_application import ConsultantApplication
 from .consultant_onboarding import ConsultantOnboarding
-from .booking import Booking, BookingDocument, BookingStatus, PaymentStatus
+from .booking import Booking, BookingDocument, BookingHold, BookingStatus, PaymentStatus
 from .blog import BlogPost, BlogComment, BlogLike
 from .testimonial import Testimonial
 from .service import Service
@@ -14,3 +14,4 @@ from .notification import Notification, NotificationType
 from .intake import ClientIntake, IntakeDocument, IntakeStatus
 from .availability import ConsultantAvailability, ConsultantBlockedTime, DayOfWeek
 from .session_note import SessionNote
+from .cache_version import CacheVersion
@@ -31,6 +31,7 @@ class Booking(Base):
     
     # Booking details
     booking_date = Column(DateTime(timezone=True), nullable=False)
+    ends_at = Column(DateTime(timezone=True))  # NOT NULL in Postgres, set by the bookings_set_ends_at trigger
     timezone = Column(String, default="America/Toronto")
     status = Column(Enum(BookingStatus), default=BookingStatus.pending)
     
@@ -72,3 +73,17 @@ class BookingDocument(Base):
     
     # Relationships
     booking = relationship("Booking", back_populates="documents")
+
+class BookingHold(Base):
+    """A client's short-lived claim on a consultant's slot while paying"""
+    __tablename__ = "booking_holds"
+
+    id = Column(Integer, primary_key=True, index=True)
+    consultant_id = Column(Integer, ForeignKey("consultants.id"), nullable=False)
+    client_id = Column(UUID(as_uuid=True), nullable=False)
+    service_id = Column(Integer, ForeignKey("consultant_services.id"), nullable=False)
+    duration_option_id = Column(Integer, ForeignKey("service_duration_options.id"), nullable=True)
+    starts_at = Column(DateTime(timezone=True), nullable=False)
+    ends_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
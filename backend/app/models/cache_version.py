@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, BigInteger, DateTime
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class CacheVersion(Base):
+    """Change counter per cached dataset, bumped by database triggers"""
+    __tablename__ = "cache_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, Text, JSON, ForeignKey, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, Text, JSON, ForeignKey, UniqueConstraint, Computed
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship, backref
 from app.db.base import Base
@@ -13,11 +13,17 @@ class Consultant(Base):
     rcic_number = Column(String, unique=True, index=True, nullable=True)
     location = Column(String)
     timezone = Column(String, default="America/Toronto")
-    languages = Column(JSON)  # Array of languages
-    specialties = Column(JSON)  # Array of specialties
+    languages = Column(JSONB)  # Array of languages (GIN-indexed for containment filters)
+    specialties = Column(JSONB)  # Array of specialties (GIN-indexed for containment filters)
     rating = Column(Float, nullable=True)  # Can be null if no reviews
-    review_count = Column(Integer, default=0)
+    review_count = Column(Integer, default=0, nullable=False)
+    rating_sum = Column(Integer, default=0, nullable=False)  # Maintained by create_consultant_review()
     bio = Column(Text)
+    # Directory search document; the directory snapshot searches it in memory
+    search_text = Column(Text, Computed(
+        "name || ' ' || coalesce(bio, '') || ' ' || coalesce(specialties::text, '') || ' ' || coalesce(languages::text, '')",
+        persisted=True,
+    ))
     experience = Column(String)
     success_rate = Column(String)
     calendly_url = Column(String)
@@ -184,6 +184,11 @@ class ClientIntake(Base):
     target_arrival = Column(DateTime)
     docs_ready = Column(JSON)  # Array of ready documents
     
+    # Booking summary (IntakeExtractionService), built from the revision whose updated_at
+    # is booking_summary_updated_at; a different updated_at means it is stale
+    booking_summary = Column(JSON)
+    booking_summary_updated_at = Column(DateTime(timezone=True))
+    
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
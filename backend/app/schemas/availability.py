@@ -220,6 +220,36 @@ class AvailableTimeSlots(BaseModel):
     total_slots: int
 
 
+class AvailableSlotsRange(BaseModel):
+    """Available time slots for a range of dates, grouped by client-local date"""
+    start_date: str = Field(..., description="First date in YYYY-MM-DD format (client's timezone)")
+    end_date: str = Field(..., description="Last date in YYYY-MM-DD format (client's timezone)")
+    consultant_id: int
+    consultant_timezone: str
+    client_timezone: str = Field(..., description="Client's timezone for conversion")
+    days: List[AvailableTimeSlots] = Field(..., description="One entry per date in the range, in order")
+    total_slots: int
+
+
+class ConsultantEarliestSlot(BaseModel):
+    """A consultant's next free slot"""
+    consultant_id: int
+    consultant_name: str
+    consultant_service_id: int = Field(..., description="The consultant's service for the requested template")
+    slot: AvailableSlot
+
+
+class EarliestAvailableSlots(BaseModel):
+    """Consultants ranked by their next free slot for a service and duration"""
+    service_template_id: int
+    duration_minutes: int
+    client_timezone: str
+    window_start: datetime = Field(..., description="Search window start in client's timezone")
+    window_end: datetime = Field(..., description="Search window end in client's timezone")
+    consultants_checked: int = Field(..., description="Matching consultants with a weekly schedule")
+    results: List[ConsultantEarliestSlot] = Field(..., description="Soonest first")
+
+
 # ============================================================
 # Copy/Repeat Schedule
 # ============================================================
@@ -52,3 +52,23 @@ class BookingInDB(BookingBase):
 
     class Config:
         from_attributes = True
+
+# Slot Hold Schemas
+class BookingHoldCreate(BaseModel):
+    consultant_id: int
+    service_id: int
+    duration_option_id: Optional[int] = None
+    booking_date: str  # ISO datetime string
+
+class BookingHoldInDB(BaseModel):
+    id: int
+    consultant_id: int
+    client_id: str  # UUID string
+    service_id: int
+    duration_option_id: Optional[int] = None
+    starts_at: datetime
+    ends_at: datetime
+    expires_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,11 +1,22 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional, Tuple
-from datetime import datetime, date, time, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, date, time, timedelta, timezone
 from zoneinfo import ZoneInfo
 from app.models.availability import ConsultantAvailability, ConsultantBlockedTime
 from app.models.booking import Booking, BookingStatus
+from app.models.consultant import Consultant, ConsultantService, ConsultantServicePricing
+from app.models.service_template import ServiceDurationOption
 from app.crud.crud_availability import crud_availability
-from app.schemas.availability import AvailableSlot, AvailableTimeSlots
+from app.crud.slot_cache import get_day_starts, set_day_starts, slot_generation
+from app.services.slot_engine import BusyIntervals, DayBitmap, get_zone, has_fixed_offset
+from app.schemas.availability import (
+    AvailableSlot,
+    AvailableSlotsRange,
+    AvailableTimeSlots,
+    ConsultantEarliestSlot,
+    EarliestAvailableSlots
+)
 from app.core.logging_config import availability_logger, log_timezone_conversion
 
 
@@ -25,6 +36,9 @@ class AvailabilityService:
     # Supported slot durations based on service duration options
     SUPPORTED_DURATIONS = [15, 30, 45, 60, 90, 120]  # minutes
     
+    # Longest range served by get_available_slots_for_range (a 6-week month grid)
+    MAX_RANGE_DAYS = 42
+    
     def __init__(self):
         # System supports ALL valid IANA timezones
         # No hardcoded list needed - validation happens via zoneinfo
@@ -69,208 +83,523 @@ class AvailabilityService:
             Otherwise, slot_duration_minutes is used.
             If neither is provided, DEFAULT_SLOT_DURATION (15 min) is used.
         """
-        # Determine slot duration
-        if slot_duration_minutes is None:
-            if service_id is not None:
-                # Get service duration from Supabase
-                service_response = supabase_db.table("consultant_services").select("duration").eq("id", service_id).execute()
-                if service_response.data and len(service_response.data) > 0:
-                    slot_duration_minutes = service_response.data[0].get("duration", self.DEFAULT_SLOT_DURATION)
-                else:
-                    slot_duration_minutes = self.DEFAULT_SLOT_DURATION
-            else:
-                slot_duration_minutes = self.DEFAULT_SLOT_DURATION
-        
-        # Get consultant's timezone from Supabase
-        consultant_response = supabase_db.table("consultants").select("timezone").eq("id", consultant_id).execute()
-        if not consultant_response.data or len(consultant_response.data) == 0:
-            raise ValueError(f"Consultant {consultant_id} not found")
-        
-        consultant_tz = consultant_response.data[0].get("timezone") or "America/Toronto"
-        
-        # Get day of week for target date
-        day_name = target_date.strftime("%A").lower()
+        slot_duration_minutes = self._resolve_slot_duration(supabase_db, slot_duration_minutes, service_id)
+        consultant_tz = self._get_consultant_timezone(supabase_db, consultant_id)
         
         # Log fetch operation
         availability_logger.debug(
             f"Fetching slots - Consultant: {consultant_id} ({consultant_tz}) | "
-            f"Date: {target_date} ({day_name}) | Duration: {slot_duration_minutes}m"
+            f"Date: {target_date} ({target_date.strftime('%A').lower()}) | Duration: {slot_duration_minutes}m"
         )
         
-        # Get consultant's availability slots for this day
-        availability_slots = crud_availability.get_consultant_availability(
-            db=sql_db,
+        day_starts = self._get_day_starts(sql_db, consultant_id, consultant_tz, [target_date], slot_duration_minutes)
+        available_slots = self._build_slots(
+            day_starts[target_date],
+            slot_duration_minutes,
+            consultant_tz,
+            client_timezone,
+            datetime.now(timezone.utc)
+        )
+        if available_slots:
+            log_timezone_conversion(
+                consultant_tz,
+                client_timezone,
+                f"{available_slots[0]['start_consultant_tz']} → {available_slots[0]['start']}"
+            )
+        
+        return AvailableTimeSlots(
+            date=target_date.isoformat(),
             consultant_id=consultant_id,
-            day_of_week=day_name,
-            is_active=True
+            consultant_timezone=consultant_tz,
+            client_timezone=client_timezone,
+            slots=available_slots,
+            total_slots=len(available_slots)
         )
+    
+    def get_available_slots_for_range(
+        self,
+        sql_db: Session,
+        supabase_db,  # Supabase Client
+        consultant_id: int,
+        start_date: date,
+        end_date: date,
+        client_timezone: str,
+        slot_duration_minutes: Optional[int] = None,
+        service_id: Optional[int] = None
+    ) -> AvailableSlotsRange:
+        """
+        Get available time slots for every date from start_date to end_date
+        (inclusive, client-local dates) for a booking calendar week/month view.
+        
+        The consultant's timezone, weekly schedule, blocked times and bookings
+        are fetched once for the whole range (only if some day is not cached),
+        then slots are generated for each consultant-local day in a single pass
+        and grouped by the client-local date they start on. Every date in the
+        range is present, even if empty.
+        
+        Raises:
+            ValueError: If the range is empty/too long or the consultant is not found
+        """
+        days_in_range = (end_date - start_date).days + 1
+        if days_in_range < 1 or days_in_range > self.MAX_RANGE_DAYS:
+            raise ValueError(f"Date range must cover 1 to {self.MAX_RANGE_DAYS} days")
         
-        availability_logger.debug(f"Found {len(availability_slots)} availability slot(s) in DB")
+        slot_duration_minutes = self._resolve_slot_duration(supabase_db, slot_duration_minutes, service_id)
+        consultant_tz = self._get_consultant_timezone(supabase_db, consultant_id)
         
-        if not availability_slots:
-            return AvailableTimeSlots(
-                date=target_date.isoformat(),
+        availability_logger.debug(
+            f"Fetching slot range - Consultant: {consultant_id} ({consultant_tz}) | "
+            f"Dates: {start_date}..{end_date} ({client_timezone}) | Duration: {slot_duration_minutes}m"
+        )
+        
+        slots_by_date = {
+            start_date + timedelta(days=offset): [] for offset in range(days_in_range)
+        }
+        
+        # A client-local date can start on the consultant's previous or next day
+        consultant_days = [start_date + timedelta(days=offset) for offset in range(-1, days_in_range + 1)]
+        day_starts = self._get_day_starts(sql_db, consultant_id, consultant_tz, consultant_days, slot_duration_minutes)
+        now = datetime.now(timezone.utc)
+        
+        # Consultant days at either end of the range can start or finish outside it
+        client_tz = get_zone(client_timezone)
+        range_start = datetime.combine(start_date, time.min).replace(tzinfo=client_tz)
+        range_end = datetime.combine(end_date + timedelta(days=1), time.min).replace(tzinfo=client_tz)
+        
+        for day in consultant_days:
+            starts = day_starts[day]
+            if day <= start_date or day >= end_date:
+                starts = [start for start in starts if range_start <= start < range_end]
+            for slot in self._build_slots(starts, slot_duration_minutes, consultant_tz, client_timezone, now):
+                slots_by_date[slot["start"].date()].append(slot)
+        
+        days = []
+        for client_day, day_slots in slots_by_date.items():
+            day_slots.sort(key=lambda slot: slot["start"])
+            days.append(AvailableTimeSlots(
+                date=client_day.isoformat(),
                 consultant_id=consultant_id,
                 consultant_timezone=consultant_tz,
                 client_timezone=client_timezone,
-                slots=[],
-                total_slots=0
+                slots=day_slots,
+                total_slots=len(day_slots)
+            ))
+        
+        first_slot = next((day.slots[0] for day in days if day.slots), None)
+        if first_slot is not None:
+            log_timezone_conversion(
+                consultant_tz,
+                client_timezone,
+                f"{first_slot.start_consultant_tz} → {first_slot.start}"
+            )
+        
+        return AvailableSlotsRange(
+            start_date=start_date.isoformat(),
+            end_date=end_date.isoformat(),
+            consultant_id=consultant_id,
+            consultant_timezone=consultant_tz,
+            client_timezone=client_timezone,
+            days=days,
+            total_slots=sum(day.total_slots for day in days)
+        )
+    
+    def find_earliest_available_slots(
+        self,
+        sql_db: Session,
+        service_template_id: int,
+        slot_duration_minutes: int,
+        client_timezone: str,
+        window_start: datetime,
+        window_end: datetime,
+        limit: int = 20
+    ) -> EarliestAvailableSlots:
+        """
+        Find who can see a client soonest: the next free slot of each available
+        consultant offering the service template at this duration, ranked by
+        start time.
+        
+        Availability, blocked times and bookings for all matching consultants
+        are loaded in one query each; each consultant's days are then walked in
+        order and the search for that consultant stops at its first free slot.
+        
+        Args:
+            window_start: Earliest slot start (timezone-aware); past times are skipped
+            window_end: Slots must start before this (timezone-aware)
+            limit: Maximum number of consultants returned
+        """
+        client_tz = get_zone(client_timezone)
+        duration = timedelta(minutes=slot_duration_minutes)
+        not_before = max(window_start, datetime.now(timezone.utc))
+        
+        result = EarliestAvailableSlots(
+            service_template_id=service_template_id,
+            duration_minutes=slot_duration_minutes,
+            client_timezone=client_timezone,
+            window_start=window_start.astimezone(client_tz),
+            window_end=window_end.astimezone(client_tz),
+            consultants_checked=0,
+            results=[]
+        )
+        
+        # Available consultants with an active service of this template priced at this duration
+        offers = sql_db.query(
+            ConsultantService.consultant_id,
+            ConsultantService.id,
+            Consultant.name,
+            Consultant.timezone
+        ).join(
+            Consultant, ConsultantService.consultant_id == Consultant.id
+        ).join(
+            ConsultantServicePricing, ConsultantServicePricing.consultant_service_id == ConsultantService.id
+        ).join(
+            ServiceDurationOption, ConsultantServicePricing.duration_option_id == ServiceDurationOption.id
+        ).filter(
+            ConsultantService.service_template_id == service_template_id,
+            ConsultantService.is_active == True,
+            Consultant.is_available == True,
+            ConsultantServicePricing.is_active == True,
+            ServiceDurationOption.is_active == True,
+            ServiceDurationOption.duration_minutes == slot_duration_minutes
+        ).order_by(ConsultantService.id).all()
+        
+        consultants = {}
+        for consultant_id, consultant_service_id, name, consultant_tz in offers:
+            consultants.setdefault(consultant_id, (consultant_service_id, name, consultant_tz or "America/Toronto"))
+        
+        if not consultants or not_before >= window_end:
+            return result
+        
+        windows = {}
+        for avail_slot in crud_availability.get_availability_for_consultants(sql_db, list(consultants)):
+            windows.setdefault(avail_slot.consultant_id, {}).setdefault(avail_slot.day_of_week.value, []).append(avail_slot)
+        
+        consultant_ids = [consultant_id for consultant_id in consultants if consultant_id in windows]
+        result.consultants_checked = len(consultant_ids)
+        if not consultant_ids:
+            return result
+        
+        # Bookings that started up to a day earlier can still run into the window
+        range_start = not_before.astimezone(timezone.utc) - timedelta(days=1)
+        range_end = window_end.astimezone(timezone.utc)
+        
+        periods = {consultant_id: [] for consultant_id in consultant_ids}
+        for blocked in crud_availability.get_blocked_times_for_consultants(
+            sql_db, consultant_ids, range_start, range_end
+        ):
+            periods[blocked.consultant_id].append((blocked.start_datetime, blocked.end_datetime))
+        for booking, duration_minutes, service_id in self._query_bookings_with_duration(
+            sql_db, consultant_ids, range_start, range_end
+        ):
+            booking_end = booking.booking_date + timedelta(minutes=self._booking_duration(booking, duration_minutes, service_id))
+            periods[booking.consultant_id].append((booking.booking_date, booking_end))
+        
+        earliest = []
+        for consultant_id in consultant_ids:
+            consultant_service_id, name, consultant_tz = consultants[consultant_id]
+            start = self._first_free_start(
+                windows[consultant_id],
+                BusyIntervals(periods[consultant_id]),
+                get_zone(consultant_tz),
+                duration,
+                not_before,
+                window_end
             )
+            if start is not None:
+                earliest.append((start, consultant_id, consultant_service_id, name, consultant_tz))
         
-        # Get blocked times for this date
-        start_of_day = datetime.combine(target_date, time.min).replace(tzinfo=ZoneInfo(consultant_tz))
-        end_of_day = datetime.combine(target_date, time.max).replace(tzinfo=ZoneInfo(consultant_tz))
+        earliest.sort(key=lambda item: (item[0], item[1]))
+        for start, consultant_id, consultant_service_id, name, consultant_tz in earliest[:limit]:
+            result.results.append(ConsultantEarliestSlot(
+                consultant_id=consultant_id,
+                consultant_name=name,
+                consultant_service_id=consultant_service_id,
+                slot=AvailableSlot(
+                    start=start.astimezone(client_tz),
+                    end=(start + duration).astimezone(client_tz),
+                    start_consultant_tz=start,
+                    consultant_timezone=consultant_tz,
+                    available=True
+                )
+            ))
+        
+        return result
+    
+    def _first_free_start(
+        self,
+        windows_by_day: dict,
+        busy: BusyIntervals,
+        consultant_zone: ZoneInfo,
+        duration: timedelta,
+        not_before: datetime,
+        window_end: datetime
+    ) -> Optional[datetime]:
+        """Earliest free slot start in [not_before, window_end), walking the consultant's days in order"""
+        day = not_before.astimezone(consultant_zone).date()
+        last_day = window_end.astimezone(consultant_zone).date()
+        
+        while day <= last_day:
+            best = None
+            day_windows = windows_by_day.get(day.strftime("%A").lower(), ())
+            bitmap = DayBitmap(busy, day, consultant_zone) if day_windows else None
+            for avail_slot in day_windows:
+                slot_start = datetime.combine(day, avail_slot.start_time).replace(tzinfo=consultant_zone)
+                slot_end = datetime.combine(day, avail_slot.end_time).replace(tzinfo=consultant_zone)
+                start = next(bitmap.free_starts(
+                    slot_start, slot_end, duration, timedelta(minutes=avail_slot.slot_interval_minutes), not_before
+                ), None)
+                if start is not None and start < window_end and (best is None or start < best):
+                    best = start
+            if best is not None:
+                return best
+            day += timedelta(days=1)
+        
+        return None
+    
+    def _resolve_slot_duration(
+        self,
+        supabase_db,
+        slot_duration_minutes: Optional[int],
+        service_id: Optional[int]
+    ) -> int:
+        """
+        Slot duration in minutes: the explicit value, else the service's
+        duration, else DEFAULT_SLOT_DURATION.
+        """
+        if slot_duration_minutes is not None:
+            return slot_duration_minutes
+        
+        if service_id is not None:
+            # Get service duration from Supabase
+            service_response = supabase_db.table("consultant_services").select("duration").eq("id", service_id).execute()
+            if service_response.data and len(service_response.data) > 0:
+                return service_response.data[0].get("duration", self.DEFAULT_SLOT_DURATION)
+        
+        return self.DEFAULT_SLOT_DURATION
+    
+    def _get_consultant_timezone(self, supabase_db, consultant_id: int) -> str:
+        """Get consultant's timezone from Supabase"""
+        consultant_response = supabase_db.table("consultants").select("timezone").eq("id", consultant_id).execute()
+        if not consultant_response.data or len(consultant_response.data) == 0:
+            raise ValueError(f"Consultant {consultant_id} not found")
+        
+        return consultant_response.data[0].get("timezone") or "America/Toronto"
+    
+    def _get_busy_times(
+        self,
+        sql_db: Session,
+        consultant_id: int,
+        range_start: datetime,
+        range_end: datetime
+    ) -> Tuple[List[ConsultantBlockedTime], List[Tuple[Booking, int]]]:
+        """
+        Get blocked times and active bookings (with their durations) between
+        range_start and range_end.
+        """
+        # Compare in UTC so the bounds don't depend on the consultant's offset
+        range_start = range_start.astimezone(timezone.utc)
+        range_end = range_end.astimezone(timezone.utc)
         
         blocked_times = crud_availability.get_consultant_blocked_times(
             db=sql_db,
             consultant_id=consultant_id,
-            start_date=start_of_day,
-            end_date=end_of_day
+            start_date=range_start,
+            end_date=range_end
         )
         
-        # Get existing bookings for this date with their duration info
-        from app.models.service_template import ServiceDurationOption
-        bookings_with_duration = sql_db.query(Booking, ServiceDurationOption.duration_minutes).outerjoin(
+        # Get existing bookings in the range with their duration info
+        bookings_with_duration = self._query_bookings_with_duration(
+            sql_db, [consultant_id], range_start, range_end
+        )
+        
+        # Build list of (booking, duration) tuples
+        bookings_info = [
+            (booking, self._booking_duration(booking, duration_minutes, service_id))
+            for booking, duration_minutes, service_id in bookings_with_duration
+        ]
+        
+        return blocked_times, bookings_info
+    
+    def _query_bookings_with_duration(
+        self,
+        sql_db: Session,
+        consultant_ids: List[int],
+        range_start: datetime,
+        range_end: datetime
+    ) -> list:
+        """
+        Active bookings starting between range_start and range_end as
+        (booking, duration_minutes, consultant_service_id) rows.
+        
+        The duration comes from the booking's duration option, falling back to
+        its service's legacy duration, resolved in the same query. Only the
+        booking columns slot calculation reads are loaded.
+        """
+        return sql_db.query(
+            Booking,
+            func.coalesce(ServiceDurationOption.duration_minutes, ConsultantService.duration),
+            ConsultantService.id
+        ).options(
+            load_only(Booking.id, Booking.consultant_id, Booking.service_id, Booking.booking_date)
+        ).outerjoin(
             ServiceDurationOption,
             Booking.duration_option_id == ServiceDurationOption.id
+        ).outerjoin(
+            ConsultantService,
+            Booking.service_id == ConsultantService.id
         ).filter(
-            Booking.consultant_id == consultant_id,
-            Booking.booking_date >= start_of_day,
-            Booking.booking_date <= end_of_day,
+            Booking.consultant_id.in_(consultant_ids),
+            Booking.booking_date >= range_start,
+            Booking.booking_date <= range_end,
             Booking.status.in_([
                 BookingStatus.pending,
                 BookingStatus.confirmed,
                 BookingStatus.rescheduled
             ])
         ).all()
+    
+    def _booking_duration(self, booking: Booking, duration_minutes: Optional[int], service_id: Optional[int]) -> int:
+        """
+        A duration resolved by _query_bookings_with_duration, else DEFAULT_SLOT_DURATION
+        (as booking_duration_minutes() in the database, which sets bookings.ends_at)
+        """
+        if duration_minutes is None:
+            reason = "its service was not found" if service_id is None else f"service {booking.service_id} has no duration"
+            availability_logger.warning(
+                f"Booking {booking.id} has no duration ({reason}); blocking {self.DEFAULT_SLOT_DURATION} minutes"
+            )
+            return self.DEFAULT_SLOT_DURATION
+        return duration_minutes
+    
+    def _get_day_starts(
+        self,
+        sql_db: Session,
+        consultant_id: int,
+        consultant_tz: str,
+        days: List[date],
+        slot_duration_minutes: int
+    ) -> Dict[date, List[datetime]]:
+        """
+        Free slot starts (consultant's timezone, past ones included) for each
+        consultant-local day, served from the slot cache where possible.
         
-        # Build list of (booking, duration) tuples
-        bookings_info = []
-        for booking, duration_minutes in bookings_with_duration:
-            if duration_minutes is None:
-                # If no duration_option, get from service default duration
-                service_response = supabase_db.table("consultant_services").select("duration").eq("id", booking.service_id).execute()
-                if not service_response.data or len(service_response.data) == 0:
-                    raise ValueError(f"Service {booking.service_id} not found for booking {booking.id}")
-                
-                duration_minutes = service_response.data[0].get("duration")
-                if duration_minutes is None:
-                    raise ValueError(f"Service {booking.service_id} has no duration set")
-            
-            bookings_info.append((booking, duration_minutes))
+        Days missing from the cache are computed together: one query each for
+        the weekly schedule, blocked times and bookings covering all of them.
+        """
+        consultant_zone = get_zone(consultant_tz)
+        # Read the generation before the database so a concurrent write can't be cached under it
+        generation = slot_generation(consultant_id)
+        
+        day_starts = {}
+        missing = []
+        for day in days:
+            cached = get_day_starts(consultant_id, generation, day, slot_duration_minutes)
+            if cached is None:
+                missing.append(day)
+            else:
+                day_starts[day] = [datetime.fromisoformat(start).replace(tzinfo=consultant_zone) for start in cached]
         
-        # Generate available slots
-        available_slots = []
+        if not missing:
+            return day_starts
         
-        for avail_slot in availability_slots:
-            # Create datetime objects in consultant's timezone
-            slot_start = datetime.combine(target_date, avail_slot.start_time).replace(tzinfo=ZoneInfo(consultant_tz))
-            slot_end = datetime.combine(target_date, avail_slot.end_time).replace(tzinfo=ZoneInfo(consultant_tz))
-            
-            # Use the slot_interval_minutes from the availability slot (e.g., 15 min)
-            # This controls how often we generate potential booking start times
-            slot_interval = avail_slot.slot_interval_minutes
-            
-            # Generate time slots within this availability window
-            current_time = slot_start
-            while current_time + timedelta(minutes=slot_duration_minutes) <= slot_end:
-                slot_end_time = current_time + timedelta(minutes=slot_duration_minutes)
-                
-                # Check if slot is available (not blocked and not booked)
-                is_available = self._is_slot_available(
-                    current_time,
-                    slot_end_time,
-                    blocked_times,
-                    bookings_info
-                )
+        # One query for the whole weekly schedule, grouped by day name
+        windows_by_day = {}
+        for avail_slot in crud_availability.get_consultant_availability(
+            db=sql_db,
+            consultant_id=consultant_id,
+            is_active=True
+        ):
+            windows_by_day.setdefault(avail_slot.day_of_week.value, []).append(avail_slot)
+        
+        scheduled = [day for day in missing if day.strftime("%A").lower() in windows_by_day]
+        availability_logger.debug(
+            f"Computing {len(missing)} day(s) for consultant {consultant_id}, {len(scheduled)} with availability"
+        )
+        
+        busy = None
+        if scheduled:
+            blocked_times, bookings_info = self._get_busy_times(
+                sql_db,
+                consultant_id,
+                datetime.combine(min(scheduled), time.min).replace(tzinfo=consultant_zone),
+                datetime.combine(max(scheduled), time.max).replace(tzinfo=consultant_zone)
+            )
+            busy = BusyIntervals.from_schedule(blocked_times, bookings_info)
+        
+        duration = timedelta(minutes=slot_duration_minutes)
+        for day in missing:
+            starts = []
+            day_windows = windows_by_day.get(day.strftime("%A").lower(), ())
+            # Busy cells are worked out once per day and shared by all of its windows
+            bitmap = DayBitmap(busy, day, consultant_zone) if day_windows else None
+            for avail_slot in day_windows:
+                # Create datetime objects in consultant's timezone
+                slot_start = datetime.combine(day, avail_slot.start_time).replace(tzinfo=consultant_zone)
+                slot_end = datetime.combine(day, avail_slot.end_time).replace(tzinfo=consultant_zone)
                 
-                if is_available:
-                    # Convert to client's timezone
-                    client_tz = ZoneInfo(client_timezone)
-                    start_client_tz = current_time.astimezone(client_tz)
-                    end_client_tz = slot_end_time.astimezone(client_tz)
-                    
-                    # Log first conversion for debugging
-                    if len(available_slots) == 0:
-                        log_timezone_conversion(
-                            consultant_tz, 
-                            client_timezone, 
-                            f"{current_time} → {start_client_tz}"
-                        )
-                    
-                    available_slots.append(AvailableSlot(
-                        start=start_client_tz,
-                        end=end_client_tz,
-                        start_consultant_tz=current_time,
-                        consultant_timezone=consultant_tz,
-                        available=True
-                    ))
+                # Use the slot_interval_minutes from the availability slot (e.g., 15 min)
+                # This controls how often we generate potential booking start times,
+                # which allows for overlapping booking opportunities
+                slot_interval = timedelta(minutes=avail_slot.slot_interval_minutes)
                 
-                # Move to next slot based on slot_interval (not slot_duration)
-                # This allows for overlapping booking opportunities
-                current_time += timedelta(minutes=slot_interval)
+                # Past starts are kept here and filtered when the day is read
+                starts.extend(bitmap.free_starts(slot_start, slot_end, duration, slot_interval, slot_start))
+            
+            day_starts[day] = starts
+            set_day_starts(
+                consultant_id, generation, day, slot_duration_minutes,
+                [start.replace(tzinfo=None).isoformat() for start in starts]
+            )
         
-        return AvailableTimeSlots(
-            date=target_date.isoformat(),
-            consultant_id=consultant_id,
-            consultant_timezone=consultant_tz,
-            client_timezone=client_timezone,
-            slots=available_slots,
-            total_slots=len(available_slots)
-        )
+        return day_starts
     
-    def _is_slot_available(
+    def _build_slots(
         self,
-        slot_start: datetime,
-        slot_end: datetime,
-        blocked_times: List[ConsultantBlockedTime],
-        bookings_info: List[Tuple[Booking, int]]
-    ) -> bool:
+        starts: List[datetime],
+        slot_duration_minutes: int,
+        consultant_tz: str,
+        client_timezone: str,
+        now: datetime
+    ) -> List[dict]:
+        """
+        AvailableSlot fields for the given starts (consultant's timezone) that
+        are not in the past, in client's timezone. Callers pass the rows to
+        AvailableTimeSlots, which validates them in one call.
         """
-        Check if a time slot is available (not blocked and not booked).
+        if not starts:
+            return []
+        
+        client_tz = get_zone(client_timezone)
+        duration = timedelta(minutes=slot_duration_minutes)
+        
+        # Where neither side's UTC offset changes, slot ends are start + duration
+        # on the client's clock; across a DST change, convert each end
+        first_start, last_end = min(starts), max(starts) + duration
+        same_offset = (
+            has_fixed_offset(first_start, last_end)
+            and has_fixed_offset(first_start.astimezone(client_tz), last_end.astimezone(client_tz))
+        )
         
-        Args:
-            slot_start: Start of the slot to check
-            slot_end: End of the slot to check
-            blocked_times: List of blocked time periods
-            bookings_info: List of (booking, duration_minutes) tuples
+        rows = []
+        for current_time in starts:
+            if current_time < now:
+                continue
+            
+            # Convert to client's timezone
+            start_client_tz = current_time.astimezone(client_tz)
+            if same_offset:
+                end_client_tz = start_client_tz + duration
+            else:
+                end_client_tz = (current_time + duration).astimezone(client_tz)
+            
+            rows.append({
+                "start": start_client_tz,
+                "end": end_client_tz,
+                "start_consultant_tz": current_time,
+                "consultant_timezone": consultant_tz,
+                "available": True
+            })
         
-        Returns:
-            True if slot is available, False otherwise
-        """
-        # Check against blocked times
-        for blocked in blocked_times:
-            if self._time_ranges_overlap(
-                slot_start, slot_end,
-                blocked.start_datetime, blocked.end_datetime
-            ):
-                return False
-        
-        # Check against existing bookings
-        for booking, booking_duration in bookings_info:
-            booking_end = booking.booking_date + timedelta(minutes=booking_duration)
-            if self._time_ranges_overlap(
-                slot_start, slot_end,
-                booking.booking_date, booking_end
-            ):
-                return False
-        
-        # Also check if slot is in the past
-        now = datetime.now(slot_start.tzinfo)
-        if slot_start < now:
-            return False
-        
-        return True
-    
-    def _time_ranges_overlap(
-        self,
-        start1: datetime,
-        end1: datetime,
-        start2: datetime,
-        end2: datetime
-    ) -> bool:
-        """Check if two time ranges overlap"""
-        return start1 < end2 and end1 > start2
+        return rows
     
     def get_consultant_weekly_schedule(
         self,
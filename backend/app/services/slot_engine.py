@@ -0,0 +1,219 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, tzinfo
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# Bitmap cells: a day is 96 quarter-hours, the smallest slot increment
+CELL = timedelta(minutes=15)
+CELLS_PER_DAY = 96
+
+
+@lru_cache(maxsize=None)
+def get_zone(key: str) -> ZoneInfo:
+    """ZoneInfo for an IANA key, looked up once per process"""
+    return ZoneInfo(key)
+
+
+def has_fixed_offset(start: datetime, end: datetime) -> bool:
+    """
+    True if the zone of start and end keeps one UTC offset from start to end,
+    with no skipped or repeated wall-clock times, so wall-clock arithmetic in
+    between matches absolute time.
+
+    Relies on zones changing offset at most once in the span (true of every
+    tz rule for spans of a day or so).
+    """
+    offset = start.utcoffset()
+    return (
+        end.utcoffset() == offset
+        and start.replace(fold=1 - start.fold).utcoffset() == offset
+        and end.replace(fold=1 - end.fold).utcoffset() == offset
+    )
+
+
+class BusyIntervals:
+    """
+    A consultant's blocked times and bookings, sorted and merged once so that
+    candidate slots can be checked with a single forward walk instead of a scan
+    over every busy period per slot.
+
+    A slot [start, end) is free when it overlaps no busy period, using the same
+    strict test as before: slot_start < busy_end and slot_end > busy_start.
+    """
+
+    def __init__(self, periods: Iterable[Tuple[datetime, datetime]]):
+        self.periods = sorted(periods)
+        starts: List[datetime] = []
+        ends: List[datetime] = []
+        for start, end in self.periods:
+            if starts and start <= ends[-1]:
+                # Overlapping or touching: no slot fits in between
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        self.starts = starts
+        self.ends = ends
+
+    @classmethod
+    def from_schedule(cls, blocked_times, bookings_info) -> "BusyIntervals":
+        """Build from ConsultantBlockedTime rows and (booking, duration_minutes) tuples"""
+        periods = [(blocked.start_datetime, blocked.end_datetime) for blocked in blocked_times]
+        periods.extend(
+            (booking.booking_date, booking.booking_date + timedelta(minutes=duration))
+            for booking, duration in bookings_info
+        )
+        return cls(periods)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """True if [start, end) overlaps any busy period (start must be before end)"""
+        # First merged period that ends after the slot starts
+        i = bisect_right(self.ends, start)
+        return i < len(self.starts) and self.starts[i] < end
+
+    def free_starts(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        duration: timedelta,
+        interval: timedelta,
+        not_before: datetime
+    ) -> Iterator[datetime]:
+        """
+        Yield the start of every free slot of the given duration, stepping by
+        interval from window_start, that fits before window_end and does not
+        start before not_before.
+        """
+        if window_start.utcoffset() != window_end.utcoffset():
+            # The window crosses a DST change, so wall-clock slots can end before
+            # they start in absolute time; check those against the raw periods
+            yield from self._scan_starts(window_start, window_end, duration, interval, not_before)
+            return
+
+        starts, ends = self.starts, self.ends
+        count = len(starts)
+        i = bisect_right(ends, window_start)
+
+        current = window_start
+        while current + duration <= window_end:
+            # Slot starts only move forward, so periods ending by now never matter again
+            while i < count and ends[i] <= current:
+                i += 1
+            if (i == count or starts[i] >= current + duration) and current >= not_before:
+                yield current
+            current += interval
+
+    def _scan_starts(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        duration: timedelta,
+        interval: timedelta,
+        not_before: datetime
+    ) -> Iterator[datetime]:
+        """free_starts checking every slot against every unmerged period"""
+        current = window_start
+        while current + duration <= window_end:
+            slot_end = current + duration
+            if current >= not_before and not any(
+                current < end and slot_end > start for start, end in self.periods
+            ):
+                yield current
+            current += interval
+
+
+@lru_cache(maxsize=1024)
+def _start_mask(first: int, last: int, step: int) -> int:
+    """Bits first, first + step, ... up to and including last"""
+    mask = 0
+    for cell in range(first, last + 1, step):
+        mask |= 1 << cell
+    return mask
+
+
+class DayBitmap:
+    """
+    One consultant-local day as 96 quarter-hour cells (bit i set when cell i
+    overlaps no busy period), built once from BusyIntervals and shared by
+    every availability window and slot duration of that day.
+
+    Slots of d cells are then found with a sliding-window AND over the bits.
+    Days with a DST change and windows, durations or intervals that are not
+    whole quarter-hours fall back to BusyIntervals.free_starts, which gives
+    the same answers.
+    """
+
+    def __init__(self, busy: BusyIntervals, day: date, zone: tzinfo):
+        self.busy = busy
+        self.day_start = datetime.combine(day, time.min).replace(tzinfo=zone)
+        next_day_start = datetime.combine(day + timedelta(days=1), time.min).replace(tzinfo=zone)
+        self.free: Optional[int] = None
+        if self.day_start.utcoffset() == next_day_start.utcoffset():
+            self.free = self._free_cells()
+
+    def _free_cells(self) -> Optional[int]:
+        busy = self.busy
+        day_end = self.day_start + CELL * CELLS_PER_DAY
+        free = (1 << CELLS_PER_DAY) - 1
+        # Merged periods that end after the day starts and start before it ends
+        first = bisect_right(busy.ends, self.day_start)
+        last = bisect_left(busy.starts, day_end)
+        for start, end in zip(busy.starts[first:last], busy.ends[first:last]):
+            if start == end and (start - self.day_start) % CELL == timedelta(0):
+                # An instant on a cell boundary blocks only slots spanning it
+                return None
+            # Every cell the period overlaps: [floor(start), ceil(end)) in cells
+            first_cell = max(0, (start - self.day_start) // CELL)
+            end_cell = min(CELLS_PER_DAY, -((self.day_start - end) // CELL))
+            if end_cell > first_cell:
+                free &= ~(((1 << (end_cell - first_cell)) - 1) << first_cell)
+        return free
+
+    def free_starts(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        duration: timedelta,
+        interval: timedelta,
+        not_before: datetime
+    ) -> Iterator[datetime]:
+        """Same as BusyIntervals.free_starts for a window on this day"""
+        offset = window_start.replace(tzinfo=None) - self.day_start.replace(tzinfo=None)
+        if (
+            self.free is None
+            or offset % CELL or duration % CELL or interval % CELL
+            or duration <= timedelta(0) or interval <= timedelta(0)
+        ):
+            yield from self.busy.free_starts(window_start, window_end, duration, interval, not_before)
+            return
+
+        width = duration // CELL
+        first = offset // CELL
+        # Slots must end by the window's end (and the day's)
+        end_cell = min(CELLS_PER_DAY, (window_end.replace(tzinfo=None) - self.day_start.replace(tzinfo=None)) // CELL)
+        last = end_cell - width
+        if not_before > window_start:
+            # First start on the interval grid that is not before not_before
+            step = interval // CELL
+            behind = -((window_start - not_before) // CELL)
+            first += -(-behind // step) * step
+        if first > last:
+            return
+
+        # Bit i of runs is set when cells i .. i + width - 1 are all free
+        runs, run_width = self.free, 1
+        while run_width < width:
+            shift = min(run_width, width - run_width)
+            runs &= runs >> shift
+            run_width += shift
+
+        starts = runs & _start_mask(first, last, interval // CELL)
+        while starts:
+            lowest = starts & -starts
+            yield self.day_start + CELL * (lowest.bit_length() - 1)
+            starts ^= lowest
@@ -1,11 +1,30 @@
 import io
+import time
 import uuid
-from typing import Optional, BinaryIO
+from typing import Dict, List, Optional, BinaryIO
 from fastapi import UploadFile, HTTPException
 from supabase import Client
+from app.core.config import settings
 from app.db.supabase import get_supabase
+from app.utils.cache import build_cache
 import mimetypes
 
+# file path -> {str(expires_in): [signed URL, reusable until (epoch seconds)]}, each URL
+# kept until a safety margin before it expires; one entry per path so a delete drops them all
+signed_url_cache = build_cache(
+    "signed_urls",
+    max_entries=settings.SIGNED_URL_CACHE_MAX_ENTRIES,
+    ttl_seconds=3600 - settings.SIGNED_URL_EXPIRY_MARGIN_SECONDS,
+)
+
+def _cache_signed_url(file_path: str, expires_in: int, signed_url: str, reuse_seconds: float) -> None:
+    now = time.time()
+    variants = {
+        key: variant for key, variant in (signed_url_cache.get(file_path) or {}).items() if variant[1] > now
+    }
+    variants[str(expires_in)] = [signed_url, now + reuse_seconds]
+    signed_url_cache.set(file_path, variants, max(variant[1] for variant in variants.values()) - now)
+
 class StorageService:
     def __init__(self):
         self.supabase: Client = get_supabase()
@@ -126,31 +145,75 @@ class StorageService:
         Returns:
             Signed URL for file access
         """
-        try:
-            print(f"Creating signed URL for file: {file_path} in bucket: {self.bucket_name}")
-            
-            response = self.supabase.storage.from_(self.bucket_name).create_signed_url(
-                path=file_path,
-                expires_in=expires_in
+        signed_url = self.get_file_urls([file_path], expires_in=expires_in).get(file_path)
+        if signed_url is None:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error getting file URL: {file_path} could not be signed"
             )
+        return signed_url
+    
+    def get_file_urls(self, file_paths: List[str], expires_in: int = 3600) -> Dict[str, str]:
+        """
+        Get signed URLs for many files with one storage call
+        
+        URLs still valid for more than SIGNED_URL_EXPIRY_MARGIN_SECONDS come from
+        signed_url_cache, so only the rest are signed (no call when all are cached).
+        
+        Args:
+            file_paths: Paths to files in storage
+            expires_in: URL expiration time in seconds (default 1 hour)
             
-            print(f"Signed URL response: {response}")
-            
-            if 'signedURL' in response:
-                return response['signedURL']
+        Returns:
+            Signed URL per file path; paths storage could not sign are left out
+        """
+        signed_urls = {}
+        unsigned = []
+        now = time.time()
+        for file_path in dict.fromkeys(file_paths):
+            cached = (signed_url_cache.get(file_path) or {}).get(str(expires_in))
+            if cached is not None and cached[1] > now:
+                signed_urls[file_path] = cached[0]
             else:
-                print(f"No signedURL in response: {response}")
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to generate file URL. Response: {response}"
-                )
-                
+                unsigned.append(file_path)
+        if not unsigned:
+            return signed_urls
+        
+        bucket = self.supabase.storage.from_(self.bucket_name)
+        try:
+            response = bucket.create_signed_urls(unsigned, expires_in)
+        except (AttributeError, TypeError) as e:
+            # storage3 fails the whole batch on the null signedURL of a missing file,
+            # so sign the paths one at a time and leave out the ones that fail
+            print(f"⚠️ StorageService: Batch signing failed ({str(e)}), signing {len(unsigned)} URLs one at a time")
+            response = self._sign_each(bucket, unsigned, expires_in)
         except Exception as e:
-            print(f"Error creating signed URL: {str(e)}")
+            print(f"❌ StorageService: Error creating {len(unsigned)} signed URLs: {str(e)}")
             raise HTTPException(
                 status_code=500,
-                detail=f"Error getting file URL: {str(e)}"
+                detail=f"Error getting file URLs: {str(e)}"
             )
+        
+        reuse_seconds = expires_in - settings.SIGNED_URL_EXPIRY_MARGIN_SECONDS
+        for item in response:
+            if item.get("error") or not item.get("signedURL"):
+                print(f"⚠️ StorageService: Could not sign {item.get('path')}: {item.get('error')}")
+                continue
+            signed_urls[item["path"]] = item["signedURL"]
+            if reuse_seconds > 0:
+                _cache_signed_url(item["path"], expires_in, item["signedURL"], reuse_seconds)
+        return signed_urls
+    
+    def _sign_each(self, bucket, file_paths: List[str], expires_in: int) -> List[Dict[str, Optional[str]]]:
+        """create_signed_urls result shape, one storage call per path"""
+        items = []
+        for file_path in file_paths:
+            try:
+                signed_url = bucket.create_signed_url(file_path, expires_in)["signedURL"]
+                items.append({"path": file_path, "signedURL": signed_url, "error": None})
+            except Exception as e:
+                items.append({"path": file_path, "signedURL": None, "error": str(e)})
+        return items
     
     def get_public_url(self, file_path: str) -> str:
         """
@@ -190,6 +253,8 @@ class StorageService:
         Returns:
             True if successful
         """
+        # Stop handing out signed URLs, of any expiry, for a file that is gone
+        signed_url_cache.delete(file_path)
         try:
             response = self.supabase.storage.from_(self.bucket_name).remove([file_path])
             return response.status_code == 200
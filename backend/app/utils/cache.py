@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Union
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Small thread-safe, per-worker LRU cache whose entries expire after a fixed TTL.
+
+    Used for hot lookups that tolerate slightly stale data. Anything that must be
+    shared between workers belongs in the database (or Redis), not here.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Remove every entry for which predicate(key, value) is true"""
+        with self._lock:
+            stale = [key for key, (value, _) in self._entries.items() if predicate(key, value)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Same interface as RedisCache, for code that may run against either backend
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        return self.get(key, default)
+
+    async def aset(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        self.set(key, value, ttl_seconds)
+
+
+class RedisCache:
+    """
+    JSON values in Redis under "<namespace>:<key>", shared by every worker.
+
+    Sync methods are for threadpool code (CRUD writes invalidating entries); async
+    ones for `async def` endpoints. Redis errors are logged and treated as misses,
+    so an unavailable Redis degrades to querying the database.
+    """
+
+    def __init__(self, url: str, namespace: str, ttl_seconds: float):
+        import redis
+        import redis.asyncio
+
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self._client = redis.Redis.from_url(url)
+        self._async_client = redis.asyncio.Redis.from_url(url)
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _ttl(self, ttl_seconds: Optional[float]) -> int:
+        return max(1, int(self.ttl_seconds if ttl_seconds is None else ttl_seconds))
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            raw = self._client.get(self._key(key))
+        except Exception as e:
+            print(f"⚠️ Redis get failed for {self._key(key)}: {str(e)}")
+            return default
+        return default if raw is None else json.loads(raw)
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        try:
+            self._client.set(self._key(key), json.dumps(value, default=str), ex=self._ttl(ttl_seconds))
+        except Exception as e:
+            print(f"⚠️ Redis set failed for {self._key(key)}: {str(e)}")
+
+    def delete(self, key: Hashable) -> None:
+        try:
+            self._client.delete(self._key(key))
+        except Exception as e:
+            print(f"⚠️ Redis delete failed for {self._key(key)}: {str(e)}")
+
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            raw = await self._async_client.get(self._key(key))
+        except Exception as e:
+            print(f"⚠️ Redis get failed for {self._key(key)}: {str(e)}")
+            return default
+        return default if raw is None else json.loads(raw)
+
+    async def aset(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        try:
+            await self._async_client.set(self._key(key), json.dumps(value, default=str), ex=self._ttl(ttl_seconds))
+        except Exception as e:
+            print(f"⚠️ Redis set failed for {self._key(key)}: {str(e)}")
+
+
+def build_cache(namespace: str, *, max_entries: int, ttl_seconds: float) -> Union[TTLCache, RedisCache]:
+    """Redis when settings.REDIS_URL is configured, otherwise a per-worker TTLCache"""
+    from app.core.config import settings
+
+    if settings.REDIS_URL:
+        return RedisCache(settings.REDIS_URL, namespace, ttl_seconds)
+    return TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
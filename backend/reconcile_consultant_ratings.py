@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+"""
+Repair drift in the stored consultant rating aggregates (rating, review_count, rating_sum).
+
+Reviews created through the API keep the aggregates current; this job catches
+reviews edited or deleted directly in the database. Safe to run on a schedule.
+"""
+
+import os
+import sys
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from app.crud.crud_consultant import consultant as crud_consultant
+from app.db.supabase import get_supabase_admin
+
+def main():
+    print("🔧 Reconciling Consultant Rating Aggregates")
+    print("=" * 45)
+
+    try:
+        supabase = get_supabase_admin()
+        repaired = crud_consultant.reconcile_rating_aggregates(supabase)
+        if repaired:
+            print(f"✅ Repaired rating aggregates for {repaired} consultant(s)")
+        else:
+            print("✅ All rating aggregates are consistent")
+    except Exception as e:
+        print(f"❌ Reconciliation failed: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
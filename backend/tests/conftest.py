@@ -0,0 +1,24 @@
+"""
+Shared pytest setup.
+
+Unit tests and benchmarks must be runnable without a .env file, so placeholder
+values are provided for the required settings when none is present. A real
+.env (used by the integration tests) always takes precedence.
+"""
+import os
+
+if not os.path.exists(".env"):
+    for key, value in {
+        "SUPABASE_URL": "https://example.supabase.co",
+        "SUPABASE_ANON_KEY": "test.anon.key",
+        "SUPABASE_SERVICE_ROLE_KEY": "test.service.key",
+        "DATABASE_URL": "sqlite://",
+        "SECRET_KEY": "test-secret-key",
+        "FRONTEND_URL": "http://localhost:3000",
+        "SMTP_TLS": "true",
+        "SMTP_PORT": "587",
+        "SMTP_HOST": "localhost",
+        "SMTP_USER": "test",
+        "SMTP_PASSWORD": "test",
+    }.items():
+        os.environ.setdefault(key, value)
@@ -0,0 +1,288 @@
+"""
+In-memory stand-in for the Supabase/PostgREST clients used by the CRUD layer.
+
+Supports the subset of the query builder the CRUD modules use (select, eq,
+lt/lte/gt/gte, in_, contains, like, ilike, filter, or_, range, order, limit,
+insert, update, delete) over plain lists of dicts, including embedded
+resources ("alias:table(...)") for the relationships in RELATIONSHIPS (column
+lists are not projected), plus rpc() calls to Python stand-ins registered in
+`functions`, and records every executed query so tests can count database
+round trips. `triggers` ({table: fn(db, row)}) run before each row is inserted
+or updated, with the new row, and may raise like a database trigger.
+An optional per-query delay simulates network latency for benchmarks.
+"""
+import json
+import operator
+import re
+import time
+from types import SimpleNamespace
+
+COMPARISONS = {
+    "eq": operator.eq, "neq": operator.ne,
+    "lt": operator.lt, "lte": operator.le, "gt": operator.gt, "gte": operator.ge,
+}
+
+
+def _like_to_regex(pattern):
+    """SQL LIKE pattern (backslash escapes) -> regular expression"""
+    regex, chars = "", iter(pattern)
+    for char in chars:
+        if char == "\\":
+            regex += re.escape(next(chars, ""))
+        elif char == "%":
+            regex += ".*"
+        elif char == "_":
+            regex += "."
+        else:
+            regex += re.escape(char)
+    return regex
+
+
+# (table, embedded table) -> (local column, embedded table column, "many" | "one")
+RELATIONSHIPS = {
+    ("consultant_services", "consultant_service_pricing"): ("id", "consultant_service_id", "many"),
+    ("consultant_service_pricing", "service_duration_options"): ("duration_option_id", "id", "one"),
+    ("bookings", "booking_documents"): ("id", "booking_id", "many"),
+    ("bookings", "service_duration_options"): ("duration_option_id", "id", "one"),
+}
+
+
+def _split_top_level(spec):
+    """'*, a:b(*, c(*))' -> ['*', 'a:b(*, c(*))']"""
+    parts, depth, current = [], 0, ""
+    for char in spec:
+        if char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        depth += (char == "(") - (char == ")")
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def _parse_select(spec):
+    """Embedded resources of a select string: [(alias, table, inner select string)]"""
+    embeds = []
+    for part in _split_top_level(spec):
+        match = re.fullmatch(r"(?:(\w+):)?(\w+)(?:!\w+)?\((.*)\)", part, re.DOTALL)
+        if match:
+            alias, table, inner = match.groups()
+            embeds.append((alias or table, table, inner))
+    return embeds
+
+
+def _coerce(criteria, like):
+    """PostgREST sends every filter value as text; compare it as the row's type"""
+    if isinstance(criteria, str) and isinstance(like, (int, float)) and not isinstance(like, bool):
+        return type(like)(criteria)
+    return criteria
+
+
+def _split_or(filters):
+    """'a.lt."x,y",id.lt.5' -> [('a', 'lt', 'x,y'), ('id', 'lt', '5')]"""
+    terms = re.findall(r'([^,.]+)\.([a-z]+)\.("[^"]*"|[^,]*)', filters)
+    return [(column, op, value[1:-1] if value.startswith('"') else value) for column, op, value in terms]
+
+
+class FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.filters = []
+        self.operation = "select"
+        self.payload = None
+        self.offset = 0
+        self.row_limit = None
+        self.order_by = None
+        self.columns = "*"
+        self.embedded_filters = {}
+
+    def select(self, *columns, **kwargs):
+        self.columns = ",".join(columns) or "*"
+        return self
+
+    def insert(self, payload):
+        self.operation, self.payload = "insert", payload
+        return self
+
+    def update(self, payload):
+        self.operation, self.payload = "update", payload
+        return self
+
+    def delete(self):
+        self.operation = "delete"
+        return self
+
+    def eq(self, column, value):
+        if "." in column:
+            # "alias.column" filters the embedded rows, not the parent rows
+            alias, column = column.split(".", 1)
+            self.embedded_filters.setdefault(alias, []).append(lambda row: row.get(column) == value)
+            return self
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def filter(self, column, op, criteria):
+        if op == "cs":
+            return self.contains(column, criteria)
+        if op in ("like", "ilike"):
+            return getattr(self, op)(column, criteria)
+        compare = COMPARISONS[op]
+        self.filters.append(
+            lambda row: row.get(column) is not None and compare(row[column], _coerce(criteria, row[column]))
+        )
+        return self
+
+    def lt(self, column, value):
+        return self.filter(column, "lt", value)
+
+    def lte(self, column, value):
+        return self.filter(column, "lte", value)
+
+    def gt(self, column, value):
+        return self.filter(column, "gt", value)
+
+    def gte(self, column, value):
+        return self.filter(column, "gte", value)
+
+    def or_(self, filters):
+        terms = [(column, COMPARISONS[op], value) for column, op, value in _split_or(filters)]
+        self.filters.append(lambda row: any(
+            row.get(column) is not None and compare(row[column], _coerce(value, row[column]))
+            for column, compare, value in terms
+        ))
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def contains(self, column, value):
+        values = json.loads(value) if isinstance(value, str) else list(value)
+        self.filters.append(lambda row: all(v in (row.get(column) or []) for v in values))
+        return self
+
+    def like(self, column, pattern, flags=0):
+        regex = re.compile(_like_to_regex(pattern), flags | re.DOTALL)
+        self.filters.append(lambda row: row.get(column) is not None and regex.fullmatch(row[column]) is not None)
+        return self
+
+    def ilike(self, column, pattern):
+        return self.like(column, pattern, re.IGNORECASE)
+
+    def range(self, start, end):
+        self.offset, self.row_limit = start, end - start + 1
+        return self
+
+    def limit(self, size):
+        self.row_limit = size
+        return self
+
+    def order(self, column, desc=False):
+        # "created_at.desc,id" style multi-column orders; `desc` applies to the last column
+        self.order_by = []
+        parts = column.split(",")
+        for position, part in enumerate(parts):
+            name, _, direction = part.partition(".")
+            self.order_by.append((name, direction == "desc" if position < len(parts) - 1 else desc))
+        return self
+
+    def _embed(self, row, table, spec, path=""):
+        for alias, embedded_table, inner in _parse_select(spec):
+            relationship = RELATIONSHIPS.get((table, embedded_table))
+            if relationship is None:
+                continue
+            local, foreign, cardinality = relationship
+            filters = self.embedded_filters.get(path + alias, [])
+            related = [
+                self._embed(dict(child), embedded_table, inner, f"{path}{alias}.")
+                for child in self.db.rows.get(embedded_table, [])
+                if child.get(foreign) == row.get(local) and all(f(child) for f in filters)
+            ]
+            row[alias] = related if cardinality == "many" else (related[0] if related else None)
+        return row
+
+    def _run_trigger(self, row):
+        trigger = self.db.triggers.get(self.table)
+        if trigger is not None:
+            trigger(self.db, row)
+
+    def _matches(self):
+        return [row for row in self.db.rows.setdefault(self.table, []) if all(f(row) for f in self.filters)]
+
+    def execute(self):
+        self.db.queries.append((self.operation, self.table))
+        if self.db.latency:
+            time.sleep(self.db.latency)
+
+        if self.operation == "insert":
+            payloads = self.payload if isinstance(self.payload, list) else [self.payload]
+            inserted = []
+            for payload in payloads:
+                row = {"id": self.db.next_id(self.table), **payload}
+                self._run_trigger(row)
+                self.db.rows[self.table].append(row)
+                inserted.append(dict(row))
+            return SimpleNamespace(data=inserted)
+
+        rows = self._matches()
+        if self.operation == "update":
+            for row in rows:
+                self._run_trigger({**row, **self.payload})
+                row.update(self.payload)
+        elif self.operation == "delete":
+            self.db.rows[self.table] = [row for row in self.db.rows[self.table] if row not in rows]
+        else:
+            for column, desc in reversed(self.order_by or []):
+                rows = sorted(rows, key=lambda row: row.get(column), reverse=desc)
+            end = None if self.row_limit is None else self.offset + self.row_limit
+            rows = rows[self.offset:end]
+        return SimpleNamespace(data=[self._embed(dict(row), self.table, self.columns) for row in rows])
+
+
+class FakeRpc:
+    def __init__(self, db, name, params):
+        self.db = db
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        self.db.queries.append(("rpc", self.name))
+        if self.db.latency:
+            time.sleep(self.db.latency)
+        return SimpleNamespace(data=self.db.functions[self.name](self.db, self.params))
+
+
+class FakeAsyncQuery(FakeQuery):
+    async def execute(self):
+        return super().execute()
+
+
+class FakeSupabase:
+    """
+    Stand-in for supabase.Client over `rows` ({table: [row, ...]}).
+    `aio` is the AsyncPostgrestClient view over the same rows and query log.
+    """
+
+    def __init__(self, rows=None, latency: float = 0.0, functions=None, triggers=None):
+        self.rows = rows if rows is not None else {}
+        self.queries = []
+        self.latency = latency
+        self.functions = functions or {}
+        self.triggers = triggers or {}
+        self.aio = SimpleNamespace(table=lambda name: FakeAsyncQuery(self, name))
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return FakeRpc(self, name, params)
+
+    def next_id(self, table):
+        return max((row.get("id", 0) for row in self.rows.setdefault(table, [])), default=0) + 1
+
+    def round_trips(self, table=None):
+        return sum(1 for _, queried in self.queries if table is None or queried == table)
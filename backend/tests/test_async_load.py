@@ -0,0 +1,119 @@
+"""
+Load test: sync vs async endpoints under concurrent requests.
+
+A local HTTP server stands in for PostgREST with a fixed response latency.
+The same query (a consultant's active services) is served by the async
+endpoint and by the equivalent sync endpoint, and both are hit with a burst
+of concurrent requests through the ASGI app. Sync handlers are capped by
+FastAPI's threadpool; async handlers only by the HTTP connection pool.
+"""
+import asyncio
+import multiprocessing
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from supabase import Client
+
+from app.api import deps
+from app.api.api_v1.endpoints import consultants
+from app.core.config import settings
+from app.crud import crud_consultant
+from app.db.supabase import supabase_registry
+
+# Latency is high relative to per-request CPU cost so the test stays
+# latency-bound even when client, app and server share a single core
+SIMULATED_POSTGREST_LATENCY = 0.4  # seconds
+CONCURRENT_REQUESTS = 200
+
+
+class _SlowPostgrestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(SIMULATED_POSTGREST_LATENCY)
+        body = b'[{"id": 1, "consultant_id": 1, "name": "Express Entry", "is_active": true}]'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _SlowPostgrestServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(consultants.router, prefix="/consultants")
+
+    @app.get("/sync/consultants/{consultant_id}/services/active")
+    def sync_active_services(consultant_id: int, db: Client = Depends(deps.get_db)):
+        """The same endpoint as it was before moving to the async repository"""
+        return crud_consultant.get_services_by_consultant(db=db, consultant_id=consultant_id, active_only=True)
+
+    return app
+
+
+def _serve(port_queue):
+    server = _SlowPostgrestServer(("127.0.0.1", 0), _SlowPostgrestHandler)
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+@pytest.fixture
+def slow_supabase(monkeypatch):
+    # Separate process, so the stand-in server does not compete with the app for the GIL
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_serve, args=(port_queue,), daemon=True)
+    server.start()
+    monkeypatch.setattr(settings, "SUPABASE_URL", f"http://127.0.0.1:{port_queue.get(timeout=10)}")
+    monkeypatch.setattr(settings, "SUPABASE_POOL_MAX_CONNECTIONS", CONCURRENT_REQUESTS)
+    supabase_registry.clear()
+    asyncio.run(supabase_registry.aclose())
+    yield
+    supabase_registry.clear()
+    server.terminate()
+    server.join()
+
+
+async def run_burst(path: str) -> float:
+    """Send CONCURRENT_REQUESTS requests at once, return requests per second"""
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get(path)  # warm up the pools
+        started = time.perf_counter()
+        responses = await asyncio.gather(*[client.get(path) for _ in range(CONCURRENT_REQUESTS)])
+        elapsed = time.perf_counter() - started
+    assert all(response.status_code == 200 for response in responses)
+    assert responses[0].json()[0]["name"] == "Express Entry"
+    return CONCURRENT_REQUESTS / elapsed
+
+
+class TestAsyncEndpointLoad:
+    """Async endpoints keep more requests in flight per worker"""
+
+    def test_async_endpoint_throughput(self, slow_supabase):
+        async def scenario():
+            try:
+                sync_rps = await run_burst("/sync/consultants/1/services/active")
+                async_rps = await run_burst("/consultants/1/services/active")
+            finally:
+                await supabase_registry.aclose()
+            return sync_rps, async_rps
+
+        sync_rps, async_rps = asyncio.run(scenario())
+
+        print(f"\n📊 {CONCURRENT_REQUESTS} concurrent requests, {SIMULATED_POSTGREST_LATENCY * 1000:.0f}ms PostgREST latency")
+        print(f"   sync def endpoint:  {sync_rps:8.1f} req/s")
+        print(f"   async def endpoint: {async_rps:8.1f} req/s ({async_rps / sync_rps:.1f}x)")
+        assert async_rps > sync_rps * 1.5
+        print("✅ Async endpoint sustains higher throughput")
@@ -0,0 +1,201 @@
+"""
+Tests and benchmark for Supabase access token verification.
+
+Compares the "remote" mode (one Supabase Auth call per request) with the
+"local" mode (in-process JWT verification with periodic revocation checks).
+The Supabase Auth client is replaced by a stand-in with a simulated round trip
+so the comparison runs without network access.
+"""
+import asyncio
+import base64
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from jose import jwt, JWTError
+
+from app.api import deps
+from app.core import security
+from app.core.config import settings
+
+JWT_SECRET = "benchmark-jwt-secret"
+USER_ID = "9b2f4c1e-0000-4000-8000-000000000001"
+SIMULATED_AUTH_ROUND_TRIP = 0.002  # seconds
+
+
+class StubAuthClient:
+    """Stand-in for supabase.Client exposing auth.get_user with a simulated round trip"""
+
+    def __init__(self, revoked: bool = False):
+        self.calls = 0
+        self.revoked = revoked
+        self.auth = SimpleNamespace(get_user=self._get_user)
+
+    def _get_user(self, token):
+        self.calls += 1
+        time.sleep(SIMULATED_AUTH_ROUND_TRIP)
+        if self.revoked:
+            raise Exception("Session not found")
+        return SimpleNamespace(user=SimpleNamespace(
+            id=USER_ID,
+            email="client@example.com",
+            user_metadata={"full_name": "Test Client", "role": "client"},
+            email_confirmed_at="2025-01-01T00:00:00Z",
+        ))
+
+
+def make_token(session_id: str = "session-1", **overrides) -> str:
+    claims = {
+        "sub": USER_ID,
+        "aud": "authenticated",
+        "exp": datetime.now(timezone.utc) + timedelta(hours=1),
+        "email": "client@example.com",
+        "session_id": session_id,
+        "user_metadata": {"full_name": "Test Client", "role": "client", "email_verified": True},
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, JWT_SECRET, algorithm="HS256")
+
+
+@pytest.fixture
+def local_mode(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_VERIFICATION_MODE", "local")
+    monkeypatch.setattr(settings, "SUPABASE_JWT_SECRET", JWT_SECRET)
+    monkeypatch.setattr(settings, "AUTH_REVOCATION_CHECK_SECONDS", 300)
+    deps._session_checked_at.clear()
+    yield
+    deps._session_checked_at.clear()
+
+
+class TestLocalTokenVerification:
+    """Local JWT verification returns the same user dict as Supabase Auth"""
+
+    def test_same_user_dict_in_both_modes(self, local_mode, monkeypatch):
+        token = make_token()
+        local_user = deps.resolve_user_from_token(token, StubAuthClient)
+
+        monkeypatch.setattr(settings, "AUTH_VERIFICATION_MODE", "remote")
+        remote_user = deps.resolve_user_from_token(token, StubAuthClient)
+
+        assert local_user == remote_user
+
+    def test_revocation_checked_once_per_interval(self, local_mode):
+        client = StubAuthClient()
+        token = make_token()
+        for _ in range(50):
+            deps.resolve_user_from_token(token, lambda: client)
+        assert client.calls == 1, "Only the first request of a session should reach Supabase Auth"
+
+    def test_revoked_session_is_rejected(self, local_mode):
+        with pytest.raises(Exception):
+            deps.resolve_user_from_token(make_token(), lambda: StubAuthClient(revoked=True))
+        assert "session-1" not in deps._session_checked_at
+
+    def test_invalid_signature_rejected_without_remote_call(self, local_mode):
+        client = StubAuthClient()
+        forged = jwt.encode({"sub": USER_ID, "aud": "authenticated"}, "wrong-secret", algorithm="HS256")
+        with pytest.raises(JWTError):
+            deps.resolve_user_from_token(forged, lambda: client)
+        assert client.calls == 0
+
+    def test_expired_token_rejected(self, local_mode):
+        expired = make_token(exp=datetime.now(timezone.utc) - timedelta(minutes=1))
+        with pytest.raises(JWTError):
+            deps.resolve_user_from_token(expired, StubAuthClient)
+
+    def test_wrong_audience_rejected(self, local_mode):
+        with pytest.raises(JWTError):
+            deps.resolve_user_from_token(make_token(aud="anon"), StubAuthClient)
+
+
+def unsigned_token(kid: str) -> str:
+    """An RS256-looking token with a made-up key id, as an attacker would send"""
+    header = base64.urlsafe_b64encode(json.dumps({"alg": "RS256", "kid": kid}).encode()).decode().rstrip("=")
+    return f"{header}.e30.c2lnbmF0dXJl"
+
+
+class TestSigningKeyRefresh:
+    """Unknown key ids cannot force a JWKS fetch per token"""
+
+    @pytest.fixture
+    def jwks_fetches(self, monkeypatch):
+        fetches = []
+
+        def fetch(url, timeout):
+            fetches.append(url)
+            return SimpleNamespace(raise_for_status=lambda: None, json=lambda: {"keys": [{"kid": "current"}]})
+        monkeypatch.setattr(security.httpx, "get", fetch)
+        monkeypatch.setattr(security, "_jwks_cache", {"keys": None, "fetched_at": 0.0, "attempted_at": None})
+        return fetches
+
+    def test_unknown_kids_refresh_once_per_interval(self, local_mode, jwks_fetches, monkeypatch):
+        for index in range(50):
+            with pytest.raises(JWTError):
+                deps.resolve_user_from_token(unsigned_token(f"junk-{index}"), StubAuthClient)
+        assert len(jwks_fetches) == 1
+
+        # Once the interval has passed, a miss may refresh again
+        monkeypatch.setitem(security._jwks_cache, "fetched_at", time.monotonic() - security.JWKS_MIN_REFRESH_SECONDS)
+        monkeypatch.setitem(security._jwks_cache, "attempted_at", time.monotonic() - security.JWKS_MIN_REFRESH_SECONDS)
+        with pytest.raises(JWTError):
+            deps.resolve_user_from_token(unsigned_token("junk-late"), StubAuthClient)
+        assert len(jwks_fetches) == 2
+
+    def test_async_decoding_leaves_the_event_loop_free(self, local_mode, jwks_fetches, monkeypatch):
+        def slow_fetch(url, timeout):
+            time.sleep(0.2)
+            jwks_fetches.append(url)
+            return SimpleNamespace(raise_for_status=lambda: None, json=lambda: {"keys": []})
+        monkeypatch.setattr(security.httpx, "get", slow_fetch)
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+            task = asyncio.create_task(ticker())
+            with pytest.raises(JWTError):
+                await deps.resolve_user_from_token_async(unsigned_token("junk"))
+            task.cancel()
+            return ticks
+
+        # The loop kept running while the JWKS fetch was in flight
+        assert asyncio.run(scenario()) >= 5
+        assert len(jwks_fetches) == 1
+
+
+class TestAuthVerificationBenchmark:
+    """Per-request authentication cost: remote vs local verification"""
+
+    REQUESTS = 200
+
+    def _time_requests(self, client) -> float:
+        token = make_token()
+        start = time.perf_counter()
+        for _ in range(self.REQUESTS):
+            deps.resolve_user_from_token(token, lambda: client)
+        return (time.perf_counter() - start) / self.REQUESTS
+
+    def test_local_mode_is_faster_than_remote(self, local_mode, monkeypatch):
+        local_client = StubAuthClient()
+        local_per_request = self._time_requests(local_client)
+
+        monkeypatch.setattr(settings, "AUTH_VERIFICATION_MODE", "remote")
+        remote_client = StubAuthClient()
+        remote_per_request = self._time_requests(remote_client)
+
+        print(
+            f"\n✅ Auth verification over {self.REQUESTS} requests "
+            f"(simulated Supabase Auth round trip {SIMULATED_AUTH_ROUND_TRIP * 1000:.1f} ms):\n"
+            f"   remote: {remote_per_request * 1000:.3f} ms/request, {remote_client.calls} Auth calls\n"
+            f"   local:  {local_per_request * 1000:.3f} ms/request, {local_client.calls} Auth calls"
+        )
+
+        assert remote_client.calls == self.REQUESTS
+        assert local_client.calls == 1
+        assert local_per_request < remote_per_request
@@ -0,0 +1,198 @@
+"""
+Availability engine benchmarks against stored baselines.
+
+Synthetic consultants across the Canada/India timezones get weekday schedules,
+blocked days and dense bookings in SQLite. Each scenario records the median
+latency, peak traced memory and SQL query count of one call and compares them
+with its baseline in tests/availability_benchmark_baselines.json:
+
+- queries must match exactly, always
+- peak memory may grow by MEMORY_TOLERANCE and latency by LATENCY_TOLERANCE;
+  these depend on the machine, so they are only checked when asked for:
+
+    CHECK_AVAILABILITY_TIMINGS=1 pytest tests/test_availability_benchmarks.py
+
+After an intended change, rewrite the baselines with:
+
+    UPDATE_AVAILABILITY_BASELINES=1 pytest tests/test_availability_benchmarks.py
+"""
+import json
+import os
+import random
+import statistics
+import time as timer
+import tracemalloc
+from datetime import datetime, time, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import text
+
+from app.crud.slot_cache import slot_cache
+from app.models.availability import ConsultantAvailability, ConsultantBlockedTime, DayOfWeek
+from app.models.booking import Booking, BookingStatus
+from app.models.consultant import ConsultantService, ConsultantServicePricing
+from app.models.service_template import ServiceDurationOption
+from app.services.availability_service import availability_service
+from tests.supabase_fake import FakeSupabase
+from tests.test_availability_range import CLIENT_ID, first_monday_after, sql_db  # noqa: F401
+
+BASELINES_PATH = Path(__file__).with_name("availability_benchmark_baselines.json")
+UPDATE_BASELINES = os.environ.get("UPDATE_AVAILABILITY_BASELINES") == "1"
+CHECK_TIMINGS = os.environ.get("CHECK_AVAILABILITY_TIMINGS") == "1"
+LATENCY_TOLERANCE = 2.5
+MEMORY_TOLERANCE = 1.25
+RUNS = 15
+
+TIMEZONES = ["America/Toronto", "America/Vancouver", "America/Edmonton", "America/Winnipeg",
+             "America/Halifax", "America/St_Johns", "Asia/Kolkata"]
+CONSULTANTS = 70
+TEMPLATE_ID = 1
+MEASURED_CONSULTANT = 7  # Asia/Kolkata, seen from Toronto
+CLIENT_TZ = "America/Toronto"
+WEEKDAYS = [DayOfWeek.monday, DayOfWeek.tuesday, DayOfWeek.wednesday, DayOfWeek.thursday, DayOfWeek.friday]
+
+
+def seed_benchmark(sql_db, first_day, days: int = 42) -> FakeSupabase:
+    """Weekday morning and afternoon windows, a blocked day a fortnight and about half the hours booked"""
+    rng = random.Random(2026)
+    sql_db.add(ServiceDurationOption(id=1, service_template_id=TEMPLATE_ID, duration_minutes=30,
+                                     duration_label="30 Mins", min_price=50, max_price=300))
+    sql_db.add(ServiceDurationOption(id=2, service_template_id=TEMPLATE_ID, duration_minutes=60,
+                                     duration_label="1 Hour", min_price=50, max_price=300))
+    consultants = []
+    for consultant_id in range(1, CONSULTANTS + 1):
+        tz = TIMEZONES[consultant_id % len(TIMEZONES)]
+        zone = ZoneInfo(tz)
+        consultants.append({"id": consultant_id, "timezone": tz})
+        sql_db.execute(text("INSERT INTO consultants VALUES (:id, :name, :tz, 1)"),
+                       {"id": consultant_id, "name": f"Consultant {consultant_id}", "tz": tz})
+        service_id = consultant_id * 10
+        sql_db.add(ConsultantService(id=service_id, consultant_id=consultant_id, service_template_id=TEMPLATE_ID,
+                                     name="Express Entry", duration=45, price=100))
+        sql_db.add(ConsultantServicePricing(consultant_service_id=service_id, duration_option_id=1, price=80))
+        sql_db.add(ConsultantServicePricing(consultant_service_id=service_id, duration_option_id=2, price=140))
+
+        working_days = WEEKDAYS + ([DayOfWeek.saturday] if consultant_id % 3 == 0 else [])
+        for day in working_days:
+            for start, end in ((time(9), time(12, 30)), (time(13, 30), time(18))):
+                sql_db.add(ConsultantAvailability(consultant_id=consultant_id, day_of_week=day, start_time=start,
+                                                  end_time=end, timezone=tz, slot_interval_minutes=15))
+
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            if offset % 14 == consultant_id % 14:
+                sql_db.add(ConsultantBlockedTime(
+                    consultant_id=consultant_id, reason="Personal day",
+                    start_datetime=datetime.combine(day, time.min).replace(tzinfo=zone).astimezone(timezone.utc),
+                    end_datetime=datetime.combine(day + timedelta(days=1), time.min).replace(tzinfo=zone).astimezone(timezone.utc),
+                ))
+                continue
+            for hour in range(9, 18):
+                if rng.random() < 0.5:
+                    starts_at = datetime.combine(day, time(hour, rng.choice([0, 15, 30]))).replace(tzinfo=zone)
+                    sql_db.add(Booking(
+                        client_id=CLIENT_ID, consultant_id=consultant_id, service_id=service_id,
+                        duration_option_id=rng.choice([1, 2, None]), booking_date=starts_at.astimezone(timezone.utc),
+                        status=rng.choice([BookingStatus.confirmed, BookingStatus.pending, BookingStatus.cancelled]),
+                        total_amount=100,
+                    ))
+    sql_db.commit()
+    return FakeSupabase({"consultants": consultants})
+
+
+def scenarios(sql_db, supabase_db, first_day):
+    """name -> (call, cold); cold calls start with an empty slot cache and session"""
+    window_start = datetime.combine(first_day, time.min).replace(tzinfo=ZoneInfo(CLIENT_TZ))
+
+    def day():
+        return availability_service.get_available_slots_for_date(
+            sql_db, supabase_db, MEASURED_CONSULTANT, first_day + timedelta(days=2), CLIENT_TZ, slot_duration_minutes=30)
+
+    def month():
+        return availability_service.get_available_slots_for_range(
+            sql_db, supabase_db, MEASURED_CONSULTANT, first_day, first_day + timedelta(days=29), CLIENT_TZ,
+            slot_duration_minutes=30)
+
+    def earliest():
+        return availability_service.find_earliest_available_slots(
+            sql_db, TEMPLATE_ID, 60, CLIENT_TZ, window_start, window_start + timedelta(days=14))
+
+    return {
+        "day_cold": (day, True),
+        "day_cached": (day, False),
+        "range_30_days_cold": (month, True),
+        "range_30_days_cached": (month, False),
+        "earliest_14_days_70_consultants": (earliest, True),
+    }
+
+
+def measure(sql_db, call, cold: bool) -> dict:
+    def run():
+        if cold:
+            slot_cache.clear()
+            sql_db.expunge_all()
+        sql_db.statements.clear()
+        return call()
+
+    run()  # Warm up imports, compiled statements and (for cached scenarios) the slot cache
+
+    latencies = []
+    for _ in range(RUNS):
+        started = timer.perf_counter()
+        run()
+        latencies.append((timer.perf_counter() - started) * 1000)
+    queries = len(sql_db.statements)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"median_ms": round(statistics.median(latencies), 3), "peak_kib": round(peak / 1024, 1), "queries": queries}
+
+
+def load_baselines() -> dict:
+    if BASELINES_PATH.exists():
+        return json.loads(BASELINES_PATH.read_text())
+    return {}
+
+
+def save_baseline(name: str, result: dict):
+    baselines = load_baselines()
+    baselines[name] = result
+    BASELINES_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+SCENARIO_NAMES = ["day_cold", "day_cached", "range_30_days_cold", "range_30_days_cached",
+                  "earliest_14_days_70_consultants"]
+
+
+class TestAvailabilityBenchmarks:
+    """Slot generation latency, memory and queries per call against stored baselines"""
+
+    @pytest.mark.parametrize("name", SCENARIO_NAMES)
+    def test_no_regression(self, sql_db, name):
+        first_day = first_monday_after(7)
+        supabase_db = seed_benchmark(sql_db, first_day)
+        call, cold = scenarios(sql_db, supabase_db, first_day)[name]
+
+        result = measure(sql_db, call, cold)
+        baseline = load_baselines().get(name)
+        print(f"\n📊 {name}: {result['median_ms']:.2f}ms median, {result['peak_kib']:.0f} KiB peak, "
+              f"{result['queries']} queries (baseline: {baseline})")
+
+        if UPDATE_BASELINES:
+            save_baseline(name, result)
+            print(f"✅ Baseline recorded for {name}")
+            return
+        if baseline is None:
+            pytest.fail(f"No baseline for {name}; record it with UPDATE_AVAILABILITY_BASELINES=1")
+
+        assert result["queries"] == baseline["queries"]
+        if CHECK_TIMINGS:
+            assert result["peak_kib"] <= baseline["peak_kib"] * MEMORY_TOLERANCE
+            assert result["median_ms"] <= baseline["median_ms"] * LATENCY_TOLERANCE
@@ -0,0 +1,220 @@
+"""
+GET /availability/consultants/{id}/slots/range: a month of slots in one call
+with a fixed number of queries, matching the per-day endpoint's slots
+regrouped by the client's local date.
+"""
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.crud.slot_cache import slot_cache
+from app.db.base import Base
+from app.models.availability import ConsultantAvailability, ConsultantBlockedTime, DayOfWeek
+from app.models.booking import Booking, BookingStatus
+from app.models.consultant import ConsultantService, ConsultantServicePricing
+from app.models.service_template import ServiceDurationOption
+from app.services.availability_service import availability_service
+from tests.supabase_fake import FakeSupabase
+
+CONSULTANT_TZ = "America/Toronto"
+# Not all digits, or SQLite's numeric affinity turns the stored hex into a number
+CLIENT_ID = uuid.UUID("c11e0000-0000-4000-8000-000000000001")
+TABLES = [ConsultantAvailability, ConsultantBlockedTime, Booking, ServiceDurationOption, ConsultantService,
+          ConsultantServicePricing]
+
+
+def _as_utc(target, context, attrs=None):
+    # SQLite drops the offset; every datetime in these tests is stored in UTC
+    for column in ("start_datetime", "end_datetime", "booking_date"):
+        value = target.__dict__.get(column)
+        if value is not None and value.tzinfo is None:
+            target.__dict__[column] = value.replace(tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def sql_db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[model.__table__ for model in TABLES])
+    with engine.begin() as conn:
+        # The consultants model uses Postgres-only column types; these are the columns slot queries read
+        conn.execute(text("CREATE TABLE consultants (id INTEGER PRIMARY KEY, name TEXT, timezone TEXT, is_available BOOLEAN)"))
+    for model in (ConsultantBlockedTime, Booking):
+        event.listen(model, "load", _as_utc)
+        event.listen(model, "refresh", _as_utc)
+
+    slot_cache.clear()
+    session = sessionmaker(bind=engine)()
+    session.statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: session.statements.append(statement))
+    yield session
+
+    session.close()
+    for model in (ConsultantBlockedTime, Booking):
+        event.remove(model, "load", _as_utc)
+        event.remove(model, "refresh", _as_utc)
+
+
+def first_monday_after(days: int) -> date:
+    day = date.today() + timedelta(days=days)
+    return day + timedelta(days=(7 - day.weekday()) % 7)
+
+
+def consultant_time(day: date, hour: int, minute: int = 0) -> datetime:
+    local = datetime.combine(day, time(hour, minute)).replace(tzinfo=ZoneInfo(CONSULTANT_TZ))
+    return local.astimezone(timezone.utc)
+
+
+def seed(sql_db, month_start: date) -> FakeSupabase:
+    """Weekday schedule with a late evening window, plus blocks and bookings"""
+    for day in (DayOfWeek.monday, DayOfWeek.wednesday, DayOfWeek.friday):
+        sql_db.add(ConsultantAvailability(consultant_id=1, day_of_week=day, start_time=time(9),
+                                          end_time=time(12), timezone=CONSULTANT_TZ, slot_interval_minutes=15))
+        sql_db.add(ConsultantAvailability(consultant_id=1, day_of_week=day, start_time=time(20),
+                                          end_time=time(23, 30), timezone=CONSULTANT_TZ, slot_interval_minutes=30))
+    sql_db.add(ConsultantAvailability(consultant_id=1, day_of_week=DayOfWeek.tuesday, start_time=time(13),
+                                      end_time=time(17), timezone=CONSULTANT_TZ, is_active=False))
+    sql_db.add(ServiceDurationOption(id=1, service_template_id=1, duration_minutes=60,
+                                     duration_label="1 hour", min_price=50, max_price=300))
+    sql_db.add(ConsultantService(id=7, consultant_id=1, name="Express Entry", duration=30, price=100))
+    sql_db.add(ConsultantService(id=8, consultant_id=1, name="Study Permits", duration=45, price=80))
+
+    for week in range(4):
+        monday = month_start + timedelta(weeks=week)
+        sql_db.add(ConsultantBlockedTime(consultant_id=1, start_datetime=consultant_time(monday, 10),
+                                         end_datetime=consultant_time(monday, 11), reason="Appointment"))
+        sql_db.add(Booking(client_id=CLIENT_ID, consultant_id=1, service_id=7,
+                           duration_option_id=1, booking_date=consultant_time(monday + timedelta(days=2), 9, 15),
+                           status=BookingStatus.confirmed, total_amount=100))
+        # Legacy booking: no duration option, the service's 45 minute duration applies
+        sql_db.add(Booking(client_id=CLIENT_ID, consultant_id=1, service_id=8,
+                           booking_date=consultant_time(monday + timedelta(days=4), 21),
+                           status=BookingStatus.pending, total_amount=80))
+        sql_db.add(Booking(client_id=CLIENT_ID, consultant_id=1, service_id=8,
+                           booking_date=consultant_time(monday + timedelta(days=4), 9),
+                           status=BookingStatus.cancelled, total_amount=80))
+    sql_db.commit()
+    sql_db.statements.clear()
+
+    return FakeSupabase({"consultants": [{"id": 1, "timezone": CONSULTANT_TZ}]})
+
+
+def per_day_slots(sql_db, supabase_db, start, end, client_tz, duration):
+    """The existing endpoint once per consultant-local day, regrouped by client date"""
+    grouped = {}
+    day = start - timedelta(days=1)
+    while day <= end + timedelta(days=1):
+        for slot in availability_service.get_available_slots_for_date(
+            sql_db, supabase_db, 1, day, client_tz, slot_duration_minutes=duration
+        ).slots:
+            client_day = slot.start.astimezone(ZoneInfo(client_tz)).date()
+            if start <= client_day <= end:
+                grouped.setdefault(client_day.isoformat(), []).append(slot)
+        day += timedelta(days=1)
+    return {day: sorted(slots, key=lambda slot: slot.start) for day, slots in grouped.items()}
+
+
+class TestAvailableSlotsRange:
+    """One call for a month view"""
+
+    def test_month_in_a_handful_of_queries(self, sql_db):
+        month_start = first_monday_after(7)
+        supabase_db = seed(sql_db, month_start)
+        month_end = month_start + timedelta(days=29)
+
+        result = availability_service.get_available_slots_for_range(
+            sql_db, supabase_db, 1, month_start, month_end, "Asia/Kolkata", slot_duration_minutes=30
+        )
+
+        assert len(result.days) == 30
+        assert result.total_slots > 0
+        assert len(sql_db.statements) == 3
+        assert supabase_db.round_trips() == 1  # consultant timezone
+
+        sql_db.statements.clear()
+        supabase_db.queries.clear()
+        slot_cache.clear()
+        per_day_slots(sql_db, supabase_db, month_start, month_end, "Asia/Kolkata", 30)
+        print(f"✅ 30-day range: 3 SQL + 1 Supabase queries "
+              f"(was {len(sql_db.statements)} SQL + {supabase_db.round_trips()} Supabase)")
+
+    @pytest.mark.parametrize("client_tz", ["Asia/Kolkata", CONSULTANT_TZ, "America/Vancouver"])
+    def test_same_slots_as_per_day_calls(self, sql_db, client_tz):
+        month_start = first_monday_after(7)
+        supabase_db = seed(sql_db, month_start)
+        start, end = month_start + timedelta(days=1), month_start + timedelta(days=20)
+
+        for duration in (30, 60):
+            result = availability_service.get_available_slots_for_range(
+                sql_db, supabase_db, 1, start, end, client_tz, slot_duration_minutes=duration
+            )
+            expected = per_day_slots(sql_db, supabase_db, start, end, client_tz, duration)
+
+            assert [day.date for day in result.days] == [
+                (start + timedelta(days=offset)).isoformat() for offset in range(20)
+            ]
+            assert {day.date: day.slots for day in result.days if day.slots} == expected, duration
+
+    def test_evening_slots_land_on_the_next_client_day(self, sql_db):
+        month_start = first_monday_after(7)
+        supabase_db = seed(sql_db, month_start)
+
+        result = availability_service.get_available_slots_for_range(
+            sql_db, supabase_db, 1, month_start, month_start + timedelta(days=1), "Asia/Kolkata",
+            slot_duration_minutes=30
+        )
+        monday, tuesday = result.days
+
+        # Monday 20:00-23:30 Toronto is Tuesday morning in India; Tuesday has no window
+        assert tuesday.slots and all(slot.start_consultant_tz.date() == month_start for slot in tuesday.slots)
+        assert all(slot.start.date() == month_start for slot in monday.slots)
+        # Sunday evening Toronto would be Monday in India, but Sunday has no window
+        assert monday.slots[0].start_consultant_tz.hour == 9
+
+    def test_invalid_ranges_are_rejected(self, sql_db):
+        supabase_db = seed(sql_db, first_monday_after(7))
+        today = date.today()
+        for start, end in ((today, today - timedelta(days=1)), (today, today + timedelta(days=42))):
+            with pytest.raises(ValueError):
+                availability_service.get_available_slots_for_range(
+                    sql_db, supabase_db, 1, start, end, "Asia/Kolkata"
+                )
+
+
+class TestBookingDurations:
+    """Booking durations come from the SQL query, legacy ones included"""
+
+    def test_legacy_durations_resolved_without_supabase(self, sql_db):
+        month_start = first_monday_after(7)
+        supabase_db = seed(sql_db, month_start)
+        friday = month_start + timedelta(days=4)
+
+        result = availability_service.get_available_slots_for_date(
+            sql_db, supabase_db, 1, friday, CONSULTANT_TZ, slot_duration_minutes=15
+        )
+
+        assert supabase_db.queries == [("select", "consultants")]
+        assert len(sql_db.statements) == 3
+        # The pending legacy booking at 21:00 uses its service's 45 minutes
+        evening = [slot.start_consultant_tz.strftime("%H:%M") for slot in result.slots
+                   if slot.start_consultant_tz.hour >= 20]
+        assert evening == ["20:00", "20:30", "22:00", "22:30", "23:00"]
+
+    def test_booking_without_any_duration_blocks_the_default(self, sql_db):
+        month_start = first_monday_after(7)
+        supabase_db = seed(sql_db, month_start)
+        sql_db.get(ConsultantService, 8).duration = None
+        sql_db.commit()
+
+        result = availability_service.get_available_slots_for_date(
+            sql_db, supabase_db, 1, month_start + timedelta(days=4), CONSULTANT_TZ, slot_duration_minutes=15
+        )
+        # The 21:00 legacy booking blocks DEFAULT_SLOT_DURATION, as booking_duration_minutes() does
+        evening = [slot.start_consultant_tz.strftime("%H:%M") for slot in result.slots
+                   if slot.start_consultant_tz.hour >= 20]
+        assert evening == ["20:00", "20:30", "21:30", "22:00", "22:30", "23:00"]
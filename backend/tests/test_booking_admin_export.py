@@ -0,0 +1,157 @@
+"""
+Admin booking listing and export: filters run in the database, pages follow
+keyset cursors, and the export streams one page at a time instead of loading
+every booking.
+"""
+import asyncio
+import csv
+import io
+import json
+import tracemalloc
+from datetime import datetime, timezone
+
+from app.api.api_v1.endpoints.bookings import export_bookings, read_bookings
+from app.api.deps import Principal
+from app.crud.base import NEXT_CURSOR_HEADER
+from app.crud.crud_booking import BOOKING_EXPORT_COLUMNS
+from app.models.booking import BookingStatus, PaymentStatus
+from tests.supabase_fake import FakeSupabase
+
+ADMIN = Principal(id="ad000000-0000-4000-8000-000000000001", email="admin@example.com", full_name="Admin",
+                  role="admin", email_verified=True, is_active=True)
+STATUSES = ["pending", "confirmed", "completed", "cancelled", None]
+
+
+def booking_rows(count):
+    # Groups of four share a created_at so the id tie-breaker matters
+    return [{
+        "id": i, "client_id": f"c11e0000-0000-4000-8000-{i % 50:012d}", "consultant_id": 1 + i % 7,
+        "service_id": 10, "duration_option_id": 2,
+        "booking_date": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T14:00:00+00:00", "timezone": "America/Toronto",
+        "status": STATUSES[i % 5], "payment_status": "succeeded" if i % 3 else "pending", "total_amount": 140.0,
+        "intake_form_data": {"summary": "Express Entry, two dependants"}, "payment_intent_id": None,
+        "meeting_url": None, "meeting_notes": None,
+        "created_at": f"2025-{1 + (i // 4) % 12:02d}-{1 + (i // 48) % 28:02d}T{(i // 4) % 24:02d}:00:00+00:00",
+        "updated_at": None,
+    } for i in range(1, count + 1)]
+
+
+def make_db(count):
+    return FakeSupabase({"bookings": booking_rows(count), "booking_documents": []})
+
+
+def newest_first(rows):
+    return [row["id"] for row in sorted(rows, key=lambda row: (row["created_at"], row["id"]), reverse=True)]
+
+
+def list_page(db, **params):
+    response = FakeResponse()
+    params = {"status": None, "payment_status": None, "consultant_id": None, "date_from": None, "date_to": None,
+              "skip": 0, "limit": 100, "cursor": None, **params}
+    page = asyncio.run(read_bookings(response=response, db=db.aio, principal=ADMIN, **params))
+    return page, response.headers.get(NEXT_CURSOR_HEADER)
+
+
+class FakeResponse:
+    def __init__(self):
+        self.headers = {}
+
+
+def export(db, export_format="ndjson", keep_body=True, **filters):
+    """Run the export endpoint and collect the streamed body (or only count its lines)"""
+    filters = {"status": None, "payment_status": None, "consultant_id": None, "date_from": None, "date_to": None,
+               **filters}
+
+    async def collect():
+        response = await export_bookings(db=db.aio, current_user={"role": "admin"}, export_format=export_format,
+                                         **filters)
+        if keep_body:
+            return response, "".join([chunk async for chunk in response.body_iterator])
+        lines = 0
+        async for chunk in response.body_iterator:
+            lines += chunk.count("\n")
+        return response, lines
+
+    return asyncio.run(collect())
+
+
+class TestAdminBookingList:
+    """Filtered pages of all bookings"""
+
+    def test_filters_run_in_one_query(self):
+        db = make_db(400)
+        page, _ = list_page(db, status=BookingStatus.confirmed, payment_status=PaymentStatus.succeeded,
+                            consultant_id=3, date_from=datetime(2026, 3, 1, tzinfo=timezone.utc),
+                            date_to=datetime(2026, 9, 1, tzinfo=timezone.utc))
+
+        expected = [row for row in db.rows["bookings"]
+                    if row["status"] == "confirmed" and row["payment_status"] == "succeeded"
+                    and row["consultant_id"] == 3 and "2026-03-01" <= row["booking_date"] < "2026-09-01"]
+        assert expected and sorted(booking["id"] for booking in page) == sorted(row["id"] for row in expected)
+        assert db.queries == [("select", "bookings")]
+
+    def test_cursor_pages_cover_every_booking_once(self):
+        db = make_db(250)
+        ids, cursor, pages = [], "", 0
+        while cursor is not None:
+            page, cursor = list_page(db, limit=40, cursor=cursor)
+            ids.extend(booking["id"] for booking in page)
+            pages += 1
+
+        assert ids == newest_first(db.rows["bookings"])
+        assert pages == 7
+        # Null statuses are defaulted for the response model
+        assert {booking["status"] for booking in page} <= {status for status in STATUSES if status}
+
+
+class TestBookingExport:
+    """NDJSON and CSV streamed page by page"""
+
+    def test_ndjson_and_csv_hold_every_matching_booking(self):
+        db = make_db(2500)
+        response, body = export(db, status=BookingStatus.pending)
+
+        rows = [json.loads(line) for line in body.splitlines()]
+        expected = [row for row in db.rows["bookings"] if row["status"] == "pending"]
+        assert response.media_type == "application/x-ndjson"
+        assert [row["id"] for row in rows] == newest_first(expected)
+        # The fake does not project columns; PostgREST returns only BOOKING_EXPORT_COLUMNS
+        assert set(rows[0]) >= set(BOOKING_EXPORT_COLUMNS)
+
+        db.queries.clear()
+        _, body = export(db, export_format="csv")
+        records = list(csv.DictReader(io.StringIO(body)))
+        assert [int(record["id"]) for record in records] == newest_first(db.rows["bookings"])
+        assert records[0].keys() == set(BOOKING_EXPORT_COLUMNS)
+        assert {record["status"] for record in records} == {"pending", "confirmed", "completed", "cancelled"}
+        # 1000 row keyset pages, plus the empty page that ends the walk
+        assert db.queries == [("select", "bookings")] * 3
+
+    def test_empty_csv_has_the_header(self):
+        _, body = export(make_db(10), export_format="csv", consultant_id=99)
+        assert body.splitlines() == [",".join(BOOKING_EXPORT_COLUMNS)]
+
+    def test_memory_stays_flat(self):
+        peaks = {}
+        for count in (2_000, 8_000):
+            db = make_db(count)
+            tracemalloc.start()
+            try:
+                _, lines = export(db, keep_body=False)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            peaks[count] = peak
+            assert lines == count
+
+        db = make_db(8_000)
+        tracemalloc.start()
+        try:
+            list_page(db, limit=8_000)
+            _, all_at_once = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        print(f"\n📊 Export peak: {peaks[2_000] / 1024:.0f} KiB for 2k bookings, {peaks[8_000] / 1024:.0f} KiB "
+              f"for 8k; one 8k page {all_at_once / 1024:.0f} KiB")
+        assert peaks[8_000] < all_at_once / 4
@@ -0,0 +1,162 @@
+"""
+POST /bookings/create-with-duration: the service, pricing and duration option
+checks and the insert run in one database call (create_booking_with_duration),
+so a booking costs two round trips instead of six.
+
+The database function is stood in for by fake_create_booking_with_duration;
+these tests cover the endpoint around it, not the SQL in the migration.
+"""
+import time
+
+import pytest
+from fastapi import HTTPException
+from postgrest.exceptions import APIError
+
+from app.api.api_v1.endpoints.bookings import NewBookingRequest, create_booking_with_duration
+from app.crud import crud_booking
+from app.crud.crud_consultant_service_pricing import consultant_service_pricing
+from app.crud.crud_intake import intake as crud_intake
+from app.crud.crud_service_duration_option import service_duration_option
+from app.schemas.booking import BookingCreate
+from app.services.intake_extraction_service import intake_extraction_service
+from tests.supabase_fake import FakeSupabase
+
+CLIENT = {"id": "c11e0000-0000-4000-8000-000000000001", "role": "client"}
+
+
+def fake_create_booking_with_duration(db, params):
+    """Python stand-in for the database function: same checks, errors and result shape"""
+    services = [row for row in db.rows["consultant_services"]
+                if row["id"] == params["p_service_id"] and row["consultant_id"] == params["p_consultant_id"]]
+    if not services:
+        raise APIError({"code": "PT404", "message": "Service not found for this consultant"})
+    if not services[0]["is_active"]:
+        raise APIError({"code": "PT400", "message": "This service is not currently available"})
+    prices = [row for row in db.rows["consultant_service_pricing"]
+              if row["consultant_service_id"] == params["p_service_id"]
+              and row["duration_option_id"] == params["p_duration_option_id"] and row["is_active"]]
+    if not prices:
+        raise APIError({"code": "PT400",
+                        "message": "The RCIC has not set pricing for this service and duration combination"})
+    options = [row for row in db.rows["service_duration_options"] if row["id"] == params["p_duration_option_id"]]
+    if not options:
+        raise APIError({"code": "PT404", "message": "Duration option not found"})
+
+    booking = {
+        "id": db.next_id("bookings"), "client_id": params["p_client_id"], "consultant_id": params["p_consultant_id"],
+        "service_id": params["p_service_id"], "booking_date": params["p_booking_date"],
+        "timezone": params["p_timezone"], "status": "confirmed", "intake_form_data": params["p_intake_form_data"],
+        "total_amount": prices[0]["price"], "payment_status": "pending", "payment_intent_id": None,
+        "meeting_url": None, "meeting_notes": None, "created_at": "2026-10-17T12:00:00+00:00", "updated_at": None,
+        "duration_option_id": params["p_duration_option_id"],
+    }
+    db.rows["bookings"].append(dict(booking))
+    booking["documents"] = []
+    booking["duration_option"] = {key: options[0][key] for key in ("duration_minutes", "duration_label")}
+    return [booking]
+
+
+def saved_intake(row: dict) -> dict:
+    return {**row, **crud_intake.build_booking_summary_columns(row)}
+
+
+def make_db(latency: float = 0.0) -> FakeSupabase:
+    return FakeSupabase({
+        "consultant_services": [
+            {"id": 10, "consultant_id": 1, "is_active": True, "price": 100, "duration": 30},
+            {"id": 11, "consultant_id": 1, "is_active": False, "price": 100, "duration": 30},
+        ],
+        "consultant_service_pricing": [
+            {"id": 1, "consultant_service_id": 10, "duration_option_id": 2, "price": 140.0, "is_active": True},
+        ],
+        "service_duration_options": [
+            {"id": 2, "duration_minutes": 60, "duration_label": "1 Hour"},
+            {"id": 3, "duration_minutes": 90, "duration_label": "1.5 Hours"},
+        ],
+        # Saved through the stage endpoints, so the booking summary is stored with it
+        "client_intakes": [saved_intake({"id": 1, "client_id": CLIENT["id"], "full_name": "Priya Sharma",
+                                         "current_stage": 3, "completed_stages": [1, 2],
+                                         "updated_at": "2026-10-16T09:30:00.5+00:00"})],
+        "bookings": [],
+        "booking_documents": [],
+    }, latency=latency, functions={"create_booking_with_duration": fake_create_booking_with_duration})
+
+
+def request(**fields) -> NewBookingRequest:
+    return NewBookingRequest(**{"consultant_id": 1, "service_id": 10, "duration_option_id": 2,
+                                "booking_date": "2026-11-02T14:00:00-05:00", **fields})
+
+
+def sequential_create(db, booking_request):
+    """The previous endpoint body: one call per lookup, then insert and re-fetch"""
+    service = db.table("consultant_services").select("*").eq("id", booking_request.service_id) \
+        .eq("consultant_id", booking_request.consultant_id).execute().data[0]
+    assert service["is_active"]
+    pricing = consultant_service_pricing.get_price_by_duration(
+        db, consultant_service_id=booking_request.service_id, duration_option_id=booking_request.duration_option_id)
+    assert service_duration_option.get(db, option_id=booking_request.duration_option_id)
+    intake_data = crud_intake.get_by_client_id(db, CLIENT["id"])
+    return crud_booking.create_booking(db, obj_in=BookingCreate(
+        client_id=CLIENT["id"], consultant_id=booking_request.consultant_id, service_id=booking_request.service_id,
+        booking_date=booking_request.booking_date, timezone=booking_request.timezone,
+        total_amount=pricing["price"], duration_option_id=booking_request.duration_option_id,
+        intake_form_data=intake_extraction_service.extract_intake_summary(intake_data),
+    ))
+
+
+class TestCreateBookingWithDuration:
+    """One database call for the checks and the insert"""
+
+    def test_creates_priced_booking_in_two_round_trips(self):
+        db = make_db()
+
+        booking = create_booking_with_duration(db=db, booking_request=request(), current_user=CLIENT)
+
+        assert db.queries == [("select", "client_intakes"), ("rpc", "create_booking_with_duration")]
+        assert booking["total_amount"] == 140.0
+        assert booking["status"] == "confirmed" and booking["payment_status"] == "pending"
+        assert (booking["duration_minutes"], booking["duration_label"]) == (60, "1 Hour")
+        assert booking["intake_form_data"]["personal_info"]["full_name"] == "Priya Sharma"
+        assert booking["documents"] == []
+
+    def test_same_booking_as_the_sequential_path(self):
+        fields = ("client_id", "consultant_id", "service_id", "booking_date", "timezone", "status", "total_amount",
+                  "payment_status", "duration_option_id", "duration_minutes", "duration_label", "documents")
+        sequential = sequential_create(make_db(), request())
+        single = create_booking_with_duration(db=make_db(), booking_request=request(), current_user=CLIENT)
+
+        assert {field: single[field] for field in fields} == {field: sequential[field] for field in fields}
+
+    @pytest.mark.parametrize("fields, status, detail", [
+        ({"service_id": 99}, 404, "Service not found for this consultant"),
+        ({"consultant_id": 2}, 404, "Service not found for this consultant"),
+        ({"service_id": 11}, 400, "This service is not currently available"),
+        ({"duration_option_id": 3}, 400, "The RCIC has not set pricing for this service and duration combination"),
+    ])
+    def test_failed_checks_keep_their_status(self, fields, status, detail):
+        db = make_db()
+
+        with pytest.raises(HTTPException) as error:
+            create_booking_with_duration(db=db, booking_request=request(**fields), current_user=CLIENT)
+
+        assert (error.value.status_code, error.value.detail) == (status, detail)
+        assert db.rows["bookings"] == []
+
+    def test_latency_against_sequential_path(self):
+        latency = 0.02
+
+        db = make_db(latency)
+        started = time.perf_counter()
+        sequential_create(db, request())
+        sequential_ms = (time.perf_counter() - started) * 1000
+        sequential_trips = db.round_trips()
+
+        db = make_db(latency)
+        started = time.perf_counter()
+        create_booking_with_duration(db=db, booking_request=request(), current_user=CLIENT)
+        single_ms = (time.perf_counter() - started) * 1000
+
+        print(f"\n📊 Booking at {latency * 1000:.0f}ms per round trip: sequential {sequential_trips} trips "
+              f"{sequential_ms:.0f}ms, single call {db.round_trips()} trips {single_ms:.0f}ms")
+        assert (sequential_trips, db.round_trips()) == (6, 2)
+        assert single_ms * 2 < sequential_ms
@@ -0,0 +1,261 @@
+"""
+Slot reservation: bookings and holds take the consultant's lock, check for an
+overlapping booking or live hold and fail at once with 409, so a burst of
+clients on the same slots ends with one booking per slot.
+
+The database functions are modelled in Python (per-consultant lock, overlap
+checks, hold expiry); FakeSupabase adds the round-trip latency outside the lock.
+The SQL in migration 20261017_150000 is not run by these tests, so they check
+the endpoints and the locking design, not the functions themselves.
+"""
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from postgrest.exceptions import APIError
+
+from app.api.api_v1.endpoints.bookings import (
+    booking_write_error, create_booking, create_booking_with_duration, hold_booking_slot, release_booking_hold,
+)
+from app.schemas.booking import BookingCreate, BookingHoldCreate
+from tests.test_booking_create_with_duration import fake_create_booking_with_duration, make_db, request
+
+CLIENTS = [{"id": f"c11e0000-0000-4000-8000-{index:012d}", "role": "client"} for index in range(1, 61)]
+ACTIVE_STATUSES = ("pending", "confirmed", "rescheduled")
+DEFAULT_SESSION_MINUTES = 15
+SLOT_TAKEN = "This time slot is no longer available"
+
+
+def slot_range(db, params):
+    """[start, end) of the requested slot: the duration option, else the service's duration, else the default"""
+    start = datetime.fromisoformat(params["p_booking_date"])
+    options = [row for row in db.rows["service_duration_options"] if row["id"] == params["p_duration_option_id"]]
+    if options:
+        minutes = options[0]["duration_minutes"]
+    else:
+        services = [row for row in db.rows["consultant_services"] if row["id"] == params["p_service_id"]]
+        minutes = (services[0]["duration"] if services else None) or DEFAULT_SESSION_MINUTES
+    return start, start + timedelta(minutes=minutes)
+
+
+def overlaps(start, end, other_start, other_end):
+    return start < other_end and other_start < end
+
+
+class SlotFunctions:
+    """hold_booking_slot and the slot-checking create_booking_with_duration"""
+
+    def __init__(self):
+        self.locks = {}
+        self.guard = threading.Lock()
+
+    def consultant_lock(self, consultant_id):
+        # pg_advisory_xact_lock(hashtext('booking_slots'), consultant_id)
+        with self.guard:
+            return self.locks.setdefault(consultant_id, threading.Lock())
+
+    def taken(self, db, params, start, end, *, other_clients_only):
+        now = datetime.now(timezone.utc)
+        for hold in db.rows["booking_holds"]:
+            if hold["consultant_id"] != params["p_consultant_id"] or hold["expires_at"] <= now:
+                continue
+            if other_clients_only and hold["client_id"] == params["p_client_id"]:
+                continue
+            if overlaps(start, end, hold["starts_at"], hold["ends_at"]):
+                return True
+        return any(
+            booking["consultant_id"] == params["p_consultant_id"] and booking["status"] in ACTIVE_STATUSES
+            and overlaps(start, end, *slot_range(db, {"p_booking_date": booking["booking_date"],
+                                                      "p_duration_option_id": booking["duration_option_id"],
+                                                      "p_service_id": booking["service_id"]}))
+            for booking in db.rows["bookings"]
+        )
+
+    def hold(self, db, params):
+        if not any(row["id"] == params["p_service_id"] and row["consultant_id"] == params["p_consultant_id"]
+                   for row in db.rows["consultant_services"]):
+            raise APIError({"code": "PT404", "message": "Service not found for this consultant"})
+        start, end = slot_range(db, params)
+        with self.consultant_lock(params["p_consultant_id"]):
+            now = datetime.now(timezone.utc)
+            db.rows["booking_holds"] = [
+                hold for hold in db.rows["booking_holds"]
+                if hold["consultant_id"] != params["p_consultant_id"]
+                or (hold["expires_at"] > now and hold["client_id"] != params["p_client_id"])
+            ]
+            if self.taken(db, params, start, end, other_clients_only=False):
+                raise APIError({"code": "PT409", "message": SLOT_TAKEN})
+            hold = {
+                "id": db.next_id("booking_holds"), "consultant_id": params["p_consultant_id"],
+                "client_id": params["p_client_id"], "service_id": params["p_service_id"],
+                "duration_option_id": params["p_duration_option_id"], "starts_at": start, "ends_at": end,
+                "expires_at": now + timedelta(minutes=params["p_hold_minutes"]),
+            }
+            db.rows["booking_holds"].append(hold)
+            return [dict(hold)]
+
+    def check_holds(self, db, booking):
+        """The bookings_slot_hold_check trigger, run on every booking insert and update"""
+        if booking.get("status") not in ACTIVE_STATUSES:
+            return
+        params = {"p_consultant_id": booking["consultant_id"], "p_client_id": booking["client_id"],
+                  "p_booking_date": booking["booking_date"], "p_service_id": booking["service_id"],
+                  "p_duration_option_id": booking.get("duration_option_id")}
+        start, end = slot_range(db, params)
+        now = datetime.now(timezone.utc)
+        with self.consultant_lock(booking["consultant_id"]):
+            if any(hold["consultant_id"] == booking["consultant_id"] and hold["client_id"] != booking["client_id"]
+                   and hold["expires_at"] > now and overlaps(start, end, hold["starts_at"], hold["ends_at"])
+                   for hold in db.rows["booking_holds"]):
+                raise APIError({"code": "PT409", "message": SLOT_TAKEN})
+
+    def book(self, db, params):
+        start, end = slot_range(db, params)
+        with self.consultant_lock(params["p_consultant_id"]):
+            if self.taken(db, params, start, end, other_clients_only=True):
+                raise APIError({"code": "PT409", "message": SLOT_TAKEN})
+            booking = fake_create_booking_with_duration(db, params)
+            db.rows["booking_holds"] = [
+                hold for hold in db.rows["booking_holds"]
+                if not (hold["consultant_id"] == params["p_consultant_id"]
+                        and hold["client_id"] == params["p_client_id"]
+                        and overlaps(start, end, hold["starts_at"], hold["ends_at"]))
+            ]
+            return booking
+
+
+def make_slot_db(latency: float = 0.0):
+    db = make_db(latency)
+    functions = SlotFunctions()
+    db.functions = {"create_booking_with_duration": functions.book, "hold_booking_slot": functions.hold}
+    db.triggers = {"bookings": functions.check_holds}
+    db.rows["booking_holds"] = []
+    db.rows["client_intakes"] = []
+    return db
+
+
+def slot(hour: int, minute: int = 0) -> str:
+    return f"2026-11-02T{hour:02d}:{minute:02d}:00-05:00"
+
+
+def hold_request(booking_date: str) -> BookingHoldCreate:
+    return BookingHoldCreate(consultant_id=1, service_id=10, duration_option_id=2, booking_date=booking_date)
+
+
+def book(db, client, booking_date):
+    return create_booking_with_duration(db=db, booking_request=request(booking_date=booking_date), current_user=client)
+
+
+class TestSlotHolds:
+    """Holds keep a slot for one client while they pay"""
+
+    def test_held_slot_is_only_bookable_by_its_client(self):
+        db = make_slot_db()
+        hold = hold_booking_slot(db=db, hold_request=hold_request(slot(14)), current_user=CLIENTS[0])
+
+        # The 60 minute option: 14:30 overlaps the held 14:00-15:00
+        for booking_date in (slot(14), slot(14, 30)):
+            with pytest.raises(HTTPException) as error:
+                book(db, CLIENTS[1], booking_date)
+            assert (error.value.status_code, error.value.detail) == (409, SLOT_TAKEN)
+        with pytest.raises(HTTPException) as error:
+            hold_booking_slot(db=db, hold_request=hold_request(slot(13, 30)), current_user=CLIENTS[1])
+        assert error.value.status_code == 409
+
+        booking = book(db, CLIENTS[0], slot(14))
+        assert booking["client_id"] == CLIENTS[0]["id"]
+        assert db.rows["booking_holds"] == []
+        assert hold["expires_at"] - hold["starts_at"] < timedelta(days=1)
+        # Back to back is fine
+        assert book(db, CLIENTS[1], slot(15))["client_id"] == CLIENTS[1]["id"]
+
+    def test_plain_booking_endpoint_respects_holds(self):
+        db = make_slot_db()
+        hold_booking_slot(db=db, hold_request=hold_request(slot(14)), current_user=CLIENTS[0])
+
+        def post_booking(client, booking_date):
+            return create_booking(db=db, booking_in=BookingCreate(
+                consultant_id=1, service_id=10, duration_option_id=2, booking_date=booking_date, total_amount=0,
+            ), current_user=client)
+
+        with pytest.raises(HTTPException) as error:
+            post_booking(CLIENTS[1], slot(14, 30))
+        assert (error.value.status_code, error.value.detail) == (409, SLOT_TAKEN)
+        assert db.rows["bookings"] == []
+
+        assert post_booking(CLIENTS[0], slot(14))["client_id"] == CLIENTS[0]["id"]
+        assert post_booking(CLIENTS[1], slot(15))["total_amount"] == 100
+
+    def test_expired_or_released_holds_free_the_slot(self):
+        db = make_slot_db()
+        hold_booking_slot(db=db, hold_request=hold_request(slot(9)), current_user=CLIENTS[0])
+        db.rows["booking_holds"][0]["expires_at"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+        assert book(db, CLIENTS[1], slot(9))["client_id"] == CLIENTS[1]["id"]
+
+        hold = hold_booking_slot(db=db, hold_request=hold_request(slot(11)), current_user=CLIENTS[0])
+        with pytest.raises(HTTPException) as error:
+            release_booking_hold(db=db, hold_id=hold["id"], current_user=CLIENTS[1])
+        assert error.value.status_code == 404
+        release_booking_hold(db=db, hold_id=hold["id"], current_user=CLIENTS[0])
+        assert book(db, CLIENTS[1], slot(11))["client_id"] == CLIENTS[1]["id"]
+
+    def test_new_hold_replaces_the_clients_previous_one(self):
+        db = make_slot_db()
+        hold_booking_slot(db=db, hold_request=hold_request(slot(9)), current_user=CLIENTS[0])
+        hold_booking_slot(db=db, hold_request=hold_request(slot(10)), current_user=CLIENTS[0])
+
+        assert [hold["starts_at"].hour for hold in db.rows["booking_holds"]] == [10]
+        assert book(db, CLIENTS[1], slot(9))["client_id"] == CLIENTS[1]["id"]
+
+    def test_overlap_from_the_constraint_is_a_conflict(self):
+        error = booking_write_error(APIError({"code": "23P01", "message": "conflicting key value"}), "update booking")
+        assert (error.status_code, error.detail) == (409, SLOT_TAKEN)
+        error = booking_write_error(APIError({"code": "PT404", "message": "Duration option not found"}), "hold")
+        assert (error.status_code, error.detail) == (404, "Duration option not found")
+
+
+class TestBookingBurst:
+    """Many clients booking the same few slots at once"""
+
+    def test_no_double_bookings_and_fast_conflicts(self):
+        latency = 0.005
+        db = make_slot_db(latency)
+        slots = [slot(9), slot(10), slot(11), slot(12)]
+
+        def attempt(index):
+            client, booking_date = CLIENTS[index], slots[index % len(slots)]
+            started = time.perf_counter()
+            try:
+                if index % 2:
+                    # Pay-first flow: hold, then book
+                    hold_booking_slot(db=db, hold_request=hold_request(booking_date), current_user=client)
+                book(db, client, booking_date)
+                outcome = "booked"
+            except HTTPException as error:
+                assert (error.status_code, error.detail) == (409, SLOT_TAKEN)
+                outcome = "conflict"
+            return outcome, (time.perf_counter() - started) * 1000
+
+        barrier = threading.Barrier(len(CLIENTS))
+
+        def start_together(index):
+            barrier.wait()
+            return attempt(index)
+
+        with ThreadPoolExecutor(max_workers=len(CLIENTS)) as pool:
+            results = list(pool.map(start_together, range(len(CLIENTS))))
+
+        booked = sorted(booking["booking_date"] for booking in db.rows["bookings"])
+        assert booked == sorted(slots)
+        assert [outcome for outcome, _ in results].count("booked") == len(slots)
+
+        conflict_ms = sorted(elapsed for outcome, elapsed in results if outcome == "conflict")
+        print(f"\n📊 {len(CLIENTS)} concurrent clients on {len(slots)} slots: {len(booked)} bookings, "
+              f"{len(conflict_ms)} conflicts (median {statistics.median(conflict_ms):.0f}ms, "
+              f"max {conflict_ms[-1]:.0f}ms at {latency * 1000:.0f}ms per round trip)")
+        # At most three round trips (hold, intake, booking) and no retries, whatever the contention
+        assert conflict_ms[-1] < 3 * latency * 1000 + 250
@@ -0,0 +1,189 @@
+"""
+Round-trip regression benchmark for the consultant directory listing, and
+tests for the stored consultant rating aggregates.
+
+Ratings are read from consultants.rating / review_count (kept current by the
+create_consultant_review database function), so loading the directory reads no
+review rows however many consultants or reviews it covers.
+"""
+import asyncio
+import time
+from collections import defaultdict
+
+from app.crud import crud_consultant
+from app.crud.consultant_directory import ConsultantDirectory
+from tests.supabase_fake import FakeSupabase
+
+PAGE_SIZE = 100
+SIMULATED_ROUND_TRIP = 0.002  # seconds
+
+
+def review_stats(reviews):
+    """rating / review_count computed from review rows, as reads used to do"""
+    if not reviews:
+        return {"rating": None, "review_count": 0, "rating_sum": 0}
+    total = sum(review["rating"] for review in reviews)
+    return {"rating": round(total / len(reviews), 1), "review_count": len(reviews), "rating_sum": total}
+
+
+def create_consultant_review_sql(db, params):
+    """Python stand-in for the create_consultant_review() database function (the SQL itself is not run here)"""
+    review = {
+        "id": db.next_id("consultant_reviews"),
+        "consultant_id": params["p_consultant_id"],
+        "client_id": params["p_client_id"],
+        "rating": params["p_rating"],
+        "comment": params["p_comment"],
+        "outcome": params["p_outcome"],
+    }
+    db.rows["consultant_reviews"].append(review)
+    for consultant in db.rows["consultants"]:
+        if consultant["id"] == params["p_consultant_id"]:
+            consultant["rating_sum"] += params["p_rating"]
+            consultant["review_count"] += 1
+            consultant["rating"] = round(consultant["rating_sum"] / consultant["review_count"], 1)
+    return [dict(review)]
+
+
+def reconcile_consultant_rating_aggregates_sql(db, params):
+    """Python stand-in for the reconcile_consultant_rating_aggregates() database function"""
+    reviews_by_consultant = defaultdict(list)
+    for review in db.rows["consultant_reviews"]:
+        reviews_by_consultant[review["consultant_id"]].append(review)
+    repaired = 0
+    for consultant in db.rows["consultants"]:
+        actual = review_stats(reviews_by_consultant[consultant["id"]])
+        if any(consultant.get(key) != value for key, value in actual.items()):
+            consultant.update(actual)
+            repaired += 1
+    return repaired
+
+
+def seeded_directory(consultant_count: int = 150, latency: float = 0.0) -> FakeSupabase:
+    consultants = [
+        {"id": i, "name": f"Consultant {i}", "languages": ["English"], "specialties": ["Express Entry"]}
+        for i in range(1, consultant_count + 1)
+    ]
+    # Every third consultant has no reviews; the rest have (i % 5) + 1 reviews
+    reviews = []
+    for consultant in consultants:
+        if consultant["id"] % 3 == 0:
+            continue
+        for n in range(consultant["id"] % 5 + 1):
+            reviews.append({
+                "id": len(reviews) + 1,
+                "consultant_id": consultant["id"],
+                "client_id": f"client-{n}",
+                "rating": (consultant["id"] + n) % 5 + 1,
+            })
+    db = FakeSupabase(
+        {"consultants": consultants, "consultant_reviews": reviews},
+        latency=latency,
+        functions={
+            "create_consultant_review": create_consultant_review_sql,
+            "reconcile_consultant_rating_aggregates": reconcile_consultant_rating_aggregates_sql,
+        },
+    )
+    reconcile_consultant_rating_aggregates_sql(db, {})  # what the migration backfill does
+    return db
+
+
+def per_consultant_get_multi(db, skip: int = 0, limit: int = 100):
+    """The original implementation: one review query per consultant, ratings recomputed"""
+    consultants = db.table("consultants").select("*").range(skip, skip + limit - 1).execute().data
+    for consultant in consultants:
+        consultant["services"] = []
+        reviews = db.table("consultant_reviews").select("*").eq("consultant_id", consultant["id"]).execute().data
+        consultant["reviews"] = reviews
+        stats = review_stats(reviews)
+        consultant["rating"], consultant["review_count"] = stats["rating"], stats["review_count"]
+    return consultants
+
+
+def directory_page(db, skip: int = 0, limit: int = 100):
+    """A GET /consultants page from a freshly loaded directory snapshot"""
+    snapshot = asyncio.run(ConsultantDirectory(check_seconds=60).get_snapshot(db.aio))
+    return snapshot.query(skip=skip, limit=limit)
+
+
+class TestConsultantDirectoryRoundTrips:
+    """The directory reads stored rating aggregates instead of review rows"""
+
+    def test_load_reads_no_reviews(self):
+        db = seeded_directory()
+        consultants = directory_page(db, skip=0, limit=PAGE_SIZE)
+
+        assert len(consultants) == PAGE_SIZE
+        assert db.round_trips("consultants") == 1
+        assert db.round_trips("consultant_reviews") == 0
+        print(f"✅ {PAGE_SIZE} consultants listed in {db.round_trips('consultants')} consultants round trip")
+
+    def test_same_ratings_as_per_consultant_queries(self):
+        expected = per_consultant_get_multi(seeded_directory(), skip=20, limit=PAGE_SIZE)
+        actual = directory_page(seeded_directory(), skip=20, limit=PAGE_SIZE)
+
+        assert [(c["id"], c["rating"], c["review_count"]) for c in actual] == \
+               [(c["id"], c["rating"], c["review_count"]) for c in expected]
+        assert all(c["reviews"] == [] and c["services"] == [] for c in actual)
+        unreviewed = next(c for c in actual if c["id"] % 3 == 0)
+        assert unreviewed["rating"] is None and unreviewed["review_count"] == 0
+
+    def test_empty_page(self):
+        db = seeded_directory(consultant_count=10)
+        assert directory_page(db, skip=100, limit=PAGE_SIZE) == []
+        assert db.round_trips("consultants") == 1
+
+    def test_benchmark_against_per_consultant_queries(self):
+        db = seeded_directory(latency=SIMULATED_ROUND_TRIP)
+        started = time.perf_counter()
+        per_consultant_get_multi(db, limit=PAGE_SIZE)
+        per_consultant_seconds = time.perf_counter() - started
+        per_consultant_round_trips = db.round_trips()
+
+        db = seeded_directory(latency=SIMULATED_ROUND_TRIP)
+        started = time.perf_counter()
+        directory_page(db, limit=PAGE_SIZE)
+        stored_seconds = time.perf_counter() - started
+
+        print(f"\n📊 Page of {PAGE_SIZE} consultants, {SIMULATED_ROUND_TRIP * 1000:.0f}ms per round trip")
+        print(f"   per-consultant reviews: {per_consultant_round_trips:4d} round trips, {per_consultant_seconds * 1000:7.1f}ms")
+        print(f"   stored aggregates:      {db.round_trips():4d} round trips, {stored_seconds * 1000:7.1f}ms")
+        assert per_consultant_round_trips == PAGE_SIZE + 1
+        assert stored_seconds < per_consultant_seconds
+
+
+class TestRatingAggregates:
+    """Reviews update the stored aggregate; reads never scan review rows for it"""
+
+    def test_create_review_updates_aggregate_in_one_call(self):
+        db = seeded_directory()
+        before = crud_consultant.consultant.get(db, consultant_id=3)
+        assert before["rating"] is None and before["review_count"] == 0
+
+        db.queries.clear()
+        review = crud_consultant.create_consultant_review(
+            db, obj_in={"consultant_id": 3, "client_id": "client-9", "rating": 4, "comment": "Great"}
+        )
+        assert review["rating"] == 4
+        assert db.queries == [("rpc", "create_consultant_review")]
+
+        crud_consultant.create_consultant_review(db, obj_in={"consultant_id": 3, "client_id": "client-8", "rating": 5})
+        after = crud_consultant.consultant.get(db, consultant_id=3)
+        assert after["rating"] == 4.5
+        assert after["review_count"] == 2
+        assert len(after["reviews"]) == 2
+        print("✅ Review insert and aggregate update in a single round trip")
+
+    def test_reconciliation_repairs_drift(self):
+        db = seeded_directory()
+        assert crud_consultant.consultant.reconcile_rating_aggregates(db) == 0
+
+        # A review deleted directly in the database leaves the aggregate stale
+        db.rows["consultant_reviews"] = [r for r in db.rows["consultant_reviews"] if r["consultant_id"] != 1]
+        stale = directory_page(db, limit=1)[0]
+        assert stale["review_count"] > 0
+
+        assert crud_consultant.consultant.reconcile_rating_aggregates(db) == 1
+        repaired = directory_page(db, limit=1)[0]
+        assert repaired["rating"] is None and repaired["review_count"] == 0
+        print("✅ Reconciliation repaired the drifted consultant")
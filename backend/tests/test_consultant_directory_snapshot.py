@@ -0,0 +1,154 @@
+"""
+Tests for the per-worker consultant directory snapshot that serves GET /consultants:
+same results as filtering every consultant in Python, sorting, refresh rules, and a
+filter-latency check on 10k consultants.
+"""
+import asyncio
+import statistics
+import time
+
+from app.crud import crud_consultant
+from app.crud.consultant_directory import (
+    ConsultantDirectory, DirectorySnapshot, as_directory_entry, consultant_directory,
+)
+from tests.supabase_fake import FakeSupabase
+from tests.test_consultant_search import legacy_filtered_page, seeded_directory
+
+FILTER_CASES = [
+    {},
+    {"language": "French"},
+    {"language": "Klingon"},
+    {"specialty": "Refugee Claims", "province": "Quebec"},
+    {"language": "Punjabi", "specialty": "Work Permits"},
+    {"search": "express entry"},
+    {"search": "MANDARIN", "province": "Alberta"},
+    {"search": "visa officer"},
+    {"search": "100%"},
+]
+
+
+def rated_directory(size: int) -> FakeSupabase:
+    db = seeded_directory(size)
+    for consultant in db.rows["consultants"]:
+        i = consultant["id"]
+        consultant["review_count"] = 0 if i % 4 == 0 else i % 13
+        consultant["rating"] = None if i % 4 == 0 else round(3 + (i * 7 % 21) / 10, 1)
+    db.rows["cache_versions"] = [{"name": "consultants", "version": 1}]
+    return db
+
+
+class TestDirectorySnapshotQueries:
+    """Snapshot answers match brute-force filtering and sorting"""
+
+    def test_same_pages_as_python_filtering(self):
+        db = rated_directory(2_000)
+        snapshot = DirectorySnapshot(db.table("consultants").select("*").execute().data)
+
+        for filters in FILTER_CASES:
+            for skip in (0, 40, 1_990):
+                expected = [as_directory_entry(c) for c in legacy_filtered_page(db, skip, 20, **filters)]
+                actual = snapshot.query(skip=skip, limit=20, **filters)
+                assert [c["id"] for c in actual] == [c["id"] for c in expected], (filters, skip)
+        assert actual == expected
+
+    def test_sorted_pages(self):
+        db = rated_directory(2_000)
+        rows = db.table("consultants").select("*").execute().data
+        snapshot = DirectorySnapshot(rows)
+        sort_keys = {
+            "rating": lambda c: (-(c["rating"] if c["rating"] is not None else -1), -c["review_count"], c["id"]),
+            "name": lambda c: (c["name"].casefold(), c["id"]),
+            "reviews": lambda c: (-c["review_count"], -(c["rating"] if c["rating"] is not None else -1), c["id"]),
+        }
+        for sort, key in sort_keys.items():
+            for filters in FILTER_CASES:
+                matching = [c["id"] for c in snapshot.query(limit=len(rows), **filters)]
+                by_id = {c["id"]: c for c in rows}
+                expected = sorted((by_id[i] for i in matching), key=key)
+                for skip in (0, 15):
+                    actual = snapshot.query(skip=skip, limit=10, sort=sort, **filters)
+                    assert [c["id"] for c in actual] == [c["id"] for c in expected[skip:skip + 10]], (sort, filters)
+
+    def test_unknown_sort_is_rejected(self):
+        snapshot = DirectorySnapshot(rated_directory(10).rows["consultants"])
+        try:
+            snapshot.query(sort="price")
+        except ValueError:
+            return
+        raise AssertionError("expected ValueError")
+
+    def test_pages_are_copies(self):
+        snapshot = DirectorySnapshot(rated_directory(10).rows["consultants"])
+        snapshot.query(limit=1)[0]["name"] = "Changed"
+        assert snapshot.query(limit=1)[0]["name"] == "Consultant 1"
+
+    def test_filter_latency_on_10k_consultants(self):
+        snapshot = DirectorySnapshot(rated_directory(10_000).rows["consultants"])
+        filters = {"language": "French", "specialty": "Family Sponsorship"}
+        for sort in (None, "rating"):
+            timings = []
+            for _ in range(200):
+                started = time.perf_counter()
+                page = snapshot.query(skip=0, limit=20, sort=sort, **filters)
+                timings.append(time.perf_counter() - started)
+            median_ms = statistics.median(timings) * 1000
+            print(f"\n📊 10000 consultants, {filters}, sort={sort}: median {median_ms:.3f}ms, no database call")
+            assert len(page) == 20
+            assert median_ms < 1.0
+
+
+class TestDirectorySnapshotRefresh:
+    """When a worker rebuilds its snapshot"""
+
+    def test_loads_once_and_reuses(self):
+        db = rated_directory(2_500)
+        directory = ConsultantDirectory(check_seconds=60)
+
+        first = asyncio.run(directory.get_snapshot(db.aio))
+        assert first.size == 2_500
+        assert db.round_trips("consultants") == 3  # loaded in batches of 1000
+        assert db.round_trips("cache_versions") == 1
+
+        db.queries.clear()
+        assert asyncio.run(directory.get_snapshot(db.aio)) is first
+        assert db.queries == []
+        print("✅ Snapshot reused with no database call")
+
+    def test_local_write_rebuilds(self):
+        db = rated_directory(50)
+        directory = ConsultantDirectory(check_seconds=60)
+        first = asyncio.run(directory.get_snapshot(db.aio))
+
+        db.rows["consultants"][0]["name"] = "Renamed"
+        directory.invalidate()
+        second = asyncio.run(directory.get_snapshot(db.aio))
+        assert second is not first
+        assert second.query(limit=1)[0]["name"] == "Renamed"
+
+    def test_version_check_picks_up_other_writers(self):
+        db = rated_directory(50)
+        directory = ConsultantDirectory(check_seconds=0)
+        first = asyncio.run(directory.get_snapshot(db.aio))
+
+        db.queries.clear()
+        assert asyncio.run(directory.get_snapshot(db.aio)) is first
+        assert db.queries == [("select", "cache_versions")]
+
+        db.rows["cache_versions"][0]["version"] = 2
+        assert asyncio.run(directory.get_snapshot(db.aio)) is not first
+
+    def test_crud_writes_invalidate_the_shared_directory(self):
+        db = rated_directory(5)
+        db.functions["create_consultant_review"] = lambda db, params: [{"id": 1, **params}]
+        consultant_directory._stale = False
+
+        crud_consultant.create_consultant_review(db, obj_in={"consultant_id": 1, "client_id": "c", "rating": 5})
+        assert consultant_directory._stale
+        consultant_directory._stale = False
+
+        class Changes:
+            def dict(self, exclude_unset=False):
+                return {"bio": "Updated"}
+
+        crud_consultant.consultant.update(db, consultant_id=1, obj_in=Changes())
+        assert consultant_directory._stale
@@ -0,0 +1,136 @@
+"""
+Tests for the consultant profile aggregate cache behind GET /consultants/{id}:
+a cached profile costs no database round trips, and every write to the
+consultant, its services, their pricing or its reviews invalidates it.
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.api_v1.endpoints.consultants import read_consultant
+from app.crud import crud_consultant
+from app.crud.crud_consultant_service_pricing import consultant_service_pricing
+from app.crud.profile_cache import profile_cache
+from app.schemas.consultant import ConsultantServicePricingCreate, ConsultantServicePricingUpdate, ConsultantServiceUpdate
+from app.utils.cache import TTLCache, build_cache
+from tests.supabase_fake import FakeSupabase
+
+
+@pytest.fixture
+def db():
+    profile_cache.clear()
+    yield FakeSupabase(
+        {
+            "consultants": [
+                {"id": 1, "name": "Ada", "rating": 4.5, "review_count": 2, "rating_sum": 9},
+                {"id": 2, "name": "Grace", "rating": None, "review_count": 0, "rating_sum": 0},
+            ],
+            "consultant_services": [
+                {"id": 10, "consultant_id": 1, "name": "Express Entry", "price": 100, "is_active": True},
+                {"id": 11, "consultant_id": 1, "name": "Study Permits", "price": 80, "is_active": False},
+                {"id": 20, "consultant_id": 2, "name": "Work Permits", "price": 90, "is_active": True},
+            ],
+            "consultant_reviews": [
+                {"id": 1, "consultant_id": 1, "client_id": "a", "rating": 5},
+                {"id": 2, "consultant_id": 1, "client_id": "b", "rating": 4},
+            ],
+            "consultant_service_pricing": [
+                {"id": 100, "consultant_service_id": 10, "duration_option_id": 1, "price": 100, "is_active": True},
+            ],
+            "service_duration_options": [{"id": 1, "min_price": 50, "max_price": 200}, {"id": 2, "min_price": 50, "max_price": 200}],
+        },
+        functions={"create_consultant_review": lambda db, params: [{"id": 3, **params}]},
+    )
+    profile_cache.clear()
+
+
+def read_profile(db, consultant_id=1):
+    return asyncio.run(read_consultant(db=db.aio, consultant_id=consultant_id))
+
+
+def assert_refetched(db, consultant_id=1):
+    db.queries.clear()
+    read_profile(db, consultant_id)
+    assert db.round_trips() == 3, db.queries
+
+
+class TestProfileReads:
+    """Profiles are fetched once, without the duplicate services query"""
+
+    def test_first_read_fetches_each_table_once(self, db):
+        profile = read_profile(db)
+
+        assert sorted(db.queries) == [
+            ("select", "consultant_reviews"), ("select", "consultant_services"), ("select", "consultants")
+        ]
+        assert [s["id"] for s in profile["services"]] == [10, 11]
+        assert len(profile["reviews"]) == 2
+
+    def test_cached_read_costs_no_round_trips(self, db):
+        first = read_profile(db)
+        db.queries.clear()
+
+        assert read_profile(db) == first
+        assert db.queries == []
+        print("✅ Cached profile served with 0 database round trips")
+
+    def test_missing_consultant_is_not_cached(self, db):
+        with pytest.raises(HTTPException):
+            read_profile(db, consultant_id=99)
+        assert profile_cache.get(99) is None
+
+
+class TestProfileInvalidation:
+    """Writes through the CRUD layer drop the cached profile"""
+
+    def test_consultant_update(self, db):
+        read_profile(db)
+
+        class Changes:
+            def dict(self, exclude_unset=False):
+                return {"name": "Ada L."}
+
+        crud_consultant.consultant.update(db, consultant_id=1, obj_in=Changes())
+        assert_refetched(db)
+        assert read_profile(db)["name"] == "Ada L."
+
+    def test_service_writes(self, db):
+        read_profile(db)
+        crud_consultant.update_consultant_service(db, service_id=11, obj_in=ConsultantServiceUpdate(is_active=True))
+        assert_refetched(db)
+
+        crud_consultant.delete_consultant_service(db, service_id=10)
+        assert_refetched(db)
+
+    def test_pricing_writes(self, db):
+        read_profile(db)
+        read_profile(db, consultant_id=2)
+
+        consultant_service_pricing.create(db, obj_in=ConsultantServicePricingCreate(
+            consultant_service_id=10, duration_option_id=2, price=120))
+        assert_refetched(db)
+
+        consultant_service_pricing.update(db, pricing_id=100, obj_in=ConsultantServicePricingUpdate(price=110))
+        assert_refetched(db)
+
+        consultant_service_pricing.delete(db, pricing_id=100)
+        assert_refetched(db)
+
+        # Consultant 2's profile was never touched
+        db.queries.clear()
+        read_profile(db, consultant_id=2)
+        assert db.queries == []
+
+    def test_review_insert(self, db):
+        read_profile(db)
+        crud_consultant.create_consultant_review(db, obj_in={"consultant_id": 1, "client_id": "c", "rating": 5})
+        assert_refetched(db)
+
+
+class TestCacheBackend:
+    def test_in_process_lru_without_redis_url(self):
+        cache = build_cache("test", max_entries=10, ttl_seconds=60)
+        assert isinstance(cache, TTLCache)
+        asyncio.run(cache.aset("k", {"v": 1}))
+        assert asyncio.run(cache.aget("k")) == {"v": 1}
@@ -0,0 +1,111 @@
+"""
+Directory filters for GET /consultants are applied to every consultant before
+paging.
+
+The original endpoint filtered a fetched page in Python, so a filtered page could
+come back short or empty while matching consultants sat on later pages. Pages
+are checked against the correct in-Python alternative, which filters the whole
+table first.
+"""
+import asyncio
+import json
+
+from app.crud.consultant_directory import ConsultantDirectory
+from tests.supabase_fake import FakeSupabase
+
+DIRECTORY_SIZE = 10_000
+PAGE_SIZE = 20
+
+LANGUAGES = ["English", "French", "Punjabi", "Mandarin", "Spanish", "Arabic", "Tagalog"]
+SPECIALTIES = ["Express Entry", "Study Permits", "Family Sponsorship", "Work Permits", "Refugee Claims"]
+PROVINCES = ["Ontario", "British Columbia", "Alberta", "Quebec", "Manitoba"]
+
+
+def search_text(consultant):
+    """Same expression as the consultants.search_text generated column"""
+    return " ".join([
+        consultant["name"],
+        consultant.get("bio") or "",
+        json.dumps(consultant["specialties"], ensure_ascii=False) if consultant.get("specialties") is not None else "",
+        json.dumps(consultant["languages"], ensure_ascii=False) if consultant.get("languages") is not None else "",
+    ])
+
+
+def seeded_directory(size: int = DIRECTORY_SIZE) -> FakeSupabase:
+    consultants = []
+    for i in range(1, size + 1):
+        consultant = {
+            "id": i,
+            "name": f"Consultant {i}",
+            "location": f"City {i % 40}, {PROVINCES[i % len(PROVINCES)]}",
+            "languages": ["English"] + ([LANGUAGES[i % len(LANGUAGES)]] if i % len(LANGUAGES) else []),
+            "specialties": [SPECIALTIES[i % len(SPECIALTIES)], SPECIALTIES[(i * 3) % len(SPECIALTIES)]],
+            "bio": "Former visa officer, 100% success on spousal files" if i % 97 == 0 else f"RCIC since {2000 + i % 24}",
+        }
+        consultant["search_text"] = search_text(consultant)
+        consultants.append(consultant)
+    return FakeSupabase({"consultants": consultants})
+
+
+def legacy_matches(consultant, language=None, province=None, specialty=None, search=None):
+    """The predicate the endpoint used to apply in Python"""
+    if language and language not in consultant.get("languages", []):
+        return False
+    if province and province not in consultant.get("location", ""):
+        return False
+    if specialty and specialty not in consultant.get("specialties", []):
+        return False
+    if search:
+        term = search.lower()
+        return (term in consultant.get("name", "").lower() or
+                term in consultant.get("bio", "").lower() or
+                any(term in spec.lower() for spec in consultant.get("specialties", [])) or
+                any(term in lang.lower() for lang in consultant.get("languages", [])))
+    return True
+
+
+def legacy_filtered_page(db, skip, limit, **filters):
+    """Correct in-Python filtering: fetch every consultant, filter, then paginate"""
+    consultants = db.table("consultants").select("*").execute().data
+    return [c for c in consultants if legacy_matches(c, **filters)][skip:skip + limit]
+
+
+def directory_page(db, skip=0, limit=100, **filters):
+    """A GET /consultants page from a freshly loaded directory snapshot"""
+    snapshot = asyncio.run(ConsultantDirectory(check_seconds=60).get_snapshot(db.aio))
+    return snapshot.query(skip=skip, limit=limit, **filters)
+
+
+class TestDirectoryFilters:
+    """Filters run before the page is cut"""
+
+    def test_filtered_pages_are_full(self):
+        db = seeded_directory()
+        page = directory_page(db, skip=0, limit=PAGE_SIZE, language="Tagalog")
+
+        assert len(page) == PAGE_SIZE
+        assert all("Tagalog" in c["languages"] for c in page)
+        print(f"✅ Filtered page of {PAGE_SIZE}")
+
+    def test_same_results_as_python_filtering(self):
+        db = seeded_directory(size=2_000)
+        cases = [
+            {"language": "French"},
+            {"specialty": "Refugee Claims", "province": "Quebec"},
+            {"language": "Punjabi", "specialty": "Work Permits"},
+            {"search": "express entry"},
+            {"search": "MANDARIN", "province": "Alberta"},
+            {"search": "visa officer"},
+            {"search": "100%"},
+        ]
+        for filters in cases:
+            for skip in (0, 40):
+                expected = [c["id"] for c in legacy_filtered_page(db, skip, PAGE_SIZE, **filters)]
+                actual = [c["id"] for c in directory_page(db, skip=skip, limit=PAGE_SIZE, **filters)]
+                assert actual == expected, filters
+
+    def test_like_wildcards_in_search_are_literal(self):
+        db = seeded_directory(size=500)
+        literal_percent = directory_page(db, search="%")
+        assert [c["id"] for c in literal_percent] == [97, 194, 291, 388, 485]
+        assert directory_page(db, search="Consultant_1") == []
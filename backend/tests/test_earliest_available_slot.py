@@ -0,0 +1,170 @@
+"""
+Earliest-available-slot search across consultants: the same answer as asking
+every consultant for every day, from a fixed number of queries.
+"""
+import random
+import time as timer
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+
+from app.models.availability import ConsultantAvailability, ConsultantBlockedTime, DayOfWeek
+from app.models.booking import Booking, BookingStatus
+from app.models.consultant import ConsultantService, ConsultantServicePricing
+from app.models.service_template import ServiceDurationOption
+from app.services.availability_service import availability_service
+from tests.supabase_fake import FakeSupabase
+from tests.test_availability_range import CLIENT_ID, first_monday_after, sql_db  # noqa: F401
+
+TIMEZONES = ["America/Toronto", "America/Vancouver", "America/Halifax", "Asia/Kolkata"]
+TEMPLATE_ID = 1
+
+
+def seed_consultants(sql_db, count: int, window_start: datetime, seed: int = 1) -> FakeSupabase:
+    """Consultants with varied schedules; earlier ones are booked solid for their first days"""
+    rng = random.Random(seed)
+    sql_db.add(ServiceDurationOption(id=1, service_template_id=TEMPLATE_ID, duration_minutes=30,
+                                     duration_label="30 Mins", min_price=50, max_price=300))
+    sql_db.add(ServiceDurationOption(id=2, service_template_id=TEMPLATE_ID, duration_minutes=60,
+                                     duration_label="1 Hour", min_price=50, max_price=300))
+    sql_db.add(ServiceDurationOption(id=3, service_template_id=2, duration_minutes=30,
+                                     duration_label="30 Mins", min_price=50, max_price=300))
+    consultants = []
+    days = list(DayOfWeek)
+    for consultant_id in range(1, count + 1):
+        tz = TIMEZONES[consultant_id % len(TIMEZONES)]
+        available = consultant_id % 17 != 0
+        consultants.append({"id": consultant_id, "timezone": tz})
+        sql_db.execute(text("INSERT INTO consultants VALUES (:id, :name, :tz, :available)"),
+                       {"id": consultant_id, "name": f"Consultant {consultant_id}", "tz": tz, "available": available})
+
+        service_id = consultant_id * 10
+        sql_db.add(ConsultantService(id=service_id, consultant_id=consultant_id, service_template_id=TEMPLATE_ID,
+                                     name="Express Entry", duration=30, price=100,
+                                     is_active=consultant_id % 13 != 0))
+        sql_db.add(ConsultantServicePricing(consultant_service_id=service_id, duration_option_id=1, price=80))
+        if consultant_id % 2:
+            sql_db.add(ConsultantServicePricing(consultant_service_id=service_id, duration_option_id=2, price=140))
+
+        for day in rng.sample(days, rng.randint(1, 4)):
+            start_hour = rng.choice([7, 9, 13, 19])
+            sql_db.add(ConsultantAvailability(
+                consultant_id=consultant_id, day_of_week=day, start_time=time(start_hour),
+                end_time=time(start_hour + rng.choice([2, 4])), timezone=tz,
+                slot_interval_minutes=rng.choice([15, 30]),
+            ))
+
+        # Busy for a while: blocked days, then back-to-back bookings
+        zone = ZoneInfo(tz)
+        busy_days = rng.randint(0, 12)
+        first_day = window_start.astimezone(zone).date()
+        if busy_days:
+            sql_db.add(ConsultantBlockedTime(
+                consultant_id=consultant_id,
+                start_datetime=datetime.combine(first_day, time.min).replace(tzinfo=zone).astimezone(timezone.utc),
+                end_datetime=datetime.combine(first_day + timedelta(days=busy_days), time.min).replace(tzinfo=zone).astimezone(timezone.utc),
+                reason="Vacation",
+            ))
+        for hour in range(6, 23):
+            booked_day = first_day + timedelta(days=busy_days)
+            if rng.random() < 0.7:
+                sql_db.add(Booking(
+                    client_id=CLIENT_ID, consultant_id=consultant_id, service_id=service_id,
+                    duration_option_id=rng.choice([1, 2, None]),
+                    booking_date=datetime.combine(booked_day, time(hour)).replace(tzinfo=zone).astimezone(timezone.utc),
+                    status=BookingStatus.confirmed, total_amount=100,
+                ))
+    sql_db.commit()
+    sql_db.statements.clear()
+    return FakeSupabase({"consultants": consultants})
+
+
+def brute_force_earliest(sql_db, supabase_db, consultant_ids, window_start, window_end, duration):
+    """Ask the per-day slots API for every consultant and every day"""
+    earliest = []
+    for consultant_id in consultant_ids:
+        zone = ZoneInfo(supabase_db.rows["consultants"][consultant_id - 1]["timezone"])
+        day = window_start.astimezone(zone).date()
+        while day <= window_end.astimezone(zone).date():
+            slots = availability_service.get_available_slots_for_date(
+                sql_db, supabase_db, consultant_id, day, "UTC", slot_duration_minutes=duration
+            ).slots
+            starts = [slot.start_consultant_tz for slot in slots if window_start <= slot.start < window_end]
+            if starts:
+                earliest.append((min(starts), consultant_id))
+                break
+            day += timedelta(days=1)
+    return sorted(earliest)
+
+
+def window(days: int):
+    start = datetime.combine(first_monday_after(7), time.min).replace(tzinfo=ZoneInfo("Asia/Kolkata"))
+    return start, start + timedelta(days=days)
+
+
+class TestEarliestAvailableSlot:
+    """Ranked next free slot per consultant"""
+
+    def test_matches_per_day_search(self, sql_db):
+        window_start, window_end = window(days=16)
+        supabase_db = seed_consultants(sql_db, 40, window_start)
+
+        for duration, eligible in ((30, range(1, 41)), (60, range(1, 41, 2))):
+            eligible = [i for i in eligible if i % 17 and i % 13]
+            result = availability_service.find_earliest_available_slots(
+                sql_db, TEMPLATE_ID, duration, "Asia/Kolkata", window_start, window_end, limit=100
+            )
+            expected = brute_force_earliest(sql_db, supabase_db, eligible, window_start, window_end, duration)
+
+            assert [(r.slot.start_consultant_tz, r.consultant_id) for r in result.results] == expected
+            assert all(r.consultant_service_id == r.consultant_id * 10 for r in result.results)
+            assert all(r.slot.start.tzinfo.key == "Asia/Kolkata" for r in result.results)
+
+    def test_booking_without_duration_does_not_fail_the_search(self, sql_db):
+        window_start, window_end = window(days=16)
+        supabase_db = seed_consultants(sql_db, 20, window_start)
+        # Consultant 1's bookings have no duration option and its service no duration
+        sql_db.get(ConsultantService, 10).duration = None
+        sql_db.execute(text("UPDATE bookings SET duration_option_id = NULL WHERE consultant_id = 1"))
+        sql_db.commit()
+
+        result = availability_service.find_earliest_available_slots(
+            sql_db, TEMPLATE_ID, 30, "Asia/Kolkata", window_start, window_end, limit=100
+        )
+        eligible = [i for i in range(1, 21) if i % 17 and i % 13]
+        expected = brute_force_earliest(sql_db, supabase_db, eligible, window_start, window_end, 30)
+        assert [(r.slot.start_consultant_tz, r.consultant_id) for r in result.results] == expected
+        assert 1 in [r.consultant_id for r in result.results]
+
+    def test_limit_and_unknown_template(self, sql_db):
+        window_start, window_end = window(days=30)
+        seed_consultants(sql_db, 30, window_start)
+
+        top = availability_service.find_earliest_available_slots(
+            sql_db, TEMPLATE_ID, 30, "America/Toronto", window_start, window_end, limit=5
+        ).results
+        assert len(top) == 5
+        assert [r.slot.start for r in top] == sorted(r.slot.start for r in top)
+
+        nobody = availability_service.find_earliest_available_slots(
+            sql_db, 2, 30, "America/Toronto", window_start, window_end
+        )
+        assert nobody.results == [] and nobody.consultants_checked == 0
+
+    def test_hundreds_of_consultants_over_30_days(self, sql_db):
+        window_start, window_end = window(days=30)
+        seed_consultants(sql_db, 400, window_start)
+
+        started = timer.perf_counter()
+        result = availability_service.find_earliest_available_slots(
+            sql_db, TEMPLATE_ID, 30, "Asia/Kolkata", window_start, window_end, limit=20
+        )
+        elapsed_ms = (timer.perf_counter() - started) * 1000
+
+        assert result.consultants_checked > 300
+        assert len(result.results) == 20
+        assert len(sql_db.statements) == 4
+        print(f"\n📊 Earliest slot for {result.consultants_checked} consultants over 30 days: "
+              f"{elapsed_ms:.1f}ms, {len(sql_db.statements)} queries")
+        assert elapsed_ms < 1_000
@@ -0,0 +1,149 @@
+"""
+Intake booking summaries: built once per intake revision by update_stage_data
+and complete_stage, stored with the intake, and reused by every booking with a
+single small read instead of the whole intake plus extraction.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.crud.async_repository import intake_repository
+from app.crud.crud_intake import intake as crud_intake
+from app.services.intake_extraction_service import IntakeExtractionService
+from tests.supabase_fake import FakeSupabase
+
+CLIENT_ID = "c11e0000-0000-4000-8000-000000000001"
+
+
+def full_intake(**fields):
+    return {
+        "id": 1, "client_id": CLIENT_ID, "full_name": "Priya Sharma", "email": "priya@example.com",
+        "status": "in_progress", "current_stage": 6, "completed_stages": [1, 2, 3, 4, 5],
+        "location": "outside_canada", "client_role": "principal_applicant", "phone": "+91 98765 43210",
+        "preferred_language": "english", "timezone": "Asia/Kolkata", "marital_status": "married",
+        "has_dependants": True, "dependants_count": 2, "highest_education": "masters", "eca_status": "completed",
+        "eca_provider": "WES", "language_test_taken": True, "test_type": "ielts",
+        "language_scores": {"listening": 8.5, "reading": 7.5, "writing": 7.0, "speaking": 7.5},
+        "years_experience": 6, "noc_codes": ["21231"], "job_offer_status": "no", "current_status": "visitor",
+        "proof_of_funds": "25k_plus", "program_interest": ["express_entry", "pnp"],
+        "province_interest": ["ON", "BC"], "urgency": "within_6_months",
+        "created_at": "2026-09-01T10:00:00+00:00", "updated_at": "2026-10-01T10:00:00+00:00",
+        **fields,
+    }
+
+
+@pytest.fixture
+def extractions(monkeypatch):
+    """Count summary extractions"""
+    calls = []
+    extract = IntakeExtractionService.extract_intake_summary
+
+    def counting(intake_data):
+        calls.append(intake_data.get("client_id"))
+        return extract(intake_data)
+    monkeypatch.setattr(IntakeExtractionService, "extract_intake_summary", staticmethod(counting))
+    return calls
+
+
+class TestIntakeBookingSummary:
+    """Computed per revision, reused per booking"""
+
+    def test_stage_updates_store_the_summary(self, extractions):
+        db = FakeSupabase({"client_intakes": [full_intake()]})
+
+        crud_intake.update_stage_data(db, CLIENT_ID, 6, {"years_experience": 7})
+        assert len(extractions) == 1
+        db.queries.clear()
+
+        summary = crud_intake.get_booking_summary(db, CLIENT_ID)
+        assert db.queries == [("select", "client_intakes")]
+        assert len(extractions) == 1
+        assert summary["education_work"]["years_experience"] == 7
+        row = db.rows["client_intakes"][0]
+        assert row["booking_summary_updated_at"] == row["updated_at"]
+
+        # Completing a stage (here through the async repository) is a new revision with a new summary
+        asyncio.run(intake_repository.complete_stage(db.aio, CLIENT_ID, 6))
+        summary = crud_intake.get_booking_summary(db, CLIENT_ID)
+        assert summary["completion_status"]["completed_stages"] == 6
+        assert len(extractions) == 2
+
+    def test_unsummarized_intake_is_filled_in_once(self, extractions):
+        db = FakeSupabase({"client_intakes": [full_intake()]})
+
+        first = crud_intake.get_booking_summary(db, CLIENT_ID)
+        assert db.queries == [("select", "client_intakes"), ("select", "client_intakes"),
+                              ("update", "client_intakes")]
+        db.queries.clear()
+
+        again = crud_intake.get_booking_summary(db, CLIENT_ID)
+        assert {**again, "extraction_date": None} == {**first, "extraction_date": None}
+        assert db.queries == [("select", "client_intakes")]
+        assert len(extractions) == 1
+
+    def test_other_changes_make_the_summary_stale(self, extractions, monkeypatch):
+        db = FakeSupabase({"client_intakes": [full_intake()]})
+        crud_intake.update_stage_data(db, CLIENT_ID, 6, {"years_experience": 7})
+
+        crud_intake.reset_intake(db, CLIENT_ID)
+        summary = crud_intake.get_booking_summary(db, CLIENT_ID)
+        assert summary["completion_status"]["completed_stages"] == 0
+        assert summary["education_work"]["years_experience"] is None
+
+        # An edit between reading the intake and storing its summary is not overwritten
+        row = db.rows["client_intakes"][0]
+        row["booking_summary"] = None
+        get_by_client_id = crud_intake.get_by_client_id
+
+        def edited_meanwhile(db, client_id):
+            fetched = get_by_client_id(db, client_id)
+            row["updated_at"] = "2026-10-17T08:00:00+00:00"
+            return fetched
+        monkeypatch.setattr(crud_intake, "get_by_client_id", edited_meanwhile)
+
+        crud_intake.get_booking_summary(db, CLIENT_ID)
+        assert row["booking_summary"] is None
+
+    def test_summary_is_a_clean_payload_dated_at_booking(self, extractions):
+        db = FakeSupabase({"client_intakes": [full_intake()]})
+        crud_intake.update_stage_data(db, CLIENT_ID, 6, {"years_experience": 7})
+        db.rows["client_intakes"][0]["booking_summary"]["extraction_date"] = "2026-09-01T10:00:00"
+
+        summary = crud_intake.get_booking_summary(db, CLIENT_ID)
+        assert set(summary) == set(db.rows["client_intakes"][0]["booking_summary"])
+        assert "intake_updated_at" not in summary
+        # Dated when used for the booking, not when the intake was last saved
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        assert now - datetime.fromisoformat(summary["extraction_date"]) < timedelta(seconds=5)
+        assert db.rows["client_intakes"][0]["booking_summary"]["extraction_date"] == "2026-09-01T10:00:00"
+
+    def test_postgres_timestamp_format_matches(self, extractions):
+        row = full_intake(updated_at="2026-10-17T12:00:00.120000+00:00")
+        row.update(crud_intake.build_booking_summary_columns(row))
+        # As PostgREST returns it: trailing zeros trimmed, session time zone offset
+        row["updated_at"] = "2026-10-17T08:00:00.12-04:00"
+        db = FakeSupabase({"client_intakes": [row]})
+
+        crud_intake.get_booking_summary(db, CLIENT_ID)
+        assert db.queries == [("select", "client_intakes")]
+        assert len(extractions) == 1
+
+    def test_cpu_per_booking(self):
+        db = FakeSupabase({"client_intakes": [full_intake()]})
+        crud_intake.update_stage_data(db, CLIENT_ID, 6, {"years_experience": 7})
+
+        rounds = 300
+        started = time.perf_counter()
+        for _ in range(rounds):
+            IntakeExtractionService.extract_intake_summary(crud_intake.get_by_client_id(db, CLIENT_ID))
+        per_booking_us = (time.perf_counter() - started) / rounds * 1e6
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            crud_intake.get_booking_summary(db, CLIENT_ID)
+        stored_us = (time.perf_counter() - started) / rounds * 1e6
+
+        print(f"\n📊 Intake summary per booking: extracted {per_booking_us:.0f}µs, stored {stored_us:.0f}µs")
+        assert stored_us < per_booking_us
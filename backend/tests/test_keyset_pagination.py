@@ -0,0 +1,149 @@
+"""
+Cursor (keyset) pagination for the list endpoints.
+
+Walking every page must return each row exactly once in (created_at, id) order,
+including rows that share a created_at, and a deep page must be the same
+PostgREST request as the first one apart from the cursor bound (no offset).
+"""
+from postgrest import SyncPostgrestClient
+
+from app.crud import crud_blog, crud_user
+from app.crud.base import apply_keyset, decode_cursor, encode_cursor, next_cursor
+from app.crud.consultant_directory import DirectorySnapshot
+from app.crud.crud_consultant_application import consultant_application
+from app.crud.crud_intake import intake as crud_intake
+from tests.supabase_fake import FakeSupabase
+from tests.test_consultant_directory_snapshot import rated_directory
+
+
+def timestamped_rows(count, **extra):
+    # Groups of three rows share a created_at so the id tie-breaker matters
+    return [
+        {"id": i, "created_at": f"2026-01-{1 + i // 60:02d}T{(i // 3) % 20:02d}:00:00+00:00", **extra}
+        for i in range(1, count + 1)
+    ]
+
+
+def newest_first(rows):
+    return [row["id"] for row in sorted(rows, key=lambda row: (row["created_at"], row["id"]), reverse=True)]
+
+
+def walk(fetch_page, limit):
+    """Follow next cursors from the first page (empty cursor) to the last"""
+    ids, cursor, pages = [], "", 0
+    while cursor is not None:
+        page = fetch_page(cursor)
+        ids.extend(row["id"] for row in page)
+        cursor = next_cursor(page, limit)
+        pages += 1
+    return ids, pages
+
+
+class TestKeysetHelpers:
+    """Cursor encoding and the PostgREST request it produces"""
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor("2026-01-01T00:00:00+00:00", 42)
+        assert decode_cursor(cursor) == ["2026-01-01T00:00:00+00:00", 42]
+        assert "=" not in cursor
+
+    def test_invalid_cursors_are_rejected(self):
+        for cursor in ("not-a-cursor!", encode_cursor(), "e30"):
+            try:
+                decode_cursor(cursor)
+            except ValueError:
+                continue
+            raise AssertionError(f"accepted {cursor!r}")
+        for values in (('2026-01-01"),id.gt.(0', 1), ("2026-01-01", "1")):
+            try:
+                apply_keyset(FakeSupabase().table("t").select("*"), encode_cursor(*values), 10)
+            except ValueError:
+                continue
+            raise AssertionError(f"accepted {values!r}")
+
+    def test_deep_pages_send_the_same_request_shape(self):
+        table = SyncPostgrestClient("http://localhost/rest/v1").from_("consultant_applications")
+        first = apply_keyset(table.select("*"), "", 20)
+        deep = apply_keyset(table.select("*"), encode_cursor("2026-01-01T00:00:00+00:00", 5000), 20)
+
+        assert dict(first.params) == {"select": "*", "order": "created_at.desc,id.desc", "limit": "20"}
+        assert dict(deep.params) == {
+            "select": "*",
+            "order": "created_at.desc,id.desc",
+            "limit": "20",
+            "created_at": "lte.2026-01-01T00:00:00+00:00",
+            "or": '(created_at.lt."2026-01-01T00:00:00+00:00",id.lt.5000)',
+        }
+        assert "offset" not in deep.params
+        print("✅ Page 250 is the same index range query as page 1")
+
+
+class TestCursorPagedEndpoints:
+    """Walking all pages returns every row once, newest first"""
+
+    def test_consultant_applications(self):
+        rows = timestamped_rows(250, status="pending")
+        rows[10]["status"] = "approved"
+        db = FakeSupabase({"consultant_applications": rows})
+
+        ids, pages = walk(lambda cursor: consultant_application.get_multi(
+            db, limit=20, status="pending", cursor=cursor), limit=20)
+
+        assert ids == newest_first([row for row in rows if row["status"] == "pending"])
+        assert pages == 13
+
+    def test_blog_posts(self):
+        rows = timestamped_rows(95, is_published=True, category="news")
+        for row in rows[::4]:
+            row["is_published"] = False
+        db = FakeSupabase({"blog_posts": rows})
+
+        ids, _ = walk(lambda cursor: crud_blog.get_blog_posts(db, limit=10, category="news", cursor=cursor), limit=10)
+        assert ids == newest_first([row for row in rows if row["is_published"]])
+
+    def test_intakes(self):
+        rows = timestamped_rows(61, client_id="c", status="pending", current_stage=1, completed_stages=[])
+        db = FakeSupabase({"client_intakes": rows})
+
+        ids, pages = walk(lambda cursor: crud_intake.get_multi(db, limit=20, cursor=cursor), limit=20)
+        assert ids == newest_first(rows)
+        assert pages == 4
+        assert [row["id"] for row in crud_intake.get_multi(db, skip=20, limit=5)] == newest_first(rows)[20:25]
+
+    def test_users(self):
+        users = [
+            {"id": f"00000000-0000-0000-0000-{i:012d}", "email": f"user{i}@example.com",
+             "created_at": row["created_at"], "role": "consultant" if i % 5 == 0 else "client",
+             "email_confirmed_at": None, "banned_until": None, "last_sign_in_at": None}
+            for i, row in enumerate(timestamped_rows(70), start=1)
+        ]
+
+        def list_users_page_sql(db, params):
+            """Python stand-in for the list_users_page() database function"""
+            matching = [u for u in users if params["p_role"] in (None, u["role"])]
+            if params["p_after_created_at"]:
+                after = (params["p_after_created_at"], params["p_after_id"])
+                matching = [u for u in matching if (u["created_at"], u["id"]) < after]
+            matching.sort(key=lambda u: (u["created_at"], u["id"]), reverse=True)
+            return matching[:params["p_limit"]]
+
+        db = FakeSupabase(functions={"list_users_page": list_users_page_sql})
+        ids, _ = walk(lambda cursor: crud_user.list_users_page(db, limit=6, cursor=cursor, role="client"), limit=6)
+
+        clients = [u for u in users if u["role"] == "client"]
+        assert ids == newest_first(clients)
+        assert len(ids) == 56
+
+    def test_consultant_directory_sorted_by_rating(self):
+        snapshot = DirectorySnapshot(rated_directory(500).rows["consultants"])
+        filters = {"language": "French"}
+        for sort in (None, "rating", "name"):
+            expected = [c["id"] for c in snapshot.query(limit=500, sort=sort, **filters)]
+            ids, after = [], None
+            while True:
+                page = snapshot.query(limit=7, sort=sort, after=after, **filters)
+                ids.extend(c["id"] for c in page)
+                if len(page) < 7:
+                    break
+                after = snapshot.sort_key(page[-1]["id"], sort)
+            assert ids == expected, sort
@@ -0,0 +1,92 @@
+"""
+Tests for the request-scoped Principal dependency.
+
+The consultant lookup behind an RCIC principal should hit the database once,
+then be served from the per-worker identity cache until the profile changes.
+"""
+import asyncio
+
+import pytest
+
+from app.api import deps
+from app.crud import crud_consultant
+from tests.supabase_fake import FakeSupabase
+
+RCIC_USER_ID = "9b2f4c1e-0000-4000-8000-000000000002"
+
+
+def resolve_principal(db, user):
+    return asyncio.run(deps.get_current_principal(db=db.aio, current_user=user))
+
+
+@pytest.fixture(autouse=True)
+def empty_identity_cache():
+    crud_consultant._identity_cache.clear()
+    yield
+    crud_consultant._identity_cache.clear()
+
+
+def rcic_user():
+    return {"id": RCIC_USER_ID, "email": "rcic@example.com", "full_name": "Test RCIC",
+            "role": "rcic", "email_verified": True, "is_active": True}
+
+
+class TestPrincipal:
+    """Principal resolution and the consultant identity cache"""
+
+    def test_rcic_profile_is_attached_and_cached(self):
+        """Repeated requests by the same RCIC reuse the cached consultant profile"""
+        db = FakeSupabase({"consultants": [
+            {"id": 7, "user_id": RCIC_USER_ID, "name": "Jane Doe", "timezone": "America/Vancouver"},
+        ]})
+
+        first = resolve_principal(db, rcic_user())
+        second = resolve_principal(db, rcic_user())
+
+        assert first.consultant_id == 7
+        assert first.consultant_name == "Jane Doe"
+        assert first.consultant_timezone == "America/Vancouver"
+        assert first.owns_consultant(7) and not first.owns_consultant(8)
+        assert second == first
+        assert db.queries == [("select", "consultants")]
+        print("✅ Consultant profile fetched once for two requests")
+
+    def test_missing_profile_is_not_cached(self):
+        """An RCIC without a profile is looked up again once the profile exists"""
+        db = FakeSupabase({"consultants": []})
+
+        principal = resolve_principal(db, rcic_user())
+        assert principal.consultant_id is None
+        assert not principal.owns_consultant(None)
+
+        db.rows["consultants"].append({"id": 3, "user_id": RCIC_USER_ID, "name": "New RCIC", "timezone": None})
+        principal = resolve_principal(db, rcic_user())
+        assert principal.consultant_id == 3
+        print("✅ Newly created profile picked up on the next request")
+
+    def test_profile_update_invalidates_cache(self):
+        """Updating the consultant drops the cached identity"""
+        db = FakeSupabase({"consultants": [
+            {"id": 7, "user_id": RCIC_USER_ID, "name": "Jane Doe", "timezone": "America/Toronto"},
+        ]})
+        resolve_principal(db, rcic_user())
+
+        crud_consultant.consultant.update(
+            db, consultant_id=7, obj_in=crud_consultant.ConsultantUpdate(name="Jane Smith")
+        )
+        principal = resolve_principal(db, rcic_user())
+
+        assert principal.consultant_name == "Jane Smith"
+        print("✅ Profile update visible on the next request")
+
+    def test_clients_skip_consultant_lookup(self):
+        """Client principals never query the consultants table"""
+        db = FakeSupabase({})
+        user = {"id": "client-1", "email": "client@example.com", "role": "client"}
+
+        principal = resolve_principal(db, user)
+
+        assert principal.role == "client"
+        assert principal.consultant_id is None
+        assert db.queries == []
+        print("✅ No consultant query for clients")
@@ -0,0 +1,81 @@
+"""
+get_services_with_pricing returns each service with its pricing options and
+their duration options in a single embedded PostgREST select.
+"""
+from app.crud import crud_consultant
+from app.crud.crud_consultant_service_pricing import consultant_service_pricing
+from app.schemas.consultant import ConsultantServiceWithPricing
+from tests.supabase_fake import FakeSupabase
+
+
+def seeded_services(service_count: int = 8) -> FakeSupabase:
+    durations = [
+        {"id": d, "service_template_id": 1, "duration_minutes": 15 * d, "duration_label": f"{15 * d} Mins",
+         "min_price": 50.0, "max_price": 300.0, "is_active": True, "order_index": d}
+        for d in (1, 2, 3)
+    ]
+    services, pricing = [], []
+    for consultant_id in (1, 2):
+        for n in range(service_count):
+            service_id = consultant_id * 100 + n
+            services.append({
+                "id": service_id, "consultant_id": consultant_id, "service_template_id": 1,
+                "name": f"Service {n}", "description": None, "duration": 30, "price": 100.0,
+                "is_active": n % 3 != 0,
+            })
+            for duration in durations:
+                pricing.append({
+                    "id": len(pricing) + 1, "consultant_service_id": service_id,
+                    "duration_option_id": duration["id"], "price": 60.0 + duration["id"],
+                    "is_active": (n + duration["id"]) % 4 != 0,
+                })
+    return FakeSupabase({
+        "consultant_services": services,
+        "consultant_service_pricing": pricing,
+        "service_duration_options": durations,
+    })
+
+
+def per_service_get_services_with_pricing(db, consultant_id, active_only=False):
+    """The original implementation: one pricing query per service"""
+    services = crud_consultant.get_services_by_consultant(db, consultant_id, active_only)
+    for service in services:
+        service["pricing_options"] = consultant_service_pricing.get_by_service_with_duration(
+            db, consultant_service_id=service["id"], is_active=None if not active_only else True
+        )
+    return services
+
+
+class TestServicesWithPricing:
+    """One round trip, same tree as the per-service queries"""
+
+    def test_single_round_trip(self):
+        db = seeded_services()
+        services = crud_consultant.get_services_with_pricing(db, consultant_id=1)
+
+        assert len(services) == 8
+        assert db.round_trips() == 1
+
+        db.queries.clear()
+        per_service_get_services_with_pricing(db, consultant_id=1)
+        print(f"✅ services-with-pricing: 1 round trip (was {db.round_trips()})")
+
+    def test_same_result_as_per_service_queries(self):
+        for active_only in (False, True):
+            expected = per_service_get_services_with_pricing(seeded_services(), 1, active_only)
+            actual = crud_consultant.get_services_with_pricing(seeded_services(), 1, active_only)
+            assert actual == expected, active_only
+
+    def test_active_only_keeps_active_services_and_pricing(self):
+        services = crud_consultant.get_services_with_pricing(seeded_services(), consultant_id=2, active_only=True)
+
+        assert services and all(service["is_active"] for service in services)
+        assert all(option["is_active"] for service in services for option in service["pricing_options"])
+        # Each option carries its embedded duration option
+        assert all(option["duration_option"]["id"] == option["duration_option_id"]
+                   for service in services for option in service["pricing_options"])
+
+    def test_matches_response_schema(self):
+        services = crud_consultant.get_services_with_pricing(seeded_services(), consultant_id=1)
+        parsed = [ConsultantServiceWithPricing.model_validate(service) for service in services]
+        assert parsed[1].pricing_options[0].duration_option.duration_minutes == 15
@@ -0,0 +1,155 @@
+"""
+Slot cache: a consultant's computed days are reused for every client timezone,
+past slots are dropped at read time, and availability or booking writes make
+the next read recompute.
+"""
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from app.crud import crud_booking, crud_consultant
+from app.crud.crud_availability import crud_availability
+from app.crud.slot_cache import set_day_starts, slot_generation
+from app.models.availability import DayOfWeek
+from app.schemas.availability import AvailabilitySlotCreate, AvailabilitySlotUpdate, BlockedTimeCreate, BlockedTimeUpdate
+from app.schemas.booking import BookingCreate, BookingUpdate
+from app.schemas.consultant import ConsultantUpdate
+from app.services.availability_service import availability_service
+from tests.supabase_fake import FakeSupabase
+from tests.test_availability_range import CONSULTANT_TZ, first_monday_after, seed, sql_db  # noqa: F401
+
+
+def read_day(sql_db, supabase_db, day, client_tz=CONSULTANT_TZ):
+    return availability_service.get_available_slots_for_date(
+        sql_db, supabase_db, 1, day, client_tz, slot_duration_minutes=30
+    )
+
+
+def assert_recomputed(sql_db, supabase_db, day):
+    sql_db.statements.clear()
+    slots = read_day(sql_db, supabase_db, day)
+    assert len(sql_db.statements) == 3, sql_db.statements
+    return [slot.start_consultant_tz.strftime("%H:%M") for slot in slots.slots]
+
+
+class TestSlotCacheReads:
+    """Computed once per consultant, day and duration"""
+
+    def test_cached_day_costs_no_sql(self, sql_db):
+        monday = first_monday_after(7)
+        supabase_db = seed(sql_db, monday)
+
+        first = read_day(sql_db, supabase_db, monday)
+        sql_db.statements.clear()
+
+        assert read_day(sql_db, supabase_db, monday) == first
+        assert sql_db.statements == []
+        print("✅ Cached slot day served with 0 SQL queries")
+
+    def test_one_entry_serves_every_client_timezone(self, sql_db):
+        monday = first_monday_after(7)
+        supabase_db = seed(sql_db, monday)
+
+        toronto = read_day(sql_db, supabase_db, monday)
+        sql_db.statements.clear()
+        kolkata = read_day(sql_db, supabase_db, monday, "Asia/Kolkata")
+
+        assert sql_db.statements == []
+        assert [slot.start for slot in kolkata.slots] == [slot.start for slot in toronto.slots]
+        assert all(slot.start.tzinfo.key == "Asia/Kolkata" for slot in kolkata.slots)
+
+    def test_range_reuses_cached_days(self, sql_db):
+        monday = first_monday_after(7)
+        supabase_db = seed(sql_db, monday)
+
+        availability_service.get_available_slots_for_range(
+            sql_db, supabase_db, 1, monday, monday + timedelta(days=6), "Asia/Kolkata", slot_duration_minutes=30
+        )
+        sql_db.statements.clear()
+        read_day(sql_db, supabase_db, monday + timedelta(days=2))
+        availability_service.get_available_slots_for_range(
+            sql_db, supabase_db, 1, monday, monday + timedelta(days=6), CONSULTANT_TZ, slot_duration_minutes=30
+        )
+        assert sql_db.statements == []
+
+    def test_past_slots_are_dropped_at_read_time(self, sql_db):
+        supabase_db = seed(sql_db, first_monday_after(7))
+        zone = ZoneInfo(CONSULTANT_TZ)
+        now = datetime.now(zone).replace(second=0, microsecond=0, tzinfo=None)
+        today = now.date()
+
+        # An entry computed earlier today still lists slots that have since passed
+        starts = [now - timedelta(hours=2), now - timedelta(minutes=1), now + timedelta(minutes=30)]
+        set_day_starts(1, slot_generation(1), today, 30, [start.isoformat() for start in starts if start.date() == today])
+
+        slots = read_day(sql_db, supabase_db, today).slots
+        assert sql_db.statements == []
+        assert all(slot.start_consultant_tz >= datetime.now(timezone.utc) for slot in slots)
+        assert len(slots) == int((now + timedelta(minutes=30)).date() == today)
+
+
+class TestSlotCacheInvalidation:
+    """Writes through crud_availability, crud_booking and crud_consultant drop the consultant's days"""
+
+    def test_availability_slot_writes(self, sql_db):
+        monday = first_monday_after(7)
+        supabase_db = seed(sql_db, monday)
+        read_day(sql_db, supabase_db, monday)
+
+        created = crud_availability.create_availability_slot(sql_db, 1, AvailabilitySlotCreate(
+            day_of_week=DayOfWeek.monday, start_time=time(14), end_time=time(15), timezone=CONSULTANT_TZ))
+        assert "14:00" in assert_recomputed(sql_db, supabase_db, monday)
+
+        crud_availability.update_availability_slot(sql_db, created.id, AvailabilitySlotUpdate(end_time=time(16)))
+        assert "15:30" in assert_recomputed(sql_db, supabase_db, monday)
+
+        crud_availability.delete_availability_slot(sql_db, created.id)
+        assert "14:00" not in assert_recomputed(sql_db, supabase_db, monday)
+
+        crud_availability.replace_consultant_availability(sql_db, 1, [AvailabilitySlotCreate(
+            day_of_week=DayOfWeek.monday, start_time=time(8), end_time=time(9), timezone=CONSULTANT_TZ)])
+        assert assert_recomputed(sql_db, supabase_db, monday) == ["08:00", "08:15", "08:30"]
+
+    def test_blocked_time_writes(self, sql_db):
+        monday = first_monday_after(7)
+        supabase_db = seed(sql_db, monday)
+        read_day(sql_db, supabase_db, monday)
+        at = lambda hour: datetime.combine(monday, time(hour)).replace(tzinfo=ZoneInfo(CONSULTANT_TZ)).astimezone(timezone.utc)
+
+        blocked = crud_availability.create_blocked_time(sql_db, 1, BlockedTimeCreate(
+            start_datetime=at(20), end_datetime=at(22)))
+        assert "20:00" not in assert_recomputed(sql_db, supabase_db, monday)
+
+        crud_availability.update_blocked_time(sql_db, blocked.id, BlockedTimeUpdate(end_datetime=at(23)))
+        assert "22:00" not in assert_recomputed(sql_db, supabase_db, monday)
+
+        crud_availability.delete_blocked_time(sql_db, blocked.id)
+        assert "20:00" in assert_recomputed(sql_db, supabase_db, monday)
+
+    def test_booking_writes(self, sql_db):
+        monday = first_monday_after(7)
+        supabase_db = seed(sql_db, monday)
+        bookings = FakeSupabase({"bookings": [], "booking_documents": [], "service_duration_options": []})
+        read_day(sql_db, supabase_db, monday)
+
+        booking = crud_booking.create_booking(bookings, obj_in=BookingCreate(
+            consultant_id=1, service_id=7, booking_date=f"{monday}T20:00:00-05:00", total_amount=100))
+        assert_recomputed(sql_db, supabase_db, monday)
+
+        crud_booking.update_booking(bookings, booking_id=booking["id"], obj_in=BookingUpdate(status="cancelled"))
+        assert_recomputed(sql_db, supabase_db, monday)
+
+        # A write for another consultant leaves these cached days alone
+        bookings.rows["bookings"][0]["consultant_id"] = 2
+        crud_booking.update_booking(bookings, booking_id=booking["id"], obj_in=BookingUpdate(meeting_notes="Moved"))
+        sql_db.statements.clear()
+        read_day(sql_db, supabase_db, monday)
+        assert sql_db.statements == []
+
+    def test_consultant_timezone_change(self, sql_db):
+        monday = first_monday_after(7)
+        supabase_db = seed(sql_db, monday)
+        before = [slot.start_consultant_tz.strftime("%H:%M") for slot in read_day(sql_db, supabase_db, monday).slots]
+
+        crud_consultant.consultant.update(supabase_db, consultant_id=1, obj_in=ConsultantUpdate(timezone="America/Vancouver"))
+        # The weekly schedule is in its own timezone, so the consultant's wall-clock slots move
+        assert assert_recomputed(sql_db, supabase_db, monday) != before
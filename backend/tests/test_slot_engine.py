@@ -0,0 +1,178 @@
+"""
+The merged busy-interval engine behind slot generation must find exactly the
+free slots the original per-slot scan did, and do it faster on busy days.
+"""
+import random
+import time as timer
+from datetime import date, datetime, time, timedelta, timezone
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+from app.services.slot_engine import BusyIntervals, DayBitmap
+
+TORONTO = ZoneInfo("America/Toronto")
+
+
+def scan_free_starts(window_start, window_end, duration, interval, blocked_times, bookings_info, now):
+    """The original _is_slot_available loop: every slot against every busy period"""
+    free = []
+    current = window_start
+    while current + duration <= window_end:
+        slot_end = current + duration
+        available = True
+        for blocked in blocked_times:
+            if current < blocked.end_datetime and slot_end > blocked.start_datetime:
+                available = False
+                break
+        if available:
+            for booking, booking_duration in bookings_info:
+                booking_end = booking.booking_date + timedelta(minutes=booking_duration)
+                if current < booking_end and slot_end > booking.booking_date:
+                    available = False
+                    break
+        if available and not current < now:
+            free.append(current)
+        current += interval
+    return free
+
+
+def random_day(rng: random.Random, day: date, busy_count: int):
+    """Random blocked times and bookings around a consultant-local day"""
+    day_start = datetime.combine(day, time.min).replace(tzinfo=TORONTO)
+    blocked_times, bookings_info = [], []
+    for _ in range(busy_count):
+        # Busy periods come back from the database in UTC or a fixed offset
+        start = day_start + timedelta(minutes=rng.randrange(-120, 26 * 60, 5))
+        start = start.astimezone(rng.choice([timezone.utc, timezone(timedelta(hours=-4))]))
+        if rng.random() < 0.5:
+            end = start + timedelta(minutes=rng.choice([5, 15, 30, 60, 90, 240]))
+            blocked_times.append(SimpleNamespace(start_datetime=start, end_datetime=end))
+        else:
+            bookings_info.append((SimpleNamespace(booking_date=start), rng.choice([0, 15, 30, 45, 60, 90, 120])))
+    return blocked_times, bookings_info
+
+
+def random_window(rng: random.Random, day: date, step: int = 15):
+    start_minute = rng.randrange(0, 20 * 60, step)
+    end_minute = min(24 * 60 - 1, start_minute + rng.randrange(15, 10 * 60, 15))
+    window_start = datetime.combine(day, time(start_minute // 60, start_minute % 60)).replace(tzinfo=TORONTO)
+    window_end = datetime.combine(day, time(end_minute // 60, end_minute % 60)).replace(tzinfo=TORONTO)
+    return window_start, window_end
+
+
+class TestBusyIntervals:
+    """Same answers as the per-slot scan"""
+
+    def test_equivalent_to_per_slot_scan(self):
+        rng = random.Random(20261017)
+        # Includes the spring-forward and fall-back days in Toronto
+        days = [date(2026, 3, 8), date(2026, 11, 1), date(2026, 6, 15)]
+        for case in range(1_500):
+            day = days[case % 3]
+            blocked_times, bookings_info = random_day(rng, day, busy_count=rng.randrange(0, 25))
+            busy = BusyIntervals.from_schedule(blocked_times, bookings_info)
+            window_start, window_end = random_window(rng, day)
+            duration = timedelta(minutes=rng.choice([15, 30, 45, 60, 90, 120]))
+            interval = timedelta(minutes=rng.choice([15, 30, 60]))
+            now = window_start + timedelta(minutes=rng.randrange(-600, 600, 7))
+
+            expected = scan_free_starts(window_start, window_end, duration, interval, blocked_times, bookings_info, now)
+            actual = list(busy.free_starts(window_start, window_end, duration, interval, now))
+            assert actual == expected, (case, window_start, duration, interval)
+            if window_start.utcoffset() == window_end.utcoffset():
+                for start in expected[:5]:
+                    assert not busy.overlaps(start, start + duration)
+
+    def test_merges_overlapping_and_touching_periods(self):
+        t = datetime(2026, 6, 15, 9, tzinfo=timezone.utc)
+        busy = BusyIntervals([
+            (t, t + timedelta(minutes=30)),
+            (t + timedelta(minutes=30), t + timedelta(minutes=45)),
+            (t + timedelta(minutes=10), t + timedelta(minutes=20)),
+            (t + timedelta(hours=2), t + timedelta(hours=3)),
+        ])
+        assert len(busy) == 2
+        assert busy.ends[0] == t + timedelta(minutes=45)
+        assert not busy.overlaps(t + timedelta(minutes=45), t + timedelta(hours=2))
+        assert busy.overlaps(t + timedelta(minutes=44), t + timedelta(minutes=50))
+
+    def test_faster_than_per_slot_scan_on_busy_days(self):
+        rng = random.Random(7)
+        day = date(2026, 6, 15)
+        blocked_times, bookings_info = random_day(rng, day, busy_count=24)
+        window_start = datetime.combine(day, time(6)).replace(tzinfo=TORONTO)
+        window_end = datetime.combine(day, time(22)).replace(tzinfo=TORONTO)
+        duration = interval = timedelta(minutes=15)
+        now = window_start - timedelta(days=1)
+
+        started = timer.perf_counter()
+        for _ in range(50):
+            expected = scan_free_starts(window_start, window_end, duration, interval, blocked_times, bookings_info, now)
+        scan_ms = (timer.perf_counter() - started) / 50 * 1000
+
+        started = timer.perf_counter()
+        for _ in range(50):
+            actual = list(BusyIntervals.from_schedule(blocked_times, bookings_info).free_starts(
+                window_start, window_end, duration, interval, now))
+        engine_ms = (timer.perf_counter() - started) / 50 * 1000
+
+        assert actual == expected
+        print(f"\n📊 64 candidate slots x 24 busy periods: per-slot scan {scan_ms:.3f}ms, "
+              f"merged intervals {engine_ms:.3f}ms ({scan_ms / engine_ms:.1f}x)")
+        assert engine_ms * 2 < scan_ms
+
+
+class TestDayBitmap:
+    """Quarter-hour bitmap of a day: same answers again, shared across windows and durations"""
+
+    def test_equivalent_to_per_slot_scan(self):
+        rng = random.Random(96)
+        days = [date(2026, 3, 8), date(2026, 11, 1), date(2026, 6, 15), date(2026, 6, 16)]
+        for case in range(1_500):
+            day = days[case % 4]
+            blocked_times, bookings_info = random_day(rng, day, busy_count=rng.randrange(0, 25))
+            busy = BusyIntervals.from_schedule(blocked_times, bookings_info)
+            bitmap = DayBitmap(busy, day, TORONTO)
+            # Mostly quarter-hour windows; some off the grid to exercise the fallback
+            for _ in range(3):
+                window_start, window_end = random_window(rng, day, step=rng.choice([15, 15, 15, 10]))
+                duration = timedelta(minutes=rng.choice([15, 30, 45, 60, 90, 120, 20]))
+                interval = timedelta(minutes=rng.choice([15, 30, 60]))
+                now = window_start + timedelta(minutes=rng.randrange(-600, 600, 7))
+
+                expected = scan_free_starts(window_start, window_end, duration, interval, blocked_times, bookings_info, now)
+                actual = list(bitmap.free_starts(window_start, window_end, duration, interval, now))
+                assert actual == expected, (case, window_start, window_end, duration, interval, now)
+
+    def test_dst_days_fall_back_to_intervals(self):
+        busy = BusyIntervals([])
+        assert DayBitmap(busy, date(2026, 3, 8), TORONTO).free is None
+        assert DayBitmap(busy, date(2026, 11, 1), TORONTO).free is None
+        assert DayBitmap(busy, date(2026, 6, 15), TORONTO).free == (1 << 96) - 1
+
+    def test_faster_than_merged_intervals_for_every_duration(self):
+        rng = random.Random(7)
+        day = date(2026, 6, 15)
+        blocked_times, bookings_info = random_day(rng, day, busy_count=24)
+        busy = BusyIntervals.from_schedule(blocked_times, bookings_info)
+        window_start = datetime.combine(day, time(6)).replace(tzinfo=TORONTO)
+        window_end = datetime.combine(day, time(22)).replace(tzinfo=TORONTO)
+        interval = timedelta(minutes=15)
+        durations = [timedelta(minutes=minutes) for minutes in (15, 30, 45, 60, 90, 120)]
+        now = window_start - timedelta(days=1)
+
+        started = timer.perf_counter()
+        for _ in range(200):
+            expected = [list(busy.free_starts(window_start, window_end, d, interval, now)) for d in durations]
+        intervals_us = (timer.perf_counter() - started) / 200 * 1_000_000
+
+        started = timer.perf_counter()
+        for _ in range(200):
+            bitmap = DayBitmap(busy, day, TORONTO)
+            actual = [list(bitmap.free_starts(window_start, window_end, d, interval, now)) for d in durations]
+        bitmap_us = (timer.perf_counter() - started) / 200 * 1_000_000
+
+        assert actual == expected
+        print(f"\n📊 6 durations x 16h window x 24 busy periods: merged intervals {intervals_us:.0f}µs, "
+              f"bitmap {bitmap_us:.0f}µs ({intervals_us / bitmap_us:.1f}x)")
+        assert bitmap_us < intervals_us
@@ -0,0 +1,174 @@
+"""
+Signed document URLs: a booking's documents are signed in one storage call and
+the URLs are reused until shortly before they expire.
+"""
+import time
+from types import SimpleNamespace
+
+import pytest
+from storage3.utils import StorageException
+
+from app.api.api_v1.endpoints.bookings import get_booking_documents
+from app.api.deps import Principal
+from app.core.config import settings
+from app.services.storage_service import signed_url_cache, storage_service
+from tests.supabase_fake import FakeSupabase
+
+ADMIN = Principal(id="ad000000-0000-4000-8000-000000000001", email="admin@example.com", full_name="Admin",
+                  role="admin", email_verified=True, is_active=True)
+
+
+class FakeBucket:
+    """
+    A storage bucket holding `files`, counting calls. Missing files behave as in
+    storage3 0.5.5: create_signed_url raises StorageException, and create_signed_urls
+    fails the whole batch on the null signedURL the API returns for them.
+    """
+
+    def __init__(self, files, latency: float = 0.0):
+        self.files = set(files)
+        self.latency = latency
+        self.calls = []
+
+    def _sign(self, path, expires_in):
+        return f"https://example.supabase.co/storage/v1/object/sign/{path}?token={expires_in}-{len(self.calls)}"
+
+    def create_signed_url(self, path, expires_in):
+        self.calls.append(("sign", [path]))
+        time.sleep(self.latency)
+        if path not in self.files:
+            raise StorageException({"statusCode": 400, "error": "not_found", "message": "Object not found"})
+        return {"signedURL": self._sign(path, expires_in)}
+
+    def create_signed_urls(self, paths, expires_in):
+        self.calls.append(("sign_many", list(paths)))
+        time.sleep(self.latency)
+        data = [
+            {"path": path, "signedURL": self._sign(path, expires_in), "error": None} if path in self.files
+            else {"path": path, "signedURL": None, "error": "Either the object does not exist or you do not have access to it"}
+            for path in paths
+        ]
+        for item in data:
+            item["signedURL"] = item["signedURL"].lstrip("/")  # AttributeError on None, as storage3 does
+        return data
+
+    def remove(self, paths):
+        self.files -= set(paths)
+        return SimpleNamespace(status_code=200)
+
+
+@pytest.fixture
+def bucket(monkeypatch):
+    files = [f"bookings/1/document_{index}.pdf" for index in range(20)]
+    fake_bucket = FakeBucket(files)
+    monkeypatch.setattr(storage_service, "supabase", SimpleNamespace(storage=SimpleNamespace(from_=lambda _: fake_bucket)))
+    signed_url_cache.clear()
+    yield fake_bucket
+    signed_url_cache.clear()
+
+
+def booking_db(paths):
+    return FakeSupabase({
+        "bookings": [{"id": 1, "client_id": "c11e0000-0000-4000-8000-000000000001", "consultant_id": 1,
+                      "service_id": 10, "duration_option_id": None}],
+        "booking_documents": [
+            {"id": index, "booking_id": 1, "file_name": path.rsplit("/", 1)[-1], "file_path": path,
+             "file_type": "application/pdf", "file_size": 2048, "uploaded_at": "2026-10-17T12:00:00+00:00"}
+            for index, path in enumerate(paths, start=1)
+        ],
+    })
+
+
+class TestBatchSignedUrls:
+    """One storage call per document list, none when cached"""
+
+    def test_twenty_documents_one_call_then_none(self, bucket):
+        db = booking_db(sorted(bucket.files))
+
+        first = get_booking_documents(db=db, booking_id=1, principal=ADMIN)
+        assert [call for call, _ in bucket.calls] == ["sign_many"]
+        assert first["total_documents"] == 20
+        assert all(document["download_url"] for document in first["documents"])
+
+        second = get_booking_documents(db=db, booking_id=1, principal=ADMIN)
+        assert len(bucket.calls) == 1
+        assert second == first
+
+    def test_only_uncached_paths_are_signed(self, bucket):
+        paths = sorted(bucket.files)
+        single = storage_service.get_file_url(paths[0])
+        urls = storage_service.get_file_urls(paths + [paths[0]])
+
+        assert bucket.calls == [("sign_many", [paths[0]]), ("sign_many", paths[1:])]
+        assert urls[paths[0]] == single and len(urls) == 20
+
+    def test_urls_are_resigned_before_they_expire(self, bucket):
+        path = sorted(bucket.files)[0]
+        margin = settings.SIGNED_URL_EXPIRY_MARGIN_SECONDS
+
+        # Reusable for only 0.2s, then a fresh URL
+        first = storage_service.get_file_urls([path], expires_in=margin + 0.2)[path]
+        assert storage_service.get_file_urls([path], expires_in=margin + 0.2)[path] == first
+        time.sleep(0.25)
+        assert storage_service.get_file_urls([path], expires_in=margin + 0.2)[path] != first
+
+        # URLs that would expire within the margin are never reused
+        storage_service.get_file_urls([path], expires_in=margin)
+        storage_service.get_file_urls([path], expires_in=margin)
+        assert len(bucket.calls) == 4
+
+    def test_unsignable_documents_keep_their_entry(self, bucket, monkeypatch):
+        paths = sorted(bucket.files)[:2] + ["bookings/1/removed.pdf"]
+        db = booking_db(paths)
+
+        documents = get_booking_documents(db=db, booking_id=1, principal=ADMIN)["documents"]
+        assert [document["download_url"] is not None for document in documents] == [True, True, False]
+        assert documents[2]["error"].startswith("Cannot access file")
+        # The failed batch falls back to one call per path
+        assert [call for call, _ in bucket.calls] == ["sign_many", "sign", "sign", "sign"]
+
+        # The signable ones are cached, so only the missing file is retried
+        bucket.calls.clear()
+        get_booking_documents(db=db, booking_id=1, principal=ADMIN)
+        assert bucket.calls == [("sign_many", ["bookings/1/removed.pdf"]), ("sign", ["bookings/1/removed.pdf"])]
+
+        def unavailable(paths, expires_in):
+            raise ConnectionError("storage unavailable")
+        signed_url_cache.clear()
+        monkeypatch.setattr(bucket, "create_signed_urls", unavailable)
+        documents = get_booking_documents(db=db, booking_id=1, principal=ADMIN)["documents"]
+        assert [document["download_url"] for document in documents] == [None, None, None]
+        assert "storage unavailable" in documents[0]["error"]
+
+    def test_delete_drops_every_expiry(self, bucket):
+        path = sorted(bucket.files)[0]
+        hour = storage_service.get_file_url(path)
+        storage_service.get_file_urls([path], expires_in=7200)
+        assert storage_service.get_file_url(path) == hour
+        assert len(bucket.calls) == 2
+
+        storage_service.delete_file(path)
+        assert storage_service.get_file_urls([path]) == {}
+        assert storage_service.get_file_urls([path], expires_in=7200) == {}
+
+    def test_latency_against_per_document_signing(self, bucket):
+        bucket.latency = 0.01
+        paths = sorted(bucket.files)
+
+        started = time.perf_counter()
+        per_document = {path: bucket.create_signed_url(path, 3600)["signedURL"] for path in paths}
+        per_document_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        batched = storage_service.get_file_urls(paths)
+        batched_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        storage_service.get_file_urls(paths)
+        cached_ms = (time.perf_counter() - started) * 1000
+
+        print(f"\n📊 20 document URLs at 10ms per storage call: one at a time {per_document_ms:.0f}ms, "
+              f"batched {batched_ms:.0f}ms, cached {cached_ms:.2f}ms")
+        assert batched.keys() == per_document.keys()
+        assert batched_ms * 5 < per_document_ms
+        assert cached_ms < batched_ms
@@ -0,0 +1,75 @@
+"""
+Tests for the per-worker pooled Supabase client registry.
+
+A local HTTP server stands in for PostgREST so connection reuse can be
+measured without network access.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.config import settings
+from app.db.supabase import SupabaseClientRegistry, get_supabase, get_supabase_admin, create_session_client
+
+
+class _PostgrestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        # PostgREST requests carry a JSON body even for GET; drain it to keep the connection usable
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'[{"id": 1}]'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_supabase(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PostgrestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(settings, "SUPABASE_URL", f"http://127.0.0.1:{server.server_port}")
+    registry = SupabaseClientRegistry()
+    yield registry
+    registry.clear()
+    server.shutdown()
+
+
+class TestSupabaseClientRegistry:
+    """Clients are created once per worker and their connections are reused"""
+
+    def test_service_clients_are_shared(self):
+        assert get_supabase() is get_supabase()
+        assert get_supabase() is get_supabase_admin()
+
+    def test_session_clients_are_never_pooled(self):
+        assert create_session_client() is not get_supabase()
+
+    def test_pool_settings_applied(self, local_supabase):
+        client = local_supabase.get(settings.SUPABASE_SERVICE_ROLE_KEY)
+        pool = client.postgrest.session._transport._pool
+        assert pool._max_connections == settings.SUPABASE_POOL_MAX_CONNECTIONS
+        assert pool._max_keepalive_connections == settings.SUPABASE_POOL_MAX_KEEPALIVE
+        assert client.postgrest.session.timeout.read == settings.SUPABASE_HTTP_TIMEOUT
+        assert client.storage._client is client.storage.session
+        assert client.auth.admin._http_client is client.auth._http_client
+
+    def test_connections_reused_across_requests(self, local_supabase):
+        for _ in range(20):
+            client = local_supabase.get(settings.SUPABASE_SERVICE_ROLE_KEY)
+            client.table("consultants").select("id").execute()
+
+        metrics = local_supabase.metrics.snapshot()
+        print(f"\n✅ Pool metrics after 20 requests: {metrics}")
+        assert metrics["clients_created"] == 1
+        assert metrics["client_reuses"] == 19
+        assert metrics["requests_sent"] == 20
+        assert metrics["connections_opened"] == 1
+        assert metrics["connection_reuse_ratio"] == 0.95
@@ -0,0 +1,84 @@
+"""
+Weekly schedule replace: only added, changed and removed windows are written,
+with a fixed number of statements however many windows the schedule has.
+"""
+from datetime import time
+
+import pytest
+
+from app.crud.crud_availability import crud_availability
+from app.crud.slot_cache import slot_generation
+from app.models.availability import DayOfWeek
+from app.schemas.availability import AvailabilitySlotCreate, AvailabilitySlotResponse
+from tests.test_availability_range import CONSULTANT_TZ, sql_db  # noqa: F401
+
+
+def window(day: DayOfWeek, start: int, end: int, **fields) -> AvailabilitySlotCreate:
+    return AvailabilitySlotCreate(day_of_week=day, start_time=time(start), end_time=time(end),
+                                  timezone=CONSULTANT_TZ, **fields)
+
+
+def full_week(hours: range):
+    return [window(day, hour, hour + 1) for day in DayOfWeek for hour in hours]
+
+
+class TestReplaceWeeklySchedule:
+    """Diff against the current schedule"""
+
+    def test_only_differences_are_written(self, sql_db):
+        before = crud_availability.replace_consultant_availability(sql_db, 1, [
+            window(DayOfWeek.monday, 9, 12), window(DayOfWeek.monday, 13, 17), window(DayOfWeek.tuesday, 9, 12),
+        ])
+        ids = {(slot.day_of_week, slot.start_time): slot.id for slot in before}
+
+        after = crud_availability.replace_consultant_availability(sql_db, 1, [
+            window(DayOfWeek.monday, 9, 12),                           # unchanged
+            window(DayOfWeek.monday, 13, 18, slot_interval_minutes=30),  # changed
+            window(DayOfWeek.wednesday, 9, 11),                        # added
+        ])                                                             # tuesday removed
+
+        assert [(slot.day_of_week, slot.start_time, slot.end_time, slot.slot_interval_minutes) for slot in after] == [
+            (DayOfWeek.monday, time(9), time(12), 15),
+            (DayOfWeek.monday, time(13), time(18), 30),
+            (DayOfWeek.wednesday, time(9), time(11), 15),
+        ]
+        assert after[0].id == ids[(DayOfWeek.monday, time(9))]
+        assert after[1].id == ids[(DayOfWeek.monday, time(13))]
+        stored = crud_availability.get_consultant_availability(sql_db, 1)
+        assert {(slot.id, slot.day_of_week, slot.end_time) for slot in stored} == \
+               {(slot.id, slot.day_of_week, slot.end_time) for slot in after}
+
+    def test_constant_statements_for_any_schedule_size(self, sql_db):
+        counts = []
+        for hours in (range(8, 10), range(8, 18)):
+            crud_availability.replace_consultant_availability(sql_db, 1, full_week(range(12, 14)))
+            sql_db.statements.clear()
+            # Some windows kept but deactivated, the rest removed or added
+            slots = [window(day, hour, hour + 1, is_active=hour % 2 == 0) for day in DayOfWeek for hour in hours]
+            result = crud_availability.replace_consultant_availability(sql_db, 1, slots)
+            # Reading the returned rows after the commit costs nothing
+            [AvailabilitySlotResponse.from_orm(slot) for slot in result]
+            counts.append(len(sql_db.statements))
+
+        assert counts[0] == counts[1] <= 4
+        print(f"\n📊 14 and 70 window schedules replaced with {counts[1]} statements each")
+
+    def test_unchanged_schedule_writes_nothing(self, sql_db):
+        crud_availability.replace_consultant_availability(sql_db, 1, full_week(range(9, 12)))
+        generation = slot_generation(1)
+        sql_db.statements.clear()
+
+        crud_availability.replace_consultant_availability(sql_db, 1, full_week(range(9, 12)))
+
+        assert len(sql_db.statements) == 1
+        assert slot_generation(1) == generation
+
+    def test_duplicate_windows_are_rejected(self, sql_db):
+        crud_availability.replace_consultant_availability(sql_db, 1, [window(DayOfWeek.monday, 9, 12)])
+
+        with pytest.raises(ValueError, match="Duplicate availability window"):
+            crud_availability.replace_consultant_availability(sql_db, 1, [
+                window(DayOfWeek.friday, 9, 12), window(DayOfWeek.friday, 9, 10),
+            ])
+        assert [slot.day_of_week for slot in crud_availability.get_consultant_availability(sql_db, 1)] == \
+               [DayOfWeek.monday]